@@ -10,6 +10,7 @@ Includes:
 - Duplicate Finder (find and remove duplicates)
 - Privacy Cleaner (browser data, history, cookies)
 - Trash Manager (empty trash across platforms)
+- Filesystem Scanner (shared single-pass directory tree)
 """
 
 from cache_cleaner import CacheCleaner
@@ -18,6 +19,7 @@ from log_manager import LogManager
 from duplicate_finder import DuplicateFinder
 from privacy_cleaner import PrivacyCleaner
 from trash_manager import TrashManager
+from fs_scanner import FileSystemScanner, get_shared_scanner
 
 __all__ = [
     "CacheCleaner",
@@ -26,4 +28,6 @@ __all__ = [
     "DuplicateFinder",
     "PrivacyCleaner",
     "TrashManager",
+    "FileSystemScanner",
+    "get_shared_scanner",
 ]
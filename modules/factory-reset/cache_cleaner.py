@@ -7,9 +7,11 @@ import os
 import shutil
 import subprocess
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
+from fs_scanner import FileSystemScanner, get_shared_scanner
+
 
 @dataclass
 class CacheInfo:
@@ -72,14 +74,16 @@ class CacheCleaner:
         ]
     }
     
-    def __init__(self, dry_run: bool = False):
+    def __init__(self, dry_run: bool = False, scanner: Optional[FileSystemScanner] = None):
         """
         Initialize Cache Cleaner
         
         Args:
             dry_run: If True, only simulate cleanup without removing files
+            scanner: Directory tree to query (default: the shared scanner)
         """
         self.dry_run = dry_run
+        self.scanner = scanner or get_shared_scanner()
         self.cleaned_caches: List[CacheInfo] = []
         
     def scan_caches(self) -> List[CacheInfo]:
@@ -91,12 +95,21 @@ class CacheCleaner:
         """
         caches = []
         
+        # One parallel pass over every location, then answer from the tree
+        self.scanner.refresh(
+            path for path in (
+                Path(location).expanduser()
+                for locations in self.CACHE_LOCATIONS.values()
+                for location in locations
+            ) if path.is_dir()
+        )
+        
         for cache_type, locations in self.CACHE_LOCATIONS.items():
             for location in locations:
                 path = Path(location).expanduser()
                 
                 if path.exists():
-                    size, file_count = self._get_dir_info(path)
+                    size, file_count = self._get_dir_info(path, refresh=False)
                     
                     if size > 0:  # Only include non-empty caches
                         caches.append(CacheInfo(
@@ -152,6 +165,7 @@ class CacheCleaner:
             if not self.dry_run:
                 subprocess.run(["sudo", "apt-get", "clean"], check=False)
                 subprocess.run(["sudo", "apt-get", "autoclean"], check=False)
+                self.scanner.invalidate(Path("/var/cache/apt/archives"))
             after = self._get_cache_size("/var/cache/apt/archives")
             results["apt"] = before - after
             
@@ -160,6 +174,7 @@ class CacheCleaner:
             before = self._get_cache_size("/var/cache/dnf")
             if not self.dry_run:
                 subprocess.run(["sudo", "dnf", "clean", "all"], check=False)
+                self.scanner.invalidate(Path("/var/cache/dnf"))
             after = self._get_cache_size("/var/cache/dnf")
             results["dnf"] = before - after
             
@@ -168,6 +183,7 @@ class CacheCleaner:
             before = self._get_cache_size("/var/cache/pacman/pkg")
             if not self.dry_run:
                 subprocess.run(["sudo", "pacman", "-Sc", "--noconfirm"], check=False)
+                self.scanner.invalidate(Path("/var/cache/pacman/pkg"))
             after = self._get_cache_size("/var/cache/pacman/pkg")
             results["pacman"] = before - after
             
@@ -176,6 +192,8 @@ class CacheCleaner:
             before = self._get_homebrew_cache_size()
             if not self.dry_run:
                 subprocess.run(["brew", "cleanup", "-s"], check=False)
+                for location in self.CACHE_LOCATIONS["homebrew"]:
+                    self.scanner.invalidate(Path(location).expanduser())
             after = self._get_homebrew_cache_size()
             results["homebrew"] = before - after
             
@@ -209,25 +227,17 @@ class CacheCleaner:
                     except (PermissionError, OSError):
                         continue
                         
+            self.scanner.invalidate(cache_dir)
+            
         after_size = self._get_dir_size(cache_dir)
         return before_size - after_size
         
     # ==================== Private Helper Methods ====================
     
-    def _get_dir_info(self, path: Path) -> Tuple[int, int]:
+    def _get_dir_info(self, path: Path, refresh: bool = True) -> Tuple[int, int]:
         """Get total size and file count for directory"""
-        total_size = 0
-        file_count = 0
-        
-        try:
-            for item in path.rglob("*"):
-                if item.is_file():
-                    total_size += item.stat().st_size
-                    file_count += 1
-        except (PermissionError, OSError):
-            pass
-            
-        return total_size, file_count
+        info = self.scanner.aggregate(path, refresh=refresh)
+        return info.size, info.file_count
         
     def _get_dir_size(self, path: Path) -> int:
         """Get total size of directory in bytes"""
@@ -271,6 +281,8 @@ class CacheCleaner:
                             continue
             except (PermissionError, OSError):
                 return 0, 0
+            finally:
+                self.scanner.invalidate(cache.path)
                 
         after_size, after_files = self._get_dir_info(cache.path)
         
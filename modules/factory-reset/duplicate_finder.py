@@ -4,39 +4,187 @@ Find and remove duplicate files to free space
 """
 
 import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set
-from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 from collections import defaultdict
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Linux FICLONE ioctl: share the source file's extents (btrfs, XFS, bcachefs, ...)
+FICLONE = 0x40049409
+
 
 @dataclass
 class DuplicateGroup:
-    """Group of duplicate files"""
+    """Group of duplicate files (one path per distinct inode)"""
     hash: str
     size: int
     files: List[Path]
+    hard_links: Dict[Path, List[Path]] = field(default_factory=dict)  # file -> other paths to its inode
+    identities: Dict[Path, Tuple[int, int, int]] = field(default_factory=dict)  # path -> scanned (dev, inode, mtime_ns)
     
     @property
     def wasted_space(self) -> int:
-        """Space wasted by duplicates (size * (count - 1))"""
+        """Space wasted by duplicates (size * (distinct inodes - 1))"""
         return self.size * (len(self.files) - 1)
         
+    def paths_of(self, file_path: Path) -> List[Path]:
+        """Every scanned path sharing file_path's inode"""
+        return [file_path] + self.hard_links.get(file_path, [])
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return {
+            "hash": self.hash,
+            "size": self.size,
+            "size_mb": round(self.size / (1024 * 1024), 2),
+            "wasted_mb": round(self.wasted_space / (1024 * 1024), 2),
+            "files": [str(f) for f in self.files],
+            "hard_links": {str(f): [str(l) for l in links] for f, links in self.hard_links.items()}
+        }
+        
+
+@dataclass
+class FileEntry:
+    """A scanned file with the stat fields the hash cache is keyed on"""
+    path: Path
+    size: int
+    dev: int
+    inode: int
+    mtime_ns: int
+    nlink: int = 1
+    aliases: List[Path] = field(default_factory=list)  # other scanned paths to the same inode
+    
+    @property
+    def cache_key(self) -> Tuple[int, int, int, int]:
+        return (self.dev, self.inode, self.size, self.mtime_ns)
+        
+
+class HashCache:
+    """
+    SQLite cache of file digests keyed by (dev, inode, size, mtime)
+    
+    A file whose inode, size and modification time are unchanged since
+    the last scan reuses its stored digest for each hashing stage. Every
+    row records the file's path and the scan that last used it, and
+    ``prune`` drops rows under the scanned roots that the current scan did
+    not touch (modified, deleted or no longer candidate files). Rows under
+    other roots are kept for their next scan.
+    """
+    
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                dev INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                stage TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                last_seen INTEGER NOT NULL DEFAULT 0,
+                path TEXT,
+                PRIMARY KEY (dev, inode, size, mtime_ns, stage)
+            )
+        """)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(file_hashes)")}
+        if "last_seen" not in columns:
+            # Caches written before scan tracking
+            self.conn.execute("ALTER TABLE file_hashes ADD COLUMN last_seen INTEGER NOT NULL DEFAULT 0")
+        if "path" not in columns:
+            # Caches written before root-scoped pruning; NULL rows are pruned by any scan
+            self.conn.execute("ALTER TABLE file_hashes ADD COLUMN path TEXT")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_file_hashes_last_seen ON file_hashes (last_seen)")
+        self.conn.commit()
+        
+        self.scan_id = self.conn.execute(
+            "SELECT COALESCE(MAX(last_seen), 0) + 1 FROM file_hashes"
+        ).fetchone()[0]
+        
+    def get(self, entry: FileEntry, stage: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT digest FROM file_hashes "
+            "WHERE dev = ? AND inode = ? AND size = ? AND mtime_ns = ? AND stage = ?",
+            (*entry.cache_key, stage)
+        ).fetchone()
+        return row[0] if row else None
+        
+    def put_many(self, stage: str, digests: List[Tuple[FileEntry, str]]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO file_hashes (dev, inode, size, mtime_ns, stage, digest, last_seen, path) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (*entry.cache_key, stage, digest, self.scan_id, os.path.abspath(entry.path))
+                for entry, digest in digests
+            ]
+        )
+        self.conn.commit()
+        
+    def touch_many(self, stage: str, entries: List[FileEntry]):
+        """Mark cache hits as used by the current scan (at their current path)"""
+        self.conn.executemany(
+            "UPDATE file_hashes SET last_seen = ?, path = ? "
+            "WHERE dev = ? AND inode = ? AND size = ? AND mtime_ns = ? AND stage = ?",
+            [(self.scan_id, os.path.abspath(entry.path), *entry.cache_key, stage) for entry in entries]
+        )
+        self.conn.commit()
+        
+    def prune(self, roots: List[Path]) -> int:
+        """Delete rows under roots the current scan did not use; returns rows removed"""
+        removed = self.conn.execute(
+            "DELETE FROM file_hashes WHERE last_seen < ? AND path IS NULL", (self.scan_id,)
+        ).rowcount
+        for root in {os.path.abspath(r) for r in roots}:
+            prefix = root.rstrip(os.sep) + os.sep
+            removed += self.conn.execute(
+                "DELETE FROM file_hashes WHERE last_seen < ? AND (path = ? OR substr(path, 1, ?) = ?)",
+                (self.scan_id, root, len(prefix), prefix)
+            ).rowcount
+        self.conn.commit()
+        return removed
+        
+    def close(self):
+        self.conn.close()
+        
 
 class DuplicateFinder:
     """
     Find duplicate files by content hash
     
     Uses multi-stage hashing:
-    1. Group by file size
-    2. Quick hash of first 1KB
-    3. Full MD5 hash for final verification
+    1. Group by file size (one os.scandir walk, one stat per file)
+    2. Quick hash of the first 4KB
+    3. Partial hash of the head and tail of large files
+    4. Full BLAKE2b hash for final verification
+    
+    Hashing stages run on a thread pool with 1MB buffered reads, and
+    digests are cached in SQLite so repeat scans only hash changed files.
     """
     
+    QUICK_HASH_BYTES = 4096
+    PARTIAL_HASH_BYTES = 1024 * 1024
+    READ_BUFFER_BYTES = 1024 * 1024
+    
     def __init__(
         self,
         min_size: int = 1024,  # 1KB minimum
-        dry_run: bool = False
+        dry_run: bool = False,
+        workers: Optional[int] = None,
+        partial_hash_threshold: int = 8 * 1024 * 1024,
+        hash_cache: Optional[Path] = None,
+        use_cache: bool = True
     ):
         """
         Initialize Duplicate Finder
@@ -44,9 +192,19 @@ class DuplicateFinder:
         Args:
             min_size: Minimum file size to consider (bytes)
             dry_run: If True, only simulate removal
+            workers: Hashing threads (default: 2 x CPUs, max 32)
+            partial_hash_threshold: Files at least this large get the partial-hash stage
+            hash_cache: SQLite hash cache path (default: ~/.ose/data/duplicate_hashes.db)
+            use_cache: Set False to always hash from scratch
         """
         self.min_size = min_size
         self.dry_run = dry_run
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 2)
+        self.partial_hash_threshold = partial_hash_threshold
+        self.hash_cache_path = hash_cache or Path.home() / ".ose" / "data" / "duplicate_hashes.db"
+        self.use_cache = use_cache
+        self.stats: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
         
     def find_duplicates(
         self,
@@ -65,103 +223,247 @@ class DuplicateFinder:
         """
         if exclude_patterns is None:
             exclude_patterns = []
+        if isinstance(search_paths, (str, Path)):
+            search_paths = [Path(search_paths)]
             
-        # Stage 1: Group by file size
-        size_groups = self._group_by_size(search_paths, exclude_patterns)
-        
-        # Stage 2: Quick hash (first 1KB)
-        quick_hash_groups = self._group_by_quick_hash(size_groups)
-        
-        # Stage 3: Full hash for final verification
-        duplicate_groups = self._group_by_full_hash(quick_hash_groups)
-        
-        return duplicate_groups
+        self.stats = {
+            "files_scanned": 0, "hard_links_skipped": 0,
+            "bytes_hashed": 0, "cache_hits": 0, "hashed": 0, "cache_pruned": 0
+        }
+        cache = self._open_cache()
         
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                # Stage 1: Group by file size
+                size_groups = self._group_by_size(search_paths, exclude_patterns)
+                
+                # Stage 2: Quick hash (first 4KB)
+                groups = self._refine(list(size_groups.values()), "quick", self._quick_hash, pool, cache)
+                
+                # Stage 3: Partial hash (head and tail) of large files
+                large = [g for g in groups if g[0].size >= self.partial_hash_threshold]
+                small = [g for g in groups if g[0].size < self.partial_hash_threshold]
+                groups = small + self._refine(large, "partial", self._partial_hash, pool, cache)
+                
+                # Stage 4: Full hash for final verification
+                duplicates = self._group_by_full_hash(groups, pool, cache)
+                
+            # Only a completed scan may drop rows it did not reach
+            if cache:
+                self.stats["cache_pruned"] = cache.prune(search_paths)
+            return duplicates
+        finally:
+            if cache:
+                cache.close()
+                
     def remove_duplicates(
         self,
         duplicate_groups: List[DuplicateGroup],
-        keep_strategy: str = "first"  # first, oldest, newest, shortest_path
+        keep_strategy: str = "first",  # first, oldest, newest, shortest_path
+        mode: str = "delete"  # delete, hardlink, reflink, auto
     ) -> Dict[str, any]:
         """
-        Remove duplicate files, keeping one copy
+        Reclaim duplicate files, keeping one copy
+        
+        Modes:
+        - delete: unlink every path of each duplicate
+        - hardlink: replace each duplicate path with a hard link to the kept file
+        - reflink: replace each duplicate path with a copy-on-write clone (FICLONE)
+        - auto: reflink where the filesystem supports it, else hard link
+        
+        Replacements are built next to the target and renamed into place
+        atomically. Bytes count as reclaimed only once every link to a
+        duplicate inode is gone.
         
         Args:
             duplicate_groups: List of DuplicateGroup objects
             keep_strategy: Strategy for choosing which file to keep
+            mode: How duplicates are reclaimed
             
         Returns:
             Dict with removal results
         """
-        total_size_freed = 0
-        total_files_removed = 0
+        if mode not in ("delete", "hardlink", "reflink", "auto"):
+            raise ValueError(f"Unknown reclaim mode: {mode}")
+        
+        reclaimed = {"delete": 0, "hardlink": 0, "reflink": 0}
+        replaced = {"delete": 0, "hardlink": 0, "reflink": 0}
         errors = []
         
         for group in duplicate_groups:
             # Choose which file to keep
             keep_file = self._choose_keeper(group.files, keep_strategy)
             
-            # Remove duplicates
+            # Reclaim every other inode in the group
             for file_path in group.files:
                 if file_path == keep_file:
                     continue
-                    
+                
+                paths = group.paths_of(file_path)
                 try:
-                    size = file_path.stat().st_size
-                    
-                    if not self.dry_run:
-                        file_path.unlink()
-                        
-                    total_size_freed += size
-                    total_files_removed += 1
-                    
+                    nlink = file_path.stat().st_nlink
                 except (PermissionError, OSError) as e:
-                    errors.append({
-                        "file": str(file_path),
-                        "error": str(e)
-                    })
-                    
+                    errors.append({"file": str(file_path), "error": str(e)})
+                    continue
+                
+                done = 0
+                strategy = None
+                for path in paths:
+                    try:
+                        strategy = self._reclaim_path(path, keep_file, group, mode)
+                        replaced[strategy] += 1
+                        done += 1
+                    except (PermissionError, OSError) as e:
+                        errors.append({"file": str(path), "error": str(e)})
+                
+                # Links outside the scanned tree keep the old data alive
+                if strategy and done == len(paths) and nlink <= len(paths):
+                    reclaimed[strategy] += group.size
+        
         return {
-            "total_size_freed": total_size_freed,
-            "total_files_removed": total_files_removed,
+            "total_size_freed": sum(reclaimed.values()),
+            "total_files_removed": replaced["delete"],
+            "total_files_replaced": replaced["hardlink"] + replaced["reflink"],
+            "bytes_reclaimed": reclaimed,
+            "files_by_strategy": replaced,
             "groups_processed": len(duplicate_groups),
+            "mode": mode,
             "errors": errors
         }
         
+    def _reclaim_path(self, path: Path, keep_file: Path, group: DuplicateGroup, mode: str) -> str:
+        """Delete or relink one duplicate path; returns the strategy used"""
+        # Both sides must still be the scanned inodes with their hashed contents
+        for checked in (path, keep_file):
+            self._check_unchanged(checked, group)
+        
+        if mode == "delete":
+            if not self.dry_run:
+                path.unlink()
+            return "delete"
+        
+        if mode in ("reflink", "auto"):
+            if self.dry_run:
+                return "reflink"
+            try:
+                self._replace_atomically(path, lambda tmp: self._reflink(keep_file, tmp, path))
+                return "reflink"
+            except OSError:
+                if mode == "reflink":
+                    raise
+        
+        if not self.dry_run:
+            self._replace_atomically(path, lambda tmp: os.link(keep_file, tmp))
+        return "hardlink"
+        
+    @staticmethod
+    def _check_unchanged(path: Path, group: DuplicateGroup):
+        """Raise if path is no longer the file the scan hashed"""
+        st = os.stat(path, follow_symlinks=False)
+        expected = group.identities.get(path)
+        if st.st_size != group.size or (
+            expected is not None and (st.st_dev, st.st_ino, st.st_mtime_ns) != expected
+        ):
+            raise OSError(f"File changed since scan: {path}")
+        
+    @staticmethod
+    def _replace_atomically(path: Path, build: Callable[[Path], None]):
+        """Build a replacement beside path, then rename it over path"""
+        tmp = path.with_name(f".{path.name}.dedup-{uuid.uuid4().hex[:8]}")
+        try:
+            build(tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            raise
+        
+    @staticmethod
+    def _reflink(source: Path, tmp: Path, original: Path):
+        """Clone source's extents into a new file at tmp, keeping original's metadata"""
+        if fcntl is None:
+            raise OSError("Reflinks are not supported on this platform")
+        with open(source, 'rb') as src, open(tmp, 'xb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        shutil.copystat(original, tmp)
+        
     # ==================== Private Helper Methods ====================
     
-    def _group_by_size(
+    def _open_cache(self) -> Optional[HashCache]:
+        if not self.use_cache:
+            return None
+        try:
+            return HashCache(self.hash_cache_path)
+        except (sqlite3.Error, OSError):
+            # Unwritable cache location: hash without it
+            return None
+            
+    def _walk(
         self,
         search_paths: List[Path],
         exclude_patterns: List[str]
-    ) -> Dict[int, List[Path]]:
-        """Group files by size"""
-        size_map = defaultdict(list)
+    ):
+        """Yield regular files under search_paths using os.scandir's cached stat"""
+        stack = [str(p) for p in search_paths if p.exists()]
         
-        for search_path in search_paths:
-            if not search_path.exists():
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                                continue
+                            if not entry.is_file(follow_symlinks=False):
+                                continue
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                            
+                        # Skip files smaller than minimum
+                        if st.st_size < self.min_size:
+                            continue
+                            
+                        path = Path(entry.path)
+                        
+                        # Skip if matches exclude pattern
+                        if exclude_patterns and any(path.match(p) for p in exclude_patterns):
+                            continue
+                            
+                        yield FileEntry(
+                            path=path,
+                            size=st.st_size,
+                            dev=st.st_dev,
+                            inode=st.st_ino,
+                            mtime_ns=st.st_mtime_ns,
+                            nlink=st.st_nlink
+                        )
+            except (PermissionError, OSError):
                 continue
                 
-            for file_path in search_path.rglob("*"):
-                # Skip if not a file
-                if not file_path.is_file():
-                    continue
-                    
-                # Skip if matches exclude pattern
-                if any(file_path.match(pattern) for pattern in exclude_patterns):
-                    continue
-                    
-                try:
-                    size = file_path.stat().st_size
-                    
-                    # Skip files smaller than minimum
-                    if size < self.min_size:
-                        continue
-                        
-                    size_map[size].append(file_path)
-                    
-                except (PermissionError, OSError):
+    def _group_by_size(
+        self,
+        search_paths: List[Path],
+        exclude_patterns: List[str]
+    ) -> Dict[int, List[FileEntry]]:
+        """Group files by size, one entry per inode (hard links become aliases)"""
+        size_map = defaultdict(list)
+        inodes: Dict[Tuple[int, int], FileEntry] = {}
+        
+        for entry in self._walk(search_paths, exclude_patterns):
+            self.stats["files_scanned"] += 1
+            if entry.nlink > 1:
+                first = inodes.get((entry.dev, entry.inode))
+                if first is not None:
+                    first.aliases.append(entry.path)
+                    self.stats["hard_links_skipped"] += 1
                     continue
-                    
+                inodes[(entry.dev, entry.inode)] = entry
+            size_map[entry.size].append(entry)
+            
         # Keep only sizes with multiple files
         return {
             size: files
@@ -169,76 +471,142 @@ class DuplicateFinder:
             if len(files) > 1
         }
         
-    def _group_by_quick_hash(
+    def _hash_entries(
         self,
-        size_groups: Dict[int, List[Path]]
-    ) -> Dict[str, List[Path]]:
-        """Group by quick hash (first 1KB)"""
-        hash_map = defaultdict(list)
+        entries: List[FileEntry],
+        stage: str,
+        hash_func: Callable[[FileEntry], str],
+        pool: ThreadPoolExecutor,
+        cache: Optional[HashCache]
+    ) -> Dict[int, str]:
+        """Digest per entry (by list index); unreadable files are left out"""
+        digests: Dict[int, str] = {}
+        pending: List[int] = []
+        hits: List[FileEntry] = []
         
-        for size, files in size_groups.items():
-            for file_path in files:
-                try:
-                    quick_hash = self._quick_hash(file_path)
-                    hash_map[quick_hash].append(file_path)
-                except (PermissionError, OSError):
-                    continue
-                    
+        for i, entry in enumerate(entries):
+            cached = cache.get(entry, stage) if cache else None
+            if cached is not None:
+                digests[i] = cached
+                hits.append(entry)
+            else:
+                pending.append(i)
+                
+        self.stats["cache_hits"] += len(hits)
+        if cache and hits:
+            cache.touch_many(stage, hits)
+            
+        def safe_hash(i: int) -> Optional[str]:
+            try:
+                return hash_func(entries[i])
+            except (PermissionError, OSError):
+                return None
+                
+        computed = []
+        for i, digest in zip(pending, pool.map(safe_hash, pending)):
+            if digest is not None:
+                digests[i] = digest
+                computed.append((entries[i], digest))
+                
+        self.stats["hashed"] += len(computed)
+        if cache and computed:
+            cache.put_many(stage, computed)
+        return digests
+        
+    def _refine(
+        self,
+        groups: List[List[FileEntry]],
+        stage: str,
+        hash_func: Callable[[FileEntry], str],
+        pool: ThreadPoolExecutor,
+        cache: Optional[HashCache]
+    ) -> List[List[FileEntry]]:
+        """Split each candidate group by a digest, keeping groups with multiple files"""
+        entries = [entry for group in groups for entry in group]
+        digests = self._hash_entries(entries, stage, hash_func, pool, cache)
+        
+        refined = defaultdict(list)
+        for i, entry in enumerate(entries):
+            if i in digests:
+                refined[(entry.size, digests[i])].append(entry)
+                
         # Keep only hashes with multiple files
-        return {
-            hash_val: files
-            for hash_val, files in hash_map.items()
-            if len(files) > 1
-        }
+        return [files for files in refined.values() if len(files) > 1]
         
     def _group_by_full_hash(
         self,
-        quick_hash_groups: Dict[str, List[Path]]
+        groups: List[List[FileEntry]],
+        pool: ThreadPoolExecutor,
+        cache: Optional[HashCache]
     ) -> List[DuplicateGroup]:
-        """Group by full MD5 hash"""
-        duplicate_groups = []
+        """Group by full BLAKE2b hash"""
+        entries = [entry for group in groups for entry in group]
+        digests = self._hash_entries(entries, "full", self._full_hash, pool, cache)
+        
+        hash_map = defaultdict(list)
+        for i, entry in enumerate(entries):
+            if i in digests:
+                hash_map[(entry.size, digests[i])].append(entry)
+                
+        # Create DuplicateGroup for each hash with multiple files
+        return [
+            DuplicateGroup(
+                hash=digest,
+                size=size,
+                files=[e.path for e in duplicate_files],
+                hard_links={e.path: e.aliases for e in duplicate_files if e.aliases},
+                identities={
+                    path: (e.dev, e.inode, e.mtime_ns)
+                    for e in duplicate_files
+                    for path in [e.path] + e.aliases
+                }
+            )
+            for (size, digest), duplicate_files in hash_map.items()
+            if len(duplicate_files) > 1
+        ]
         
-        for quick_hash, files in quick_hash_groups.items():
-            hash_map = defaultdict(list)
+    def _read_digest(self, f, hasher, length: int):
+        """Feed up to length bytes from f into hasher through a reused buffer"""
+        buffer = bytearray(min(length, self.READ_BUFFER_BYTES))
+        view = memoryview(buffer)
+        read = 0
+        while length > 0:
+            n = f.readinto(view[:min(length, len(buffer))])
+            if not n:
+                break
+            hasher.update(view[:n])
+            length -= n
+            read += n
+        with self._stats_lock:
+            self.stats["bytes_hashed"] += read
             
-            for file_path in files:
-                try:
-                    full_hash = self._full_hash(file_path)
-                    hash_map[full_hash].append(file_path)
-                except (PermissionError, OSError):
-                    continue
-                    
-            # Create DuplicateGroup for each hash with multiple files
-            for full_hash, duplicate_files in hash_map.items():
-                if len(duplicate_files) > 1:
-                    size = duplicate_files[0].stat().st_size
-                    
-                    duplicate_groups.append(DuplicateGroup(
-                        hash=full_hash,
-                        size=size,
-                        files=duplicate_files
-                    ))
-                    
-        return duplicate_groups
-        
-    def _quick_hash(self, file_path: Path, chunk_size: int = 1024) -> str:
-        """Calculate hash of first 1KB"""
-        hasher = hashlib.md5()
-        
-        with open(file_path, 'rb') as f:
-            chunk = f.read(chunk_size)
-            hasher.update(chunk)
+    def _quick_hash(self, entry: FileEntry) -> str:
+        """Calculate hash of first 4KB"""
+        hasher = hashlib.blake2b(digest_size=16)
+        
+        with open(entry.path, 'rb', buffering=0) as f:
+            self._read_digest(f, hasher, self.QUICK_HASH_BYTES)
             
         return hasher.hexdigest()
         
-    def _full_hash(self, file_path: Path) -> str:
-        """Calculate MD5 hash of entire file"""
-        hasher = hashlib.md5()
+    def _partial_hash(self, entry: FileEntry) -> str:
+        """Calculate hash of the first and last 1MB"""
+        hasher = hashlib.blake2b(digest_size=16)
         
-        with open(file_path, 'rb') as f:
-            while chunk := f.read(8192):
-                hasher.update(chunk)
-                
+        with open(entry.path, 'rb', buffering=0) as f:
+            self._read_digest(f, hasher, self.PARTIAL_HASH_BYTES)
+            f.seek(max(0, entry.size - self.PARTIAL_HASH_BYTES))
+            self._read_digest(f, hasher, self.PARTIAL_HASH_BYTES)
+            
+        return hasher.hexdigest()
+        
+    def _full_hash(self, entry: FileEntry) -> str:
+        """Calculate BLAKE2b hash of entire file"""
+        hasher = hashlib.blake2b()
+        
+        with open(entry.path, 'rb', buffering=0) as f:
+            self._read_digest(f, hasher, entry.size)
+            
         return hasher.hexdigest()
         
     def _choose_keeper(
@@ -261,6 +629,4 @@ class DuplicateFinder:
             
         else:
             return files[0]
-
-
-from typing import Optional
+            
\ No newline at end of file
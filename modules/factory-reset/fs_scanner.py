@@ -0,0 +1,371 @@
+"""
+🌲 Filesystem Scanner
+Shared single-pass directory tree for the cleanup modules
+"""
+
+import fnmatch
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class ScannedFile:
+    """A regular file recorded in the scan tree"""
+    path: Path
+    size: int
+    mtime: float
+
+
+@dataclass
+class DirAggregate:
+    """Totals for a directory (its own files, or its whole subtree)"""
+    path: Path
+    size: int = 0
+    file_count: int = 0
+    oldest_mtime: Optional[float] = None
+    newest_mtime: Optional[float] = None
+    
+    def add_file(self, size: int, mtime: float):
+        self.size += size
+        self.file_count += 1
+        if self.oldest_mtime is None or mtime < self.oldest_mtime:
+            self.oldest_mtime = mtime
+        if self.newest_mtime is None or mtime > self.newest_mtime:
+            self.newest_mtime = mtime
+            
+    def merge(self, other: "DirAggregate"):
+        self.size += other.size
+        self.file_count += other.file_count
+        if other.oldest_mtime is not None and (self.oldest_mtime is None or other.oldest_mtime < self.oldest_mtime):
+            self.oldest_mtime = other.oldest_mtime
+        if other.newest_mtime is not None and (self.newest_mtime is None or other.newest_mtime > self.newest_mtime):
+            self.newest_mtime = other.newest_mtime
+            
+    def copy(self, path: Optional[Path] = None) -> "DirAggregate":
+        return DirAggregate(
+            path=path or self.path,
+            size=self.size,
+            file_count=self.file_count,
+            oldest_mtime=self.oldest_mtime,
+            newest_mtime=self.newest_mtime
+        )
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return {
+            "path": str(self.path),
+            "size": self.size,
+            "size_mb": round(self.size / (1024 * 1024), 2),
+            "file_count": self.file_count,
+            "oldest_mtime": self.oldest_mtime,
+            "newest_mtime": self.newest_mtime
+        }
+
+
+@dataclass
+class PruneRules:
+    """Directories the scanner never descends into"""
+    skip_names: FrozenSet[str] = frozenset()
+    skip_paths: FrozenSet[str] = frozenset({"/proc", "/sys", "/dev", "/run"})
+    same_filesystem: bool = True  # don't cross mount points below a root
+    
+    def allows(self, name: str, path: str) -> bool:
+        return name not in self.skip_names and path not in self.skip_paths
+
+
+@dataclass
+class _DirNode:
+    """One scanned directory: its entries plus own and subtree totals"""
+    path: str
+    mtime_ns: int
+    dev: int
+    scanned_at: float
+    checked_at: float
+    files: List[Tuple[str, int, float]]  # (name, size, mtime)
+    subdirs: List[str]
+    own: DirAggregate
+    total: Optional[DirAggregate] = None  # set once the subtree is rolled up
+
+
+class FileSystemScanner:
+    """
+    Single-pass os.scandir tree shared by the cleanup modules
+    
+    Directories are listed on a thread pool, one stat per entry, and each
+    node keeps its files plus rolled-up totals (bytes, file count,
+    oldest/newest mtime) so size and age queries never re-walk the disk.
+    
+    The tree persists between calls. On refresh a directory is re-listed
+    only if its mtime changed or its listing is older than ``ttl`` (in-place
+    edits to a file do not touch the directory mtime); directories checked
+    within ``recheck_interval`` are reused without a stat, so overlapping
+    queries in one analysis share a single walk. Callers that delete files
+    should ``invalidate`` the affected paths, and callers that delete by
+    age or size must re-stat each candidate first: a file entry can be up
+    to ``ttl`` seconds stale.
+    """
+    
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        prune: Optional[PruneRules] = None,
+        ttl: float = 300.0,
+        recheck_interval: float = 2.0
+    ):
+        """
+        Initialize Filesystem Scanner
+        
+        Args:
+            workers: Listing threads (default: 2 x CPUs, max 32)
+            prune: Pruning rules (default: skip /proc, /sys, /dev, /run and other mounts)
+            ttl: Seconds before an unchanged directory is re-listed anyway
+            recheck_interval: Seconds a validated directory is trusted without a stat
+        """
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 2)
+        self.prune = prune or PruneRules()
+        self.ttl = ttl
+        self.recheck_interval = recheck_interval
+        self.stats: Dict[str, int] = {"dirs_scanned": 0, "dirs_revalidated": 0, "dirs_reused": 0}
+        self._nodes: Dict[str, _DirNode] = {}
+        self._lock = threading.RLock()
+        
+    def refresh(self, roots: Iterable[Path]):
+        """Bring the tree under each root up to date"""
+        now = time.monotonic()
+        
+        with self._lock:
+            visited: List[_DirNode] = []
+            
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                pending = {}
+                queue = [(self._key(root), None) for root in roots]
+                
+                while queue or pending:
+                    while queue:
+                        path, parent_dev = queue.pop()
+                        cached = self._nodes.get(path)
+                        if cached and now - cached.checked_at < self.recheck_interval:
+                            # Validated moments ago, e.g. by an overlapping root
+                            self.stats["dirs_reused"] += 1
+                            visited.append(cached)
+                            queue.extend((sub, cached.dev) for sub in cached.subdirs)
+                            continue
+                        future = pool.submit(self._visit, path, parent_dev, cached, now)
+                        pending[future] = (path, cached)
+                        
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        path, cached = pending.pop(future)
+                        node = future.result()
+                        
+                        if node is None:
+                            self._drop(path)
+                            continue
+                        if cached is not None and node is not cached:
+                            for gone in set(cached.subdirs) - set(node.subdirs):
+                                self._drop(gone)
+                                
+                        self.stats["dirs_revalidated" if node is cached else "dirs_scanned"] += 1
+                        self._nodes[path] = node
+                        visited.append(node)
+                        queue.extend((sub, node.dev) for sub in node.subdirs)
+                        
+            # Roll totals up from the deepest directories
+            visited.sort(key=lambda n: n.path.count(os.sep), reverse=True)
+            for node in visited:
+                total = node.own.copy()
+                for sub in node.subdirs:
+                    child = self._nodes.get(sub)
+                    if child is not None and child.total is not None:
+                        total.merge(child.total)
+                node.total = total
+                
+    def aggregate(self, path: Path, recursive: bool = True, refresh: bool = True) -> DirAggregate:
+        """
+        Totals for a file or directory
+        
+        Args:
+            path: File or directory to summarize
+            recursive: Include subdirectories (False: only the directory's own files)
+            refresh: Revalidate the tree first
+            
+        Returns:
+            DirAggregate (empty if the path does not exist)
+        """
+        path = Path(path).expanduser()
+        
+        with self._lock:
+            node = self._node(path, refresh)
+            if node is not None:
+                return (node.total if recursive else node.own).copy(path)
+                
+        result = DirAggregate(path=path)
+        try:
+            st = os.stat(path, follow_symlinks=False)
+            if os.path.isfile(path) and not os.path.islink(path):
+                result.add_file(st.st_size, st.st_mtime)
+        except OSError:
+            pass
+        return result
+        
+    def total(self, paths: Iterable[Path], refresh: bool = True) -> DirAggregate:
+        """Combined totals for several paths, refreshed in one pass"""
+        paths = [Path(p).expanduser() for p in paths]
+        if refresh:
+            self.refresh(p for p in paths if p.is_dir())
+            
+        result = DirAggregate(path=Path(os.path.commonpath(paths)) if paths else Path("/"))
+        for path in paths:
+            result.merge(self.aggregate(path, refresh=False))
+        return result
+        
+    def iter_files(
+        self,
+        path: Path,
+        pattern: Optional[str] = None,
+        recursive: bool = True,
+        refresh: bool = True
+    ) -> List[ScannedFile]:
+        """
+        Files under a directory from the tree
+        
+        Args:
+            path: Directory (or single file) to list
+            pattern: Optional fnmatch pattern on the file name (e.g. "*.log")
+            recursive: Include subdirectories
+            refresh: Revalidate the tree first
+            
+        Returns:
+            List of ScannedFile objects
+        """
+        path = Path(path).expanduser()
+        files = []
+        
+        with self._lock:
+            node = self._node(path, refresh)
+            if node is None:
+                aggregate = self.aggregate(path, refresh=False)
+                if aggregate.file_count and (pattern is None or fnmatch.fnmatch(path.name, pattern)):
+                    files.append(ScannedFile(path=path, size=aggregate.size, mtime=aggregate.newest_mtime))
+                return files
+                
+            stack = [node]
+            while stack:
+                node = stack.pop()
+                for name, size, mtime in node.files:
+                    if pattern is None or fnmatch.fnmatch(name, pattern):
+                        files.append(ScannedFile(path=Path(node.path, name), size=size, mtime=mtime))
+                if recursive:
+                    stack.extend(self._nodes[sub] for sub in node.subdirs if sub in self._nodes)
+                    
+        return files
+        
+    def invalidate(self, path: Path):
+        """Force a re-list of path's subtree (and its parent) on the next refresh"""
+        key = self._key(path)
+        
+        with self._lock:
+            stack = [key, os.path.dirname(key)]
+            while stack:
+                node = self._nodes.get(stack.pop())
+                if node is None:
+                    continue
+                node.scanned_at = node.checked_at = float("-inf")
+                if node.path.startswith(key):
+                    stack.extend(node.subdirs)
+                    
+    def clear(self):
+        """Drop the whole tree"""
+        with self._lock:
+            self._nodes.clear()
+            
+    # ==================== Private Helper Methods ====================
+    
+    @staticmethod
+    def _key(path: Path) -> str:
+        return os.path.abspath(os.path.expanduser(str(path)))
+        
+    def _node(self, path: Path, refresh: bool) -> Optional[_DirNode]:
+        key = self._key(path)
+        if refresh and os.path.isdir(key) and not os.path.islink(key):
+            self.refresh([key])
+        node = self._nodes.get(key)
+        return node if node is not None and node.total is not None else None
+        
+    def _drop(self, path: str):
+        """Remove a directory and everything below it from the tree"""
+        stack = [path]
+        while stack:
+            node = self._nodes.pop(stack.pop(), None)
+            if node is not None:
+                stack.extend(node.subdirs)
+                
+    def _visit(
+        self,
+        path: str,
+        parent_dev: Optional[int],
+        cached: Optional[_DirNode],
+        now: float
+    ) -> Optional[_DirNode]:
+        """Stat one directory and re-list it if it changed (runs on the pool)"""
+        try:
+            st = os.stat(path, follow_symlinks=False)
+        except OSError:
+            return None
+        if self.prune.same_filesystem and parent_dev is not None and st.st_dev != parent_dev:
+            return None
+            
+        if cached is not None and cached.mtime_ns == st.st_mtime_ns and now - cached.scanned_at < self.ttl:
+            cached.checked_at = now
+            return cached
+            
+        # Stat before listing: a change during the listing bumps the mtime past ours
+        files = []
+        subdirs = []
+        own = DirAggregate(path=Path(path))
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if self.prune.allows(entry.name, entry.path):
+                                subdirs.append(entry.path)
+                            continue
+                        if not entry.is_file(follow_symlinks=False):
+                            continue
+                        entry_st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    files.append((entry.name, entry_st.st_size, entry_st.st_mtime))
+                    own.add_file(entry_st.st_size, entry_st.st_mtime)
+        except (PermissionError, OSError):
+            pass
+            
+        return _DirNode(
+            path=path,
+            mtime_ns=st.st_mtime_ns,
+            dev=st.st_dev,
+            scanned_at=now,
+            checked_at=now,
+            files=files,
+            subdirs=subdirs,
+            own=own
+        )
+
+
+_shared_scanner: Optional[FileSystemScanner] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_scanner() -> FileSystemScanner:
+    """Process-wide scanner used by the cleaners unless one is passed in"""
+    global _shared_scanner
+    with _shared_lock:
+        if _shared_scanner is None:
+            _shared_scanner = FileSystemScanner()
+        return _shared_scanner
@@ -5,11 +5,14 @@ Intelligent log file rotation and cleanup
 
 import gzip
 import shutil
+import stat
 from pathlib import Path
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+from fs_scanner import FileSystemScanner, ScannedFile, get_shared_scanner
+
 
 @dataclass
 class LogFileInfo:
@@ -60,7 +63,8 @@ class LogManager:
         self,
         max_age_days: int = 90,
         compress_older_than_days: int = 30,
-        dry_run: bool = False
+        dry_run: bool = False,
+        scanner: Optional[FileSystemScanner] = None
     ):
         """
         Initialize Log Manager
@@ -69,10 +73,12 @@ class LogManager:
             max_age_days: Remove logs older than this many days
             compress_older_than_days: Compress logs older than this many days
             dry_run: If True, only simulate operations
+            scanner: Directory tree to query (default: the shared scanner)
         """
         self.max_age_days = max_age_days
         self.compress_older_than_days = compress_older_than_days
         self.dry_run = dry_run
+        self.scanner = scanner or get_shared_scanner()
         
     def scan_logs(self) -> List[LogFileInfo]:
         """
@@ -82,6 +88,7 @@ class LogManager:
             List of LogFileInfo objects
         """
         logs = []
+        self.scanner.refresh(self._log_dirs())
         
         for category, locations in self.LOG_LOCATIONS.items():
             for location in locations:
@@ -93,16 +100,15 @@ class LogManager:
                     pattern = path.name
                     
                     if parent.exists():
-                        for log_file in parent.glob(pattern):
-                            if log_file.is_file():
-                                logs.append(self._get_log_info(log_file, category))
+                        for log_file in self.scanner.iter_files(parent, pattern, recursive=False, refresh=False):
+                            logs.append(self._scanned_log_info(log_file, category))
                 else:
                     if path.is_file():
                         logs.append(self._get_log_info(path, category))
                     elif path.is_dir():
                         # Recursively find log files
-                        for log_file in path.rglob("*.log"):
-                            logs.append(self._get_log_info(log_file, category))
+                        for log_file in self.scanner.iter_files(path, "*.log", refresh=False):
+                            logs.append(self._scanned_log_info(log_file, category))
                             
         return logs
         
@@ -123,8 +129,10 @@ class LogManager:
         for log in logs:
             if log.last_modified < cutoff_date:
                 try:
-                    size = log.size
-                    
+                    size = self._size_if_older(log.path, cutoff_date)
+                    if size is None:
+                        continue
+                        
                     if not self.dry_run:
                         log.path.unlink()
                         
@@ -137,6 +145,8 @@ class LogManager:
                         "error": str(e)
                     })
                     
+        self._invalidate([log for log in logs if log.last_modified < cutoff_date])
+        
         return {
             "total_size_freed": total_size,
             "total_files_removed": total_files,
@@ -165,8 +175,10 @@ class LogManager:
                 
             if log.last_modified < cutoff_date:
                 try:
-                    original_size = log.size
-                    
+                    original_size = self._size_if_older(log.path, cutoff_date)
+                    if original_size is None:
+                        continue
+                        
                     if not self.dry_run:
                         compressed_size = self._compress_log(log.path)
                     else:
@@ -183,6 +195,8 @@ class LogManager:
                         "error": str(e)
                     })
                     
+        self._invalidate([log for log in logs if log.last_modified < cutoff_date])
+        
         return {
             "total_original_size": total_original_size,
             "total_compressed_size": total_compressed_size,
@@ -227,6 +241,9 @@ class LogManager:
             if oldest.exists() and not self.dry_run:
                 oldest.unlink()
                 
+            if not self.dry_run:
+                self.scanner.invalidate(log_path.parent)
+                
             return True
             
         except (PermissionError, OSError):
@@ -261,17 +278,60 @@ class LogManager:
     def _get_log_info(self, path: Path, category: str) -> LogFileInfo:
         """Get information about a log file"""
         stat = path.stat()
-        last_modified = datetime.fromtimestamp(stat.st_mtime)
+        return self._scanned_log_info(ScannedFile(path, stat.st_size, stat.st_mtime), category)
+        
+    def _scanned_log_info(self, log_file: ScannedFile, category: str) -> LogFileInfo:
+        """Build log info from a scan tree entry (no extra stat)"""
+        last_modified = datetime.fromtimestamp(log_file.mtime)
         age_days = (datetime.now() - last_modified).days
         
         return LogFileInfo(
-            path=path,
-            size=stat.st_size,
+            path=log_file.path,
+            size=log_file.size,
             age_days=age_days,
             last_modified=last_modified,
             category=category
         )
         
+    def _size_if_older(self, path: Path, cutoff_date: datetime) -> Optional[int]:
+        """
+        Fresh size of a log still last modified before cutoff_date
+        
+        Scan tree entries can predate an in-place append (which leaves the
+        directory mtime alone), so destructive operations re-stat first.
+        
+        Returns:
+            Current size, or None if the file changed, vanished or is not regular
+        """
+        current = path.lstat()
+        if not stat.S_ISREG(current.st_mode):
+            return None
+        if datetime.fromtimestamp(current.st_mtime) >= cutoff_date:
+            return None
+        return current.st_size
+        
+    def _log_dirs(self) -> List[Path]:
+        """Directories holding the configured log locations, each listed once"""
+        dirs = []
+        
+        for locations in self.LOG_LOCATIONS.values():
+            for location in locations:
+                path = Path(location).expanduser()
+                if "*" in str(path):
+                    path = Path(str(path).split("*")[0]).parent
+                if path.is_dir() and path not in dirs:
+                    dirs.append(path)
+                    
+        return dirs
+        
+    def _invalidate(self, logs: List[LogFileInfo]):
+        """Mark directories whose logs were removed or compressed as changed"""
+        if self.dry_run:
+            return
+            
+        for directory in {log.path.parent for log in logs}:
+            self.scanner.invalidate(directory)
+        
     def _compress_log(
         self,
         source: Path,
@@ -32,6 +32,7 @@ from log_manager import LogManager
 from duplicate_finder import DuplicateFinder
 from privacy_cleaner import PrivacyCleaner
 from trash_manager import TrashManager
+from fs_scanner import get_shared_scanner
 
 app = FastAPI(
     title="OSE Factory Reset Service",
@@ -125,7 +126,7 @@ async def analyze_cache_files() -> ResetComponent:
     """Analyze cache files using CacheCleaner"""
     try:
         cleaner = CacheCleaner()
-        caches = cleaner.get_all_caches()
+        caches = await asyncio.to_thread(cleaner.scan_caches)
         
         total_size = sum(c.size for c in caches)
         total_count = sum(c.file_count for c in caches)
@@ -158,7 +159,7 @@ async def analyze_temp_files() -> ResetComponent:
     """Analyze temporary files using TempCleaner"""
     try:
         cleaner = TempCleaner()
-        temp_info = cleaner.get_temp_info()
+        temp_info = await asyncio.to_thread(cleaner.get_temp_info)
         
         total_size = sum(info.size for info in temp_info)
         total_count = sum(info.file_count for info in temp_info)
@@ -188,32 +189,21 @@ async def analyze_temp_files() -> ResetComponent:
 
 async def analyze_user_configs() -> ResetComponent:
     """Analyze user configuration files"""
-    size = 0
-    count = 0
-    
     config_dirs = [
         Path.home() / ".config",
         Path.home() / ".local",
         Path.home() / ".ssh"
     ]
     
-    for config_dir in config_dirs:
-        if config_dir.exists():
-            for item in config_dir.rglob("*"):
-                if item.is_file():
-                    try:
-                        size += item.stat().st_size
-                        count += 1
-                    except:
-                        pass
+    totals = await asyncio.to_thread(get_shared_scanner().total, config_dirs)
     
     return ResetComponent(
         id="user_configs",
         name="User Configurations",
         description=".config, .local, .ssh, dotfiles",
         category="configuration",
-        size_mb=round(size / (1024**2), 2),
-        items_count=count,
+        size_mb=round(totals.size / (1024**2), 2),
+        items_count=totals.file_count,
         can_backup=True,
         risk_level="high"
     )
@@ -272,15 +262,13 @@ async def analyze_user_applications() -> ResetComponent:
         Path("/usr/local/bin")
     ]
     
+    scanner = get_shared_scanner()
     for app_dir in app_dirs:
         if app_dir.exists():
-            for item in app_dir.iterdir():
-                try:
-                    if item.is_file():
-                        size += item.stat().st_size
-                        count += 1
-                except:
-                    pass
+            # Top-level files only; .local is usually fresh from analyze_user_configs
+            info = await asyncio.to_thread(scanner.aggregate, app_dir, False)
+            size += info.size
+            count += info.file_count
     
     return ResetComponent(
         id="user_applications",
@@ -556,12 +544,14 @@ async def find_duplicates():
     """Find duplicate files using DuplicateFinder"""
     try:
         finder = DuplicateFinder()
-        duplicates = finder.find_duplicates(Path.home())
+        duplicates = await asyncio.to_thread(finder.find_duplicates, [Path.home()])
+        duplicates.sort(key=lambda d: d.wasted_space, reverse=True)
         return {
             "status": "success",
             "duplicate_groups": len(duplicates),
-            "potential_space_mb": sum(d.get("size_mb", 0) for d in duplicates),
-            "duplicates": duplicates[:100],  # Limit to first 100
+            "potential_space_mb": round(sum(d.wasted_space for d in duplicates) / (1024 * 1024), 2),
+            "duplicates": [d.to_dict() for d in duplicates[:100]],  # Limit to first 100
+            "scan_stats": finder.stats,
             "timestamp": datetime.now().isoformat()
         }
     except Exception as e:
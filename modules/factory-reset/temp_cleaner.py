@@ -4,11 +4,14 @@ Removes temporary files and directories
 """
 
 import os
+import stat
 import time
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 from dataclasses import dataclass
 
+from fs_scanner import DirAggregate, FileSystemScanner, get_shared_scanner
+
 
 @dataclass
 class TempFileInfo:
@@ -51,7 +54,8 @@ class TempCleaner:
     def __init__(
         self,
         max_age_hours: int = 24,
-        dry_run: bool = False
+        dry_run: bool = False,
+        scanner: Optional[FileSystemScanner] = None
     ):
         """
         Initialize Temp Cleaner
@@ -59,10 +63,12 @@ class TempCleaner:
         Args:
             max_age_hours: Remove files older than this many hours
             dry_run: If True, only simulate cleanup
+            scanner: Directory tree to query (default: the shared scanner)
         """
         self.max_age_hours = max_age_hours
         self.dry_run = dry_run
         self.max_age_seconds = max_age_hours * 3600
+        self.scanner = scanner or get_shared_scanner()
         
     def scan_temp_files(self) -> List[TempFileInfo]:
         """
@@ -73,6 +79,7 @@ class TempCleaner:
         """
         temp_files = []
         current_time = time.time()
+        self.scanner.refresh(self._existing_locations())
         
         for category, locations in self.TEMP_LOCATIONS.items():
             for location in locations:
@@ -81,28 +88,37 @@ class TempCleaner:
                 if not path.exists():
                     continue
                     
-                try:
-                    for item in path.rglob("*"):
-                        if not item.is_file():
-                            continue
-                            
-                        stat = item.stat()
-                        age = current_time - stat.st_mtime
-                        age_hours = age / 3600
-                        
-                        # Only include files older than threshold
-                        if age > self.max_age_seconds:
-                            temp_files.append(TempFileInfo(
-                                path=item,
-                                size=stat.st_size,
-                                age_hours=age_hours,
-                                category=category
-                            ))
-                except (PermissionError, OSError):
+                # Whole subtree is newer than the threshold: nothing to list
+                info = self.scanner.aggregate(path, refresh=False)
+                if info.oldest_mtime is None or current_time - info.oldest_mtime <= self.max_age_seconds:
                     continue
                     
+                for item in self.scanner.iter_files(path, refresh=False):
+                    age = current_time - item.mtime
+                    
+                    # Only include files older than threshold
+                    if age > self.max_age_seconds:
+                        temp_files.append(TempFileInfo(
+                            path=item.path,
+                            size=item.size,
+                            age_hours=age / 3600,
+                            category=category
+                        ))
+                        
         return temp_files
         
+    def get_temp_info(self) -> List[DirAggregate]:
+        """
+        Summarize each existing temp location
+        
+        Returns:
+            List of DirAggregate objects (size, file count, oldest/newest mtime)
+        """
+        locations = self._existing_locations()
+        self.scanner.refresh(locations)
+        
+        return [self.scanner.aggregate(path, refresh=False) for path in locations]
+        
     def clean_temp_files(self) -> Dict[str, any]:
         """
         Clean temporary files
@@ -114,14 +130,21 @@ class TempCleaner:
         
         total_size = 0
         total_files = 0
+        skipped = 0
         errors = []
         
         for temp_file in temp_files:
             try:
+                # The scan tree can predate an in-place write: re-check before deleting
+                current = temp_file.path.lstat()
+                if not stat.S_ISREG(current.st_mode) or time.time() - current.st_mtime <= self.max_age_seconds:
+                    skipped += 1
+                    continue
+                    
                 if not self.dry_run:
                     temp_file.path.unlink()
                     
-                total_size += temp_file.size
+                total_size += current.st_size
                 total_files += 1
                 
             except (PermissionError, OSError) as e:
@@ -130,9 +153,14 @@ class TempCleaner:
                     "error": str(e)
                 })
                 
+        if not self.dry_run:
+            for path in {temp_file.path.parent for temp_file in temp_files}:
+                self.scanner.invalidate(path)
+                
         return {
             "total_size_freed": total_size,
             "total_files_removed": total_files,
+            "files_skipped": skipped,
             "errors": errors
         }
         
@@ -169,6 +197,8 @@ class TempCleaner:
                         except (PermissionError, OSError):
                             continue
                             
+                    self.scanner.invalidate(path)
+                    
                 after = self._get_dir_size(path)
                 total_freed += before - after
                 
@@ -218,6 +248,9 @@ class TempCleaner:
         except (PermissionError, OSError):
             pass
             
+        if total_freed and not self.dry_run:
+            self.scanner.invalidate(downloads)
+            
         return total_freed
         
     def empty_trash(self) -> int:
@@ -254,6 +287,8 @@ class TempCleaner:
                         except (PermissionError, OSError):
                             continue
                             
+                    self.scanner.invalidate(trash_path)
+                    
                 after = self._get_dir_size(trash_path)
                 total_freed += before - after
                 
@@ -266,13 +301,16 @@ class TempCleaner:
     
     def _get_dir_size(self, path: Path) -> int:
         """Get total size of directory in bytes"""
-        total_size = 0
+        return self.scanner.aggregate(path).size
         
-        try:
-            for item in path.rglob("*"):
-                if item.is_file():
-                    total_size += item.stat().st_size
-        except (PermissionError, OSError):
-            pass
-            
-        return total_size
+    def _existing_locations(self) -> List[Path]:
+        """Temp location directories that exist, each listed once"""
+        locations = []
+        
+        for paths in self.TEMP_LOCATIONS.values():
+            for location in paths:
+                path = Path(location).expanduser()
+                if path.is_dir() and path not in locations:
+                    locations.append(path)
+                    
+        return locations
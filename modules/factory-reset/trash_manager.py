@@ -10,6 +10,8 @@ from typing import List, Dict, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
+from fs_scanner import FileSystemScanner, get_shared_scanner
+
 
 @dataclass
 class TrashItem:
@@ -32,17 +34,23 @@ class TrashManager:
     - Automatic cleanup of old trash items
     """
     
-    def __init__(self, trash_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        trash_dir: Optional[Path] = None,
+        scanner: Optional[FileSystemScanner] = None
+    ):
         """
         Initialize Trash Manager
         
         Args:
             trash_dir: Custom trash directory (uses default if None)
+            scanner: Directory tree to query (default: the shared scanner)
         """
         if trash_dir is None:
             trash_dir = Path.home() / ".ose" / "trash"
             
         self.trash_dir = trash_dir
+        self.scanner = scanner or get_shared_scanner()
         self.trash_dir.mkdir(parents=True, exist_ok=True)
         
         # Metadata directory
@@ -73,6 +81,8 @@ class TrashManager:
             
             # Move file/directory
             shutil.move(str(file_path), str(dest))
+            self.scanner.invalidate(file_path)
+            self.scanner.invalidate(trash_subdir)
             
             # Save metadata
             self._save_metadata(
@@ -140,6 +150,8 @@ class TrashManager:
             
             # Move back from trash
             shutil.move(str(trash_path), str(restore_to))
+            self.scanner.invalidate(trash_path)
+            self.scanner.invalidate(restore_to)
             
             # Remove metadata
             self._remove_metadata(trash_path)
@@ -195,6 +207,9 @@ class TrashManager:
                     "error": str(e)
                 })
                 
+        if total_items_deleted:
+            self.scanner.invalidate(self.trash_dir)
+            
         return {
             "total_size_freed": total_size_freed,
             "total_items_deleted": total_items_deleted,
@@ -203,27 +218,16 @@ class TrashManager:
         
     def get_trash_size(self) -> int:
         """Get total size of trash in bytes"""
-        total_size = 0
+        total_size = self.scanner.aggregate(self.trash_dir).size
+        metadata_size = self.scanner.aggregate(self.metadata_dir, recursive=False, refresh=False).size
         
-        for item in self.trash_dir.rglob("*"):
-            if item.is_file() and not item.parent.name == ".metadata":
-                total_size += item.stat().st_size
-                
-        return total_size
+        return total_size - metadata_size
         
     # ==================== Private Helper Methods ====================
     
     def _get_size(self, path: Path) -> int:
         """Get size of file or directory"""
-        if path.is_file():
-            return path.stat().st_size
-            
-        total_size = 0
-        for item in path.rglob("*"):
-            if item.is_file():
-                total_size += item.stat().st_size
-                
-        return total_size
+        return self.scanner.aggregate(path).size
         
     def _save_metadata(
         self,
@@ -248,6 +252,8 @@ class TrashManager:
         with open(metadata_file, 'w') as f:
             json.dump(metadata, f, indent=2)
             
+        self.scanner.invalidate(self.metadata_dir)
+            
     def _load_metadata(self, metadata_file: Path) -> Optional[TrashItem]:
         """Load metadata from file"""
         import json
@@ -293,4 +299,5 @@ class TrashManager:
                 
             if Path(data["trash_path"]) == trash_path:
                 metadata_file.unlink()
+                self.scanner.invalidate(self.metadata_dir)
                 break
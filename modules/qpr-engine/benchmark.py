@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+QPR Scheduler Benchmark
+Compares the scheduler's predicted makespan with the actual makespan of
+recorded workflow executions (records that carry ``dependencies`` and
+``step_durations``, as posted by the workflow orchestrator).
+
+    python benchmark.py --history-db /tmp/qpr_history.db
+    python benchmark.py --synthetic 50    # record and replay random DAG runs
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from main import QPREngine
+
+
+async def run_workflow(graph: Dict[str, List[str]], durations: Dict[str, float],
+                       max_parallel: int) -> Dict[str, float]:
+    """Execute a DAG of sleeps on a ready queue (as the orchestrator does)"""
+    limit = asyncio.Semaphore(max_parallel)
+    done: Dict[str, asyncio.Task] = {}
+    observed: Dict[str, float] = {}
+    
+    async def step(name: str):
+        await asyncio.gather(*(done[d] for d in graph[name]))
+        async with limit:
+            start = time.perf_counter()
+            await asyncio.sleep(durations[name])
+            observed[name] = time.perf_counter() - start
+    
+    for name in graph:
+        done[name] = asyncio.ensure_future(step(name))
+    await asyncio.gather(*done.values())
+    return observed
+
+
+def synthetic_workflow(rng: random.Random, size: int) -> Dict[str, List[str]]:
+    names = [f"step_{i}" for i in range(size)]
+    return {
+        name: rng.sample(names[:i], min(i, rng.randint(0, 3)))
+        for i, name in enumerate(names)
+    }
+
+
+async def record_synthetic(qpr: QPREngine, runs: int, seed: int = 11):
+    rng = random.Random(seed)
+    base = {f"step_{i}": rng.uniform(0.01, 0.08) for i in range(40)}
+    for run in range(runs):
+        graph = synthetic_workflow(rng, rng.randint(5, 40))
+        max_parallel = rng.choice([2, 4, 8])
+        # Actual durations wobble +/-20% around each step's typical cost
+        durations = {name: base[name] * rng.uniform(0.8, 1.2) for name in graph}
+        start = time.perf_counter()
+        observed = await run_workflow(graph, durations, max_parallel)
+        await qpr.record_execution(
+            f"synthetic-{run}", list(graph), True, time.perf_counter() - start,
+            step_durations=observed, dependencies=graph, max_parallel=max_parallel
+        )
+
+
+def evaluate(qpr: QPREngine) -> List[Dict[str, float]]:
+    rows = []
+    for record in qpr.history.iter_records():
+        graph = record.get('dependencies')
+        if not graph or not record.get('step_durations'):
+            continue
+        durations = qpr.estimate_durations({name: {} for name in graph})
+        _, predicted = qpr.schedule(graph, durations, record.get('max_parallel'))
+        rows.append({
+            'steps': len(graph),
+            'workers': record.get('max_parallel') or len(graph),
+            'predicted': predicted,
+            'actual': record['duration']
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Predicted vs actual workflow makespan")
+    parser.add_argument("--history-db", default="/tmp/qpr_history.db")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="Record this many random DAG runs into a scratch history first")
+    args = parser.parse_args()
+    
+    if args.synthetic:
+        scratch = Path(tempfile.mkdtemp())
+        qpr = QPREngine(history_db=str(scratch / "qpr_history.db"),
+                        legacy_history_file=str(scratch / "qpr_history.json"))
+        asyncio.run(record_synthetic(qpr, args.synthetic))
+    else:
+        qpr = QPREngine(history_db=args.history_db)
+    
+    rows = evaluate(qpr)
+    if not rows:
+        print("No recorded executions with dependencies and step durations")
+        return
+    
+    print(f"{'steps':>6} {'workers':>8} {'predicted s':>12} {'actual s':>10} {'error %':>8}")
+    errors = []
+    for row in rows:
+        error = (row['predicted'] - row['actual']) / row['actual'] * 100 if row['actual'] else 0.0
+        errors.append(abs(error))
+        print(f"{row['steps']:>6} {row['workers']:>8} {row['predicted']:>12.3f} "
+              f"{row['actual']:>10.3f} {error:>8.1f}")
+    p90 = statistics.quantiles(errors, n=10)[-1] if len(errors) > 1 else errors[0]
+    print(f"\n{len(rows)} runs, mean absolute error {statistics.mean(errors):.1f}%, p90 {p90:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
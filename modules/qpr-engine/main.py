@@ -9,12 +9,14 @@
 import asyncio
 import json
 import logging
+import sqlite3
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, deque
 import hashlib
+import heapq
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -31,6 +33,8 @@ class WorkflowPath:
     parallel_groups: List[List[str]]
     risk_score: float  # 0-1
     recommended: bool
+    workers: int = 0  # 0 = unbounded
+    schedule: List[Dict[str, Any]] = field(default_factory=list)  # {step, worker, start, finish}
 
 
 @dataclass
@@ -44,6 +48,233 @@ class PathOptimization:
     confidence: float
 
 
+@dataclass
+class StepDurationStats:
+    """Running duration statistics for one step"""
+    samples: int = 0
+    total: float = 0.0
+    ewma: float = 0.0
+    recent: deque = field(default_factory=lambda: deque(maxlen=100))
+    
+    def add(self, duration: float, alpha: float):
+        self.ewma = duration if self.samples == 0 else alpha * duration + (1 - alpha) * self.ewma
+        self.samples += 1
+        self.total += duration
+        self.recent.append(duration)
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.samples if self.samples else 0.0
+    
+    @property
+    def p95(self) -> float:
+        """Nearest-rank P95 over the recent window"""
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[max(0, -(-len(ordered) * 95 // 100) - 1)]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "mean": round(self.mean, 4),
+            "ewma": round(self.ewma, 4),
+            "p95": round(self.p95, 4)
+        }
+
+
+class ExecutionHistoryStore:
+    """
+    Append-only SQLite execution log with incrementally maintained counters
+    
+    Every record is appended to ``executions``; per-pattern (step and
+    step pair) success counts and per-step duration statistics (mean,
+    EWMA, P95 over a recent window) are updated in place for the steps
+    it touches, so recording costs O(steps) and startup loads the
+    counters instead of replaying the log.
+    """
+    
+    def __init__(self, db_path: str = "/tmp/qpr_history.db", alpha: float = 0.3,
+                 window: int = 100):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.alpha = alpha
+        self.window = window
+        self.patterns: Dict[str, List[int]] = {}  # pattern -> [runs, successes]
+        self.durations: Dict[str, StepDurationStats] = {}
+        self.total_records = 0
+        
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._init_database()
+        self._load_counters()
+    
+    def _init_database(self):
+        """Initialize database schema"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS executions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                path_id TEXT,
+                timestamp TEXT NOT NULL,
+                steps TEXT NOT NULL,
+                success INTEGER NOT NULL,
+                duration REAL NOT NULL,
+                step_durations TEXT,
+                dependencies TEXT,
+                max_parallel INTEGER
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS pattern_stats (
+                pattern TEXT PRIMARY KEY,
+                runs INTEGER NOT NULL,
+                successes INTEGER NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS step_stats (
+                step TEXT PRIMARY KEY,
+                samples INTEGER NOT NULL,
+                total REAL NOT NULL,
+                ewma REAL NOT NULL,
+                recent TEXT NOT NULL
+            )
+        """)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        """)
+        self.conn.commit()
+    
+    def _load_counters(self):
+        cursor = self.conn.cursor()
+        for pattern, runs, successes in cursor.execute(
+            "SELECT pattern, runs, successes FROM pattern_stats"
+        ):
+            self.patterns[pattern] = [runs, successes]
+        for step, samples, total, ewma, recent in cursor.execute(
+            "SELECT step, samples, total, ewma, recent FROM step_stats"
+        ):
+            self.durations[step] = StepDurationStats(
+                samples=samples, total=total, ewma=ewma,
+                recent=deque(json.loads(recent), maxlen=self.window)
+            )
+        row = cursor.execute("SELECT value FROM meta WHERE key = 'total_records'").fetchone()
+        self.total_records = row[0] if row else 0
+    
+    @staticmethod
+    def patterns_for(steps: List[str]) -> List[str]:
+        """Single steps and consecutive step pairs"""
+        return list(steps) + [f"{steps[i]}→{steps[i+1]}" for i in range(len(steps) - 1)]
+    
+    def append(self, record: Dict[str, Any], commit: bool = True) -> Tuple[List[str], List[str]]:
+        """
+        Append one execution and fold it into the counters
+        
+        Returns: (patterns touched, steps whose duration stats changed)
+        """
+        steps = record.get('steps', [])
+        success = bool(record.get('success', False))
+        step_durations = record.get('step_durations') or {}
+        dependencies = record.get('dependencies')
+        
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            INSERT INTO executions
+            (path_id, timestamp, steps, success, duration, step_durations, dependencies, max_parallel)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            record.get('path_id'),
+            record.get('timestamp') or datetime.now().isoformat(),
+            json.dumps(steps),
+            int(success),
+            record.get('duration', 0.0),
+            json.dumps(step_durations) if step_durations else None,
+            json.dumps(dependencies) if dependencies else None,
+            record.get('max_parallel')
+        ))
+        
+        patterns = self.patterns_for(steps)
+        for pattern in patterns:
+            counts = self.patterns.setdefault(pattern, [0, 0])
+            counts[0] += 1
+            counts[1] += int(success)
+        cursor.executemany(
+            "INSERT OR REPLACE INTO pattern_stats (pattern, runs, successes) VALUES (?, ?, ?)",
+            [(p, *self.patterns[p]) for p in set(patterns)]
+        )
+        
+        for step, duration in step_durations.items():
+            stats = self.durations.get(step)
+            if stats is None:
+                stats = self.durations[step] = StepDurationStats(recent=deque(maxlen=self.window))
+            stats.add(float(duration), self.alpha)
+        cursor.executemany(
+            "INSERT OR REPLACE INTO step_stats (step, samples, total, ewma, recent) VALUES (?, ?, ?, ?, ?)",
+            [
+                (step, st.samples, st.total, st.ewma, json.dumps(list(st.recent)))
+                for step, st in ((step, self.durations[step]) for step in step_durations)
+            ]
+        )
+        
+        self.total_records += 1
+        cursor.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('total_records', ?)",
+            (self.total_records,)
+        )
+        if commit:
+            self.conn.commit()
+        return patterns, list(step_durations)
+    
+    def import_legacy(self, history_file: Path) -> int:
+        """One-time import of the old JSON history into an empty store"""
+        if self.total_records or not history_file.exists():
+            return 0
+        try:
+            with open(history_file) as f:
+                records = json.load(f)
+        except Exception:
+            logger.warning("Could not read legacy history, starting fresh")
+            return 0
+        for record in records:
+            self.append(record, commit=False)
+        self.conn.commit()
+        return len(records)
+    
+    def success_rate(self, pattern: str) -> Optional[float]:
+        counts = self.patterns.get(pattern)
+        return counts[1] / counts[0] if counts and counts[0] else None
+    
+    def iter_records(self, limit: Optional[int] = None):
+        """Recorded executions, oldest first (the most recent ``limit`` if given)"""
+        query = ("SELECT id, path_id, timestamp, steps, success, duration, step_durations, "
+                 "dependencies, max_parallel FROM executions")
+        if limit:
+            query = f"SELECT * FROM ({query} ORDER BY id DESC LIMIT {int(limit)}) ORDER BY id"
+        else:
+            query += " ORDER BY id"
+        for row in self.conn.execute(query):
+            _, path_id, timestamp, steps, success, duration, step_durations, dependencies, max_parallel = row
+            yield {
+                'path_id': path_id,
+                'timestamp': timestamp,
+                'steps': json.loads(steps),
+                'success': bool(success),
+                'duration': duration,
+                'step_durations': json.loads(step_durations) if step_durations else None,
+                'dependencies': json.loads(dependencies) if dependencies else None,
+                'max_parallel': max_parallel
+            }
+    
+    def close(self):
+        """Close database connection"""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+
 class QPREngine:
     """
     ⚡ Quick Path Resolution Engine
@@ -52,56 +283,36 @@ class QPREngine:
     1. Dependency Analysis (DAG construction)
     2. Critical Path Identification
     3. Parallelization Detection
-    4. ML-based Success Prediction
-    5. Risk Assessment
+    4. List Scheduling (critical-path-first, history-trained durations)
+    5. ML-based Success Prediction
+    6. Risk Assessment
     """
     
-    def __init__(self, history_file: str = "/tmp/qpr_history.json"):
-        self.history_file = Path(history_file)
-        self.execution_history: List[Dict] = []
+    def __init__(self, history_db: str = "/tmp/qpr_history.db",
+                 legacy_history_file: str = "/tmp/qpr_history.json"):
+        self.history = ExecutionHistoryStore(history_db)
         self.success_patterns: Dict[str, float] = {}
+        self.duration_estimates: Dict[str, float] = {}
         self.dependency_graph: Dict[str, List[str]] = {}
-        self.load_history()
+        self.load_history(Path(legacy_history_file))
     
-    def load_history(self):
-        """Load execution history for ML training"""
-        if self.history_file.exists():
-            try:
-                with open(self.history_file) as f:
-                    self.execution_history = json.load(f)
-                self._train_model()
-            except:
-                logger.warning("Could not load history, starting fresh")
+    def load_history(self, legacy_history_file: Optional[Path] = None):
+        """Load the trained counters (importing the legacy JSON history once)"""
+        if legacy_history_file:
+            imported = self.history.import_legacy(legacy_history_file)
+            if imported:
+                logger.info(f"Imported {imported} records from {legacy_history_file}")
+        self._train_model()
     
-    def save_history(self):
-        """Save execution history"""
-        try:
-            with open(self.history_file, 'w') as f:
-                json.dump(self.execution_history[-1000:], f, indent=2)
-        except Exception as e:
-            logger.error(f"Could not save history: {e}")
-    
-    def _train_model(self):
-        """Train success prediction model from history"""
-        # Count success rates for each step pattern
-        pattern_results = defaultdict(list)
-        
-        for record in self.execution_history:
-            steps = record.get('steps', [])
-            success = record.get('success', False)
-            
-            # Create patterns (single steps and pairs)
-            for step in steps:
-                pattern_results[step].append(1 if success else 0)
-            
-            # Step pairs (sequence patterns)
-            for i in range(len(steps) - 1):
-                pair = f"{steps[i]}→{steps[i+1]}"
-                pattern_results[pair].append(1 if success else 0)
-        
-        # Calculate success probabilities
-        for pattern, results in pattern_results.items():
-            self.success_patterns[pattern] = sum(results) / len(results)
+    def _train_model(self, patterns: Optional[List[str]] = None,
+                     steps: Optional[List[str]] = None):
+        """Refresh success and duration estimates (all, or just the given keys)"""
+        for pattern in (self.history.patterns if patterns is None else patterns):
+            self.success_patterns[pattern] = self.history.success_rate(pattern)
+        
+        # Decayed (EWMA) duration per step
+        for step in (self.history.durations if steps is None else steps):
+            self.duration_estimates[step] = self.history.durations[step].ewma
     
     def build_dependency_graph(self, workflow: Dict) -> Dict[str, List[str]]:
         """
@@ -121,34 +332,124 @@ class QPREngine:
         """
         Identify steps that can run in parallel
         
-        Algorithm: Group steps with no mutual dependencies
+        Algorithm: Kahn's topological sort by levels, O(V + E)
         """
-        parallel_groups = []
-        processed = set()
-        
-        # Topological sort to get execution levels
+        waiting, dependents = self._dependency_counts(graph)
+        level = [step for step in graph if waiting[step] == 0]
         levels = []
-        remaining = set(graph.keys())
-        
-        while remaining:
-            # Find steps with no remaining dependencies
-            ready = []
-            for step in remaining:
-                deps = graph[step]
-                if all(d in processed for d in deps):
-                    ready.append(step)
-            
-            if not ready:
-                # Circular dependency detected
-                logger.warning(f"Circular dependency in remaining steps: {remaining}")
-                break
-            
-            levels.append(ready)
-            processed.update(ready)
-            remaining -= set(ready)
+        placed = 0
+        
+        while level:
+            levels.append(level)
+            placed += len(level)
+            next_level = []
+            for step in level:
+                for dependent in dependents[step]:
+                    waiting[dependent] -= 1
+                    if waiting[dependent] == 0:
+                        next_level.append(dependent)
+            level = next_level
+        
+        if placed < len(graph):
+            # Circular (or unknown) dependency detected
+            remaining = {step for step, count in waiting.items() if count > 0}
+            logger.warning(f"Circular dependency in remaining steps: {remaining}")
         
         return levels
     
+    @staticmethod
+    def _dependency_counts(graph: Dict[str, List[str]]) -> Tuple[Dict[str, int], Dict[str, List[str]]]:
+        """Unfinished-dependency count and dependents of every step"""
+        waiting = {}
+        dependents = {step: [] for step in graph}
+        for step, deps in graph.items():
+            deps = set(deps)
+            # Dependencies on unknown steps can never finish, as before
+            waiting[step] = len(deps)
+            for dep in deps:
+                if dep in dependents:
+                    dependents[dep].append(step)
+        return waiting, dependents
+    
+    def estimate_durations(self, workflow: Dict) -> Dict[str, float]:
+        """Per-step duration: EWMA of recorded runs, else the workflow's estimated_time, else 1s"""
+        return {
+            name: self.duration_estimates.get(name, config.get('estimated_time', 1.0))
+            for name, config in workflow.items()
+        }
+    
+    def schedule(self, graph: Dict[str, List[str]], durations: Dict[str, float],
+                 max_parallel: Optional[int] = None) -> Tuple[List[Dict[str, Any]], float]:
+        """
+        Critical-path-first list scheduling onto ``max_parallel`` workers
+        
+        Each step's priority is its upward rank (its duration plus the
+        longest chain of dependents after it); whenever a worker is free
+        the highest-ranked ready step starts on it. With identical
+        workers this is HEFT without communication costs.
+        
+        Returns: (schedule sorted by start time, predicted makespan)
+        """
+        waiting, dependents = self._dependency_counts(graph)
+        order = {step: i for i, step in enumerate(graph)}
+        
+        # Upward rank over a reverse topological order
+        topo = [step for step in graph if waiting[step] == 0]
+        counts = dict(waiting)
+        for step in topo:
+            for dependent in dependents[step]:
+                counts[dependent] -= 1
+                if counts[dependent] == 0:
+                    topo.append(dependent)
+        rank: Dict[str, float] = {}
+        for step in reversed(topo):
+            rank[step] = durations.get(step, 1.0) + max(
+                (rank[d] for d in dependents[step]), default=0.0
+            )
+        
+        workers = max(1, max_parallel or len(graph) or 1)
+        free_workers = list(range(workers))
+        ready = [(-rank[step], order[step], step) for step in graph if waiting[step] == 0]
+        heapq.heapify(ready)
+        running: List[Tuple[float, int, str]] = []  # (finish, worker, step)
+        schedule = []
+        now = 0.0
+        
+        while ready or running:
+            while ready and free_workers:
+                _, _, step = heapq.heappop(ready)
+                worker = heapq.heappop(free_workers)
+                finish = now + durations.get(step, 1.0)
+                heapq.heappush(running, (finish, worker, step))
+                schedule.append({
+                    'step': step,
+                    'worker': worker,
+                    'start': round(now, 3),
+                    'finish': round(finish, 3)
+                })
+            if not running:
+                break
+            
+            # Advance to the next completion (and any finishing at the same instant)
+            now = running[0][0]
+            while running and running[0][0] <= now:
+                _, worker, step = heapq.heappop(running)
+                heapq.heappush(free_workers, worker)
+                for dependent in dependents[step]:
+                    waiting[dependent] -= 1
+                    if waiting[dependent] == 0:
+                        heapq.heappush(ready, (-rank[dependent], order[dependent], dependent))
+        
+        return schedule, now
+    
+    @staticmethod
+    def _schedule_groups(schedule: List[Dict[str, Any]]) -> List[List[str]]:
+        """Steps bucketed by start time, in start order"""
+        groups: Dict[float, List[str]] = defaultdict(list)
+        for entry in schedule:
+            groups[entry['start']].append(entry['step'])
+        return [groups[start] for start in sorted(groups)]
+    
     def calculate_critical_path(self, graph: Dict[str, List[str]], 
                                 durations: Dict[str, float]) -> Tuple[List[str], float]:
         """
@@ -262,51 +563,54 @@ class QPREngine:
         graph = self.build_dependency_graph(workflow)
         self.dependency_graph = graph
         
-        # Extract durations
-        durations = {name: config.get('estimated_time', 1.0) 
-                    for name, config in workflow.items()}
+        # Extract durations (history-trained where available)
+        durations = self.estimate_durations(workflow)
+        max_parallel = constraints.get('max_parallel')
         
-        # Find critical path (sequential execution)
-        critical_path, sequential_time = self.calculate_critical_path(graph, durations)
+        # Find critical path; running every step one after another takes the sum
+        critical_path, critical_time = self.calculate_critical_path(graph, durations)
+        sequential_time = sum(durations.values())
         
         # Find parallel execution groups
         parallel_groups = self.find_parallel_groups(graph)
         
-        # Calculate parallel execution time
-        parallel_time = sum(
-            max(durations.get(step, 1.0) for step in group) 
-            for group in parallel_groups
-        )
+        # Pack steps onto the allowed number of workers
+        schedule, makespan = self.schedule(graph, durations, max_parallel)
+        parallel_time = makespan
         
         # Generate optimized paths
         optimized_paths = []
         
-        # Path 1: Maximum parallelization
+        # Path 1: Maximum parallelization (within max_parallel)
         max_parallel_path = WorkflowPath(
             path_id=self._generate_path_id("max_parallel"),
             steps=critical_path,
-            estimated_time=parallel_time,
+            estimated_time=makespan,
             success_probability=self.predict_success_probability(critical_path),
             dependencies=list(graph.keys()),
-            parallel_groups=parallel_groups,
+            parallel_groups=self._schedule_groups(schedule),
             risk_score=0.0,  # Will be calculated
-            recommended=True
+            recommended=True,
+            workers=max_parallel or 0,
+            schedule=schedule
         )
         max_parallel_path.risk_score = self.calculate_risk_score(max_parallel_path)
         optimized_paths.append(max_parallel_path)
         
         # Path 2: Conservative (less parallelization)
-        conservative_groups = [group[:2] for group in parallel_groups]  # Limit parallel tasks
-        conservative_time = sequential_time * 0.7  # Estimate
+        conservative_workers = min(2, max_parallel or 2)
+        conservative_schedule, conservative_time = self.schedule(graph, durations, conservative_workers)
         conservative_path = WorkflowPath(
             path_id=self._generate_path_id("conservative"),
             steps=critical_path,
             estimated_time=conservative_time,
-            success_probability=self.predict_success_probability(critical_path) * 1.05,
+            success_probability=min(self.predict_success_probability(critical_path) * 1.05, 1.0),
             dependencies=list(graph.keys()),
-            parallel_groups=conservative_groups,
+            parallel_groups=self._schedule_groups(conservative_schedule),
             risk_score=0.0,
-            recommended=False
+            recommended=False,
+            workers=conservative_workers,
+            schedule=conservative_schedule
         )
         conservative_path.risk_score = self.calculate_risk_score(conservative_path)
         optimized_paths.append(conservative_path)
@@ -316,17 +620,20 @@ class QPREngine:
             path_id=self._generate_path_id("sequential"),
             steps=critical_path,
             estimated_time=sequential_time,
-            success_probability=self.predict_success_probability(critical_path) * 1.1,
+            success_probability=min(self.predict_success_probability(critical_path) * 1.1, 1.0),
             dependencies=list(graph.keys()),
             parallel_groups=[],
             risk_score=0.0,
-            recommended=False
+            recommended=False,
+            workers=1
         )
         sequential_path.risk_score = self.calculate_risk_score(sequential_path)
         optimized_paths.append(sequential_path)
         
-        # Sort by success probability and time
-        optimized_paths.sort(key=lambda p: (p.success_probability, -p.estimated_time), reverse=True)
+        # Recommended path first (callers execute optimized_paths[0]), then
+        # alternatives by success probability and time
+        optimized_paths.sort(key=lambda p: (p.recommended, p.success_probability, -p.estimated_time),
+                             reverse=True)
         
         # Generate recommendations
         recommendations = []
@@ -356,8 +663,16 @@ class QPREngine:
         return hashlib.md5(f"{variant}_{timestamp}".encode()).hexdigest()[:12]
     
     async def record_execution(self, path_id: str, steps: List[str], 
-                              success: bool, duration: float):
-        """Record execution result for ML training"""
+                              success: bool, duration: float,
+                              step_durations: Optional[Dict[str, float]] = None,
+                              dependencies: Optional[Dict[str, List[str]]] = None,
+                              max_parallel: Optional[int] = None):
+        """Record execution result for ML training
+        
+        ``step_durations`` train the scheduler's duration estimates;
+        ``dependencies`` and ``max_parallel`` let the run be re-planned
+        later to compare predicted and actual makespan.
+        """
         record = {
             'path_id': path_id,
             'steps': steps,
@@ -365,10 +680,15 @@ class QPREngine:
             'duration': duration,
             'timestamp': datetime.now().isoformat()
         }
-        
-        self.execution_history.append(record)
-        self._train_model()  # Retrain with new data
-        self.save_history()
+        if step_durations:
+            record['step_durations'] = step_durations
+        if dependencies:
+            record['dependencies'] = dependencies
+        if max_parallel:
+            record['max_parallel'] = max_parallel
+        
+        patterns, steps = self.history.append(record)
+        self._train_model(patterns, steps)  # O(steps), not O(history)
 
 
 # ══════════════════════════════════════════════════════════════════════════════
@@ -402,6 +722,9 @@ class ExecutionRecord(BaseModel):
     steps: List[str]
     success: bool
     duration: float
+    step_durations: Optional[Dict[str, float]] = None
+    dependencies: Optional[Dict[str, List[str]]] = None
+    max_parallel: Optional[int] = None
 
 
 @app.get("/")
@@ -415,7 +738,7 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy", "history_records": len(qpr.execution_history)}
+    return {"status": "healthy", "history_records": qpr.history.total_records}
 
 
 @app.post("/optimize")
@@ -435,9 +758,12 @@ async def record_execution(record: ExecutionRecord):
         record.path_id,
         record.steps,
         record.success,
-        record.duration
+        record.duration,
+        record.step_durations,
+        record.dependencies,
+        record.max_parallel
     )
-    return {"status": "recorded", "total_records": len(qpr.execution_history)}
+    return {"status": "recorded", "total_records": qpr.history.total_records}
 
 
 @app.get("/patterns")
@@ -445,7 +771,8 @@ async def get_patterns():
     """Get learned success patterns"""
     return {
         "patterns": qpr.success_patterns,
-        "total_records": len(qpr.execution_history)
+        "durations": {step: stats.to_dict() for step, stats in qpr.history.durations.items()},
+        "total_records": qpr.history.total_records
     }
 
 
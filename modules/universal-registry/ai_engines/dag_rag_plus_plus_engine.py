@@ -14,15 +14,19 @@ Features:
 """
 
 from typing import Dict, List, Optional, Any, Tuple, Set
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, asdict
 from datetime import datetime
-from collections import defaultdict, deque
+from collections import defaultdict, deque, OrderedDict
 import asyncio
 import json
-import hashlib
 import numpy as np
 from enum import Enum
 import logging
+import os
+import time
+
+from core.advanced.semantic_search import VectorIndex, IVFVectorIndex
+from .vector_segments import MappedVectorStore
 
 # Configure logging with emojis
 logging.basicConfig(
@@ -109,14 +113,39 @@ class GenerationResult:
 
 
 class VectorStore:
-    """[💾] Advanced Vector Storage with Semantic Search"""
+    """[💾] Advanced Vector Storage with Semantic Search
+    
+    Vectors live in a matrix-backed exact ``VectorIndex`` or, with
+    ``approximate=True``, an ``IVFVectorIndex`` (``n_lists``/``n_probe``
+    passed through ``index_params``). With ``storage_dir`` set, vectors and
+    documents are persisted in memory-mapped segments instead and searched
+    straight from the mapped pages, so a restart does not re-embed anything.
+    """
     
-    def __init__(self, dimension: int = 768):
+    def __init__(self, dimension: int = 768, approximate: bool = False,
+                 storage_dir: Optional[str] = None, **index_params):
         self.dimension = dimension
-        self.vectors: Dict[str, np.ndarray] = {}
+        self.mapped: Optional[MappedVectorStore] = None
+        self.index = None
         self.documents: Dict[str, Dict[str, Any]] = {}
-        self.index_built = False
-        logger.info("[✅] Vector store initialized with dimension %d", dimension)
+        if storage_dir:
+            self.mapped = MappedVectorStore(storage_dir, dimension, **index_params)
+            mode = f"mapped at {storage_dir}"
+        else:
+            self.index = (
+                IVFVectorIndex(dimension, **index_params) if approximate
+                else VectorIndex(dimension, **index_params)
+            )
+            mode = "ivf" if approximate else "exact"
+        logger.info("[✅] Vector store initialized with dimension %d (%s)", dimension, mode)
+    
+    def count(self) -> int:
+        """[🔢] Number of stored documents"""
+        return len(self.mapped) if self.mapped is not None else len(self.documents)
+    
+    def contains(self, doc_id: str) -> bool:
+        """[🔎] Whether a document is stored"""
+        return doc_id in self.mapped if self.mapped is not None else doc_id in self.documents
     
     async def add_document(self, doc_id: str, content: str, embedding: np.ndarray, metadata: Dict = None):
         """[📝] Add document to vector store"""
@@ -125,41 +154,55 @@ class VectorStore:
                         self.dimension, embedding.shape[0])
             raise ValueError(f"[❌] Embedding dimension must be {self.dimension}")
         
-        self.vectors[doc_id] = embedding
-        self.documents[doc_id] = {
+        doc_data = {
             "content": content,
             "metadata": metadata or {},
             "timestamp": datetime.now().isoformat()
         }
-        self.index_built = False
+        if self.mapped is not None:
+            self.mapped.add(doc_id, embedding, doc_data)
+        else:
+            self.index.add(doc_id, embedding, {})
+            self.documents[doc_id] = doc_data
         logger.info("[✅] Document added: %s", doc_id)
     
+    async def remove_document(self, doc_id: str):
+        """[🗑️] Remove document from vector store"""
+        if self.mapped is not None:
+            self.mapped.remove(doc_id)
+            return
+        self.index.remove(doc_id)
+        self.documents.pop(doc_id, None)
+    
+    async def merge_segments(self):
+        """[🔀] Compact persisted segments, dropping removed and superseded rows"""
+        if self.mapped is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self.mapped.merge)
+    
     async def search(self, query_embedding: np.ndarray, top_k: int = 5) -> List[RetrievalResult]:
         """[🔍] Semantic similarity search"""
-        if not self.vectors:
+        if not self.count():
             logger.warning("[⚠️] Vector store is empty")
             return []
         
-        # Compute cosine similarity
-        query_norm = query_embedding / (np.linalg.norm(query_embedding) + 1e-8)
-        similarities = {}
-        
-        for doc_id, doc_embedding in self.vectors.items():
-            doc_norm = doc_embedding / (np.linalg.norm(doc_embedding) + 1e-8)
-            similarity = np.dot(query_norm, doc_norm)
-            similarities[doc_id] = float(similarity)
-        
-        # Get top-k results
-        sorted_docs = sorted(similarities.items(), key=lambda x: x[1], reverse=True)[:top_k]
+        if self.mapped is not None:
+            hits = [
+                (doc_id, score, doc_data, self.mapped.get_vector(doc_id))
+                for doc_id, score, doc_data in self.mapped.search(query_embedding, top_k)
+            ]
+        else:
+            hits = [
+                (doc_id, score, self.documents[doc_id], self.index.get_vector(doc_id))
+                for doc_id, score in self.index.search(query_embedding, top_k)
+            ]
         
         results = []
-        for doc_id, score in sorted_docs:
-            doc_data = self.documents[doc_id]
+        for doc_id, score, doc_data, embedding in hits:
             results.append(RetrievalResult(
                 document_id=doc_id,
                 content=doc_data["content"],
                 relevance_score=score,
-                embedding=self.vectors[doc_id],
+                embedding=embedding,
                 metadata=doc_data["metadata"],
                 source="vector_store"
             ))
@@ -173,12 +216,12 @@ class VectorStore:
         """[🎯] Hybrid search combining semantic and keyword matching"""
         semantic_results = await self.search(query_embedding, top_k * 2)
         
-        # Keyword scoring
+        # Keyword scoring (only the semantic candidates are re-ranked)
         keyword_scores = {}
-        for doc_id, doc_data in self.documents.items():
-            content_lower = doc_data["content"].lower()
+        for result in semantic_results:
+            content_lower = result.content.lower()
             keyword_count = sum(1 for kw in keywords if kw.lower() in content_lower)
-            keyword_scores[doc_id] = keyword_count / max(len(keywords), 1)
+            keyword_scores[result.document_id] = keyword_count / max(len(keywords), 1)
         
         # Combine scores
         combined_scores = {}
@@ -292,14 +335,115 @@ class DAGExecutor:
             return {"status": "completed", "node_type": node.node_type.value}
 
 
+class QueryCache:
+    """[💾] Size- and memory-bounded LRU query cache with TTL
+    
+    Keys are normalized (case-folded, whitespace-collapsed) query text plus
+    ``top_k``. Every entry remembers the corpus generation it was computed
+    against; a lookup after the corpus changed is a miss and drops the entry.
+    """
+    
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 16 * 1024 * 1024,
+                 ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        # key -> (result, generation, expires_at, size)
+        self._entries: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+    
+    @staticmethod
+    def make_key(query_text: str, top_k: int) -> Tuple[str, int]:
+        """[🔑] Normalized cache key"""
+        return " ".join(query_text.casefold().split()), top_k
+    
+    @staticmethod
+    def _estimate_size(result: GenerationResult) -> int:
+        return len(json.dumps(asdict(result), default=str))
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def _drop(self, key: Tuple[str, int]):
+        entry = self._entries.pop(key)
+        self._bytes -= entry[3]
+    
+    def get(self, key: Tuple[str, int], generation: int) -> Optional[GenerationResult]:
+        """[🔍] Cached result for the current corpus generation, if still fresh"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        result, entry_generation, expires_at, _ = entry
+        if entry_generation != generation:
+            self.invalidations += 1
+        elif expires_at <= time.monotonic():
+            self.expirations += 1
+        else:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+        
+        self._drop(key)
+        self.misses += 1
+        return None
+    
+    def put(self, key: Tuple[str, int], result: GenerationResult, generation: int):
+        """[💾] Cache a result, evicting least recently used entries past the bounds"""
+        size = self._estimate_size(result)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        
+        self._entries[key] = (result, generation, time.monotonic() + self.ttl_seconds, size)
+        self._bytes += size
+        
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+    
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """[📊] Cache counters"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations
+        }
+
+
 class RAGPlusPlusEngine:
     """[🧠] Main DAG-RAG++ Engine - Enterprise-Grade RAG System"""
     
-    def __init__(self, vector_dimension: int = 768):
-        self.vector_store = VectorStore(dimension=vector_dimension)
+    def __init__(self, vector_dimension: int = 768, approximate_index: bool = False,
+                 storage_dir: Optional[str] = None, cache_size: int = 1024,
+                 cache_max_bytes: int = 16 * 1024 * 1024, cache_ttl: float = 300.0):
+        self.vector_store = VectorStore(dimension=vector_dimension, approximate=approximate_index,
+                                        storage_dir=storage_dir)
         self.dag_executor = DAGExecutor()
         self.knowledge_graph: Dict[str, Set[str]] = defaultdict(set)
-        self.query_cache: Dict[str, GenerationResult] = {}
+        self.query_cache = QueryCache(cache_size, cache_max_bytes, cache_ttl)
+        self.corpus_generation = 0
         self.performance_metrics: Dict[str, List[float]] = defaultdict(list)
         logger.info("[✅] RAG++ Engine initialized")
     
@@ -318,17 +462,28 @@ class RAGPlusPlusEngine:
         for entity in entities:
             self.knowledge_graph[doc_id].add(entity)
         
+        self.corpus_generation += 1
         logger.info("[✅] Document indexed successfully: %s", doc_id)
     
+    async def remove_document(self, doc_id: str):
+        """[🗑️] Remove document from knowledge base"""
+        await self.vector_store.remove_document(doc_id)
+        self.knowledge_graph.pop(doc_id, None)
+        self.corpus_generation += 1
+        logger.info("[✅] Document removed: %s", doc_id)
+    
     async def query(self, query_text: str, top_k: int = 5, use_cache: bool = True) -> GenerationResult:
         """[🔍] Main query interface with RAG pipeline"""
         logger.info("[🔍] Processing query: %s", query_text[:100])
         
         # Check cache
-        cache_key = hashlib.md5(query_text.encode()).hexdigest()
-        if use_cache and cache_key in self.query_cache:
-            logger.info("[💾] Cache hit for query")
-            return self.query_cache[cache_key]
+        cache_key = QueryCache.make_key(query_text, top_k)
+        generation = self.corpus_generation
+        if use_cache:
+            cached = self.query_cache.get(cache_key, generation)
+            if cached is not None:
+                logger.info("[💾] Cache hit for query")
+                return cached
         
         # Build DAG for query processing
         dag = self._build_query_dag(query_text, top_k)
@@ -341,8 +496,8 @@ class RAGPlusPlusEngine:
         # Extract final result
         generation_result = self._extract_generation_result(results)
         
-        # Cache result
-        self.query_cache[cache_key] = generation_result
+        # Cache result against the corpus generation it was computed from
+        self.query_cache.put(cache_key, generation_result, generation)
         
         # Track performance
         self.performance_metrics["execution_time"].append(execution_time)
@@ -457,7 +612,9 @@ class RAGPlusPlusEngine:
                 }
         
         stats["cache_size"] = len(self.query_cache)
-        stats["indexed_documents"] = len(self.vector_store.documents)
+        stats["cache"] = self.query_cache.get_stats()
+        stats["corpus_generation"] = self.corpus_generation
+        stats["indexed_documents"] = self.vector_store.count()
         
         logger.info("[📊] Performance stats retrieved")
         return stats
@@ -467,7 +624,7 @@ class RAGPlusPlusEngine:
         return {
             "status": "[✅] healthy",
             "vector_store": {
-                "documents": len(self.vector_store.documents),
+                "documents": self.vector_store.count(),
                 "dimension": self.vector_store.dimension
             },
             "knowledge_graph": {
@@ -482,7 +639,7 @@ class RAGPlusPlusEngine:
 
 
 # Global engine instance
-rag_plus_plus_engine = RAGPlusPlusEngine()
+rag_plus_plus_engine = RAGPlusPlusEngine(storage_dir=os.getenv("RAG_VECTOR_STORE_DIR"))
 
 
 async def initialize_rag_engine():
@@ -499,6 +656,11 @@ async def initialize_rag_engine():
     ]
     
     for doc_id, content in sample_docs:
+        if rag_plus_plus_engine.vector_store.contains(doc_id):
+            # Already persisted: only rebuild the in-memory knowledge graph
+            for entity in rag_plus_plus_engine._extract_entities(content):
+                rag_plus_plus_engine.knowledge_graph[doc_id].add(entity)
+            continue
         await rag_plus_plus_engine.index_document(doc_id, content, {"source": "initialization"})
     
     logger.info("[✅] RAG++ Engine initialization complete")
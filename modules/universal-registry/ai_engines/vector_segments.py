@@ -0,0 +1,395 @@
+"""
+[💾] Memory-Mapped Vector Segments for the DAG-RAG++ Engine
+Append-only, on-disk vector storage searched directly from mapped pages
+
+Layout of a store directory:
+- seg-NNNNNN.vec   [🔢] float32 rows, normalized on insert (np.memmap)
+- seg-NNNNNN.offs  [📍] uint64 byte offset of each row's document record
+- seg-NNNNNN.docs  [📝] JSON-lines document records (content, metadata, ...)
+- seg-NNNNNN.ids   [🏷️] JSON-lines document IDs, written last per row
+- tombstones.jsonl [🗑️] rows killed by remove() or a re-add, as {"segment", "row"}
+
+Only document IDs and per-segment dead-row masks are held in memory;
+vectors and document bodies stay in the page cache, so resident memory
+does not grow with the embedding dimension or document size.
+"""
+
+import heapq
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class VectorSegment:
+    """[📦] One append-only segment of vectors, IDs and document records"""
+
+    OFFSET_DTYPE = np.uint64
+
+    EXTENSIONS = (".vec", ".offs", ".docs", ".ids")
+    STAGING_SUFFIX = ".merging"
+
+    def __init__(self, directory: Path, segment_id: int, dimension: int,
+                 staging: bool = False):
+        self.segment_id = segment_id
+        self.dimension = dimension
+        self.staging = staging
+        self._prefix = directory / f"seg-{segment_id:06d}"
+        self.vec_path, self.offs_path, self.docs_path, self.ids_path = (
+            self._path(extension) for extension in self.EXTENSIONS
+        )
+
+        self.ids: List[str] = []
+        self._vectors: Optional[np.memmap] = None
+        self._offsets: Optional[np.memmap] = None
+        self._writers = None
+
+    def _path(self, extension: str) -> Path:
+        suffix = extension + (self.STAGING_SUFFIX if self.staging else "")
+        return self._prefix.with_name(self._prefix.name + suffix)
+
+    @property
+    def rows(self) -> int:
+        return len(self.ids)
+
+    def publish(self):
+        """[📢] Rename a staged segment into place, IDs file last"""
+        self.close()
+        for extension in self.EXTENSIONS:
+            staged_path = self._path(extension)
+            staged_path.touch()  # nothing was appended if every row was dead
+            final_path = self._prefix.with_name(self._prefix.name + extension)
+            os.replace(staged_path, final_path)
+        self.staging = False
+        self.vec_path, self.offs_path, self.docs_path, self.ids_path = (
+            self._path(extension) for extension in self.EXTENSIONS
+        )
+
+    def load(self, repair: bool = False):
+        """[📂] Read the ID list; with ``repair``, cut files back to whole rows"""
+        self.ids = []
+        if self.ids_path.exists():
+            with open(self.ids_path, "rb") as f:
+                for line in f:
+                    try:
+                        self.ids.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        break
+
+        row_bytes = self.dimension * 4
+        offset_bytes = np.dtype(self.OFFSET_DTYPE).itemsize
+        vec_size = self.vec_path.stat().st_size if self.vec_path.exists() else 0
+        offs_size = self.offs_path.stat().st_size if self.offs_path.exists() else 0
+        vec_rows, offs_rows = vec_size // row_bytes, offs_size // offset_bytes
+        rows = min(len(self.ids), vec_rows, offs_rows)
+        torn = (len(self.ids), vec_size, offs_size) != (rows, rows * row_bytes, rows * offset_bytes)
+
+        if torn and repair:
+            # A crash interrupted the last append: drop the partial row everywhere
+            logger.warning("[⚠️] Repairing segment %d to %d rows", self.segment_id, rows)
+            docs_end = None
+            if rows < offs_rows:
+                docs_end = int(np.fromfile(self.offs_path, dtype=self.OFFSET_DTYPE,
+                                           count=1, offset=rows * offset_bytes)[0])
+            self.ids = self.ids[:rows]
+            with open(self.ids_path, "w") as f:
+                f.writelines(json.dumps(doc_id) + "\n" for doc_id in self.ids)
+            for path, size in ((self.vec_path, rows * row_bytes),
+                               (self.offs_path, rows * offset_bytes)):
+                if path.exists():
+                    os.truncate(path, size)
+            if docs_end is not None and self.docs_path.exists():
+                os.truncate(self.docs_path, docs_end)
+        else:
+            self.ids = self.ids[:rows]
+
+        self._invalidate()
+
+    def _invalidate(self):
+        self._vectors = None
+        self._offsets = None
+
+    def vectors(self) -> np.ndarray:
+        """[🗺️] Read-only memory map of the segment's vectors"""
+        if self._vectors is None or self._vectors.shape[0] != self.rows:
+            if self.rows == 0:
+                return np.zeros((0, self.dimension), dtype=np.float32)
+            self._vectors = np.memmap(self.vec_path, dtype=np.float32, mode="r",
+                                      shape=(self.rows, self.dimension))
+        return self._vectors
+
+    def document(self, row: int) -> Dict[str, Any]:
+        """[📄] Read one document record by row"""
+        if self._offsets is None or self._offsets.shape[0] != self.rows:
+            self._offsets = np.memmap(self.offs_path, dtype=self.OFFSET_DTYPE, mode="r",
+                                      shape=(self.rows,))
+        with open(self.docs_path, "rb") as f:
+            f.seek(int(self._offsets[row]))
+            return json.loads(f.readline())
+
+    def append(self, doc_id: str, vector: np.ndarray, document: Dict[str, Any]) -> int:
+        """[➕] Append one row; the ID is written last and marks the row complete"""
+        if self._writers is None:
+            self._writers = {
+                "vec": open(self.vec_path, "ab"),
+                "offs": open(self.offs_path, "ab"),
+                "docs": open(self.docs_path, "ab"),
+                "ids": open(self.ids_path, "ab")
+            }
+        writers = self._writers
+
+        offset = writers["docs"].tell()
+        writers["docs"].write(json.dumps(document, default=str).encode() + b"\n")
+        writers["offs"].write(np.array([offset], dtype=self.OFFSET_DTYPE).tobytes())
+        writers["vec"].write(np.ascontiguousarray(vector, dtype=np.float32).tobytes())
+        for name in ("docs", "offs", "vec"):
+            writers[name].flush()
+        writers["ids"].write(json.dumps(doc_id).encode() + b"\n")
+        writers["ids"].flush()
+
+        self.ids.append(doc_id)
+        return self.rows - 1
+
+    def close(self):
+        if self._writers:
+            for writer in self._writers.values():
+                writer.close()
+            self._writers = None
+        self._invalidate()
+
+    def delete_files(self):
+        self.close()
+        for path in (self.vec_path, self.offs_path, self.docs_path, self.ids_path):
+            path.unlink(missing_ok=True)
+
+
+class MappedVectorStore:
+    """[💾] Segmented, memory-mapped cosine vector store
+
+    Segments are opened lazily on first use. Rows are appended to the
+    newest segment until it holds ``segment_rows``. Every killed row is
+    tombstoned on disk: ``remove`` tombstones the current row and a re-add
+    tombstones the row it supersedes, so no older row can resurface once
+    its replacement is removed. ``merge`` rewrites the live rows of every
+    segment into one, dropping dead rows and obsolete tombstones.
+    """
+
+    TOMBSTONES_FILE = "tombstones.jsonl"
+
+    def __init__(self, directory: str, dimension: int,
+                 segment_rows: int = 65536, chunk_rows: int = 16384):
+        self.directory = Path(directory)
+        self.dimension = dimension
+        self.segment_rows = segment_rows
+        self.chunk_rows = chunk_rows
+
+        self._segments: Optional[List[VectorSegment]] = None
+        self._locations: Dict[str, Tuple[VectorSegment, int]] = {}
+        self._dead: Dict[int, Set[int]] = {}
+        self._dead_masks: Dict[int, np.ndarray] = {}
+
+    # ---------- Opening ----------
+
+    def _segment_ids(self) -> List[int]:
+        return sorted(int(path.stem.split("-")[1]) for path in self.directory.glob("seg-*.ids"))
+
+    def _ensure_open(self):
+        if self._segments is not None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # Leftovers of an interrupted merge; the next merge may reuse their ID
+        for path in self.directory.glob("seg-*" + VectorSegment.STAGING_SUFFIX):
+            path.unlink(missing_ok=True)
+
+        segment_ids = self._segment_ids()
+        self._segments = []
+        for position, segment_id in enumerate(segment_ids):
+            segment = VectorSegment(self.directory, segment_id, self.dimension)
+            segment.load(repair=position == len(segment_ids) - 1)
+            self._segments.append(segment)
+
+        by_id = {segment.segment_id: segment for segment in self._segments}
+        tombstones = self.directory / self.TOMBSTONES_FILE
+        if tombstones.exists():
+            with open(tombstones, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    if record["segment"] in by_id:
+                        self._dead.setdefault(record["segment"], set()).add(record["row"])
+
+        # Latest live row wins for every ID; a superseded row is only left
+        # untombstoned if a crash cut a re-add short, so persist it now
+        superseded = []
+        for segment in self._segments:
+            dead = self._dead.setdefault(segment.segment_id, set())
+            for row, doc_id in enumerate(segment.ids):
+                if row in dead:
+                    continue
+                previous = self._locations.get(doc_id)
+                if previous:
+                    superseded.append(previous)
+                self._locations[doc_id] = (segment, row)
+        for segment, row in superseded:
+            self._kill(segment, row)
+
+        logger.info("[✅] Opened %d vector segments with %d live documents",
+                    len(self._segments), len(self._locations))
+
+    def _active_segment(self) -> VectorSegment:
+        if not self._segments or self._segments[-1].rows >= self.segment_rows:
+            if self._segments:
+                self._segments[-1].close()
+            next_id = self._segments[-1].segment_id + 1 if self._segments else 1
+            segment = VectorSegment(self.directory, next_id, self.dimension)
+            self._segments.append(segment)
+            self._dead[segment.segment_id] = set()
+        return self._segments[-1]
+
+    def _kill(self, segment: VectorSegment, row: int):
+        """[🪦] Mark a row dead and append its tombstone"""
+        self._dead.setdefault(segment.segment_id, set()).add(row)
+        self._dead_masks.pop(segment.segment_id, None)
+        with open(self.directory / self.TOMBSTONES_FILE, "a") as f:
+            f.write(json.dumps({"segment": segment.segment_id, "row": row}) + "\n")
+
+    def _dead_mask(self, segment: VectorSegment) -> Optional[np.ndarray]:
+        dead = self._dead.get(segment.segment_id)
+        if not dead:
+            return None
+        mask = self._dead_masks.get(segment.segment_id)
+        if mask is None or mask.shape[0] != segment.rows:
+            mask = np.zeros(segment.rows, dtype=bool)
+            mask[list(dead)] = True
+            self._dead_masks[segment.segment_id] = mask
+        return mask
+
+    # ---------- Public interface ----------
+
+    def __len__(self) -> int:
+        self._ensure_open()
+        return len(self._locations)
+
+    def __contains__(self, doc_id: str) -> bool:
+        self._ensure_open()
+        return doc_id in self._locations
+
+    def add(self, doc_id: str, vector: np.ndarray, document: Dict[str, Any]):
+        """[📝] Append a normalized vector and its document record"""
+        self._ensure_open()
+        vector = np.asarray(vector, dtype=np.float32)
+        vector = vector / (np.linalg.norm(vector) + 1e-8)
+
+        # Append before tombstoning the old row, so a crash in between
+        # leaves the ID readable (latest row wins on reload)
+        previous = self._locations.get(doc_id)
+        segment = self._active_segment()
+        row = segment.append(doc_id, vector, document)
+        self._locations[doc_id] = (segment, row)
+        if previous:
+            self._kill(*previous)
+
+    def remove(self, doc_id: str):
+        """[🗑️] Tombstone a document's current row"""
+        self._ensure_open()
+        location = self._locations.pop(doc_id, None)
+        if not location:
+            return
+        self._kill(*location)
+
+    def get(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        """[📄] Document record of a live ID"""
+        self._ensure_open()
+        location = self._locations.get(doc_id)
+        return location[0].document(location[1]) if location else None
+
+    def get_vector(self, doc_id: str) -> Optional[np.ndarray]:
+        """[🔢] Copy of a live ID's stored (normalized) vector"""
+        self._ensure_open()
+        location = self._locations.get(doc_id)
+        if not location:
+            return None
+        segment, row = location
+        return np.array(segment.vectors()[row])
+
+    def search(self, query: np.ndarray, k: int = 5) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """[🔍] Exact cosine top-k, scanning each mapped segment in chunks"""
+        self._ensure_open()
+        query = np.asarray(query, dtype=np.float32)
+        query = query / (np.linalg.norm(query) + 1e-8)
+
+        candidates: List[Tuple[float, int, VectorSegment, int]] = []
+        for position, segment in enumerate(self._segments):
+            if segment.rows == 0:
+                continue
+            vectors = segment.vectors()
+            dead = self._dead_mask(segment)
+            for start in range(0, segment.rows, self.chunk_rows):
+                scores = vectors[start:start + self.chunk_rows] @ query
+                if dead is not None:
+                    scores[dead[start:start + self.chunk_rows]] = -np.inf
+                top_k = min(k, len(scores))
+                top = np.argpartition(-scores, top_k - 1)[:top_k]
+                candidates.extend(
+                    (float(scores[i]), position, segment, start + int(i))
+                    for i in top
+                    if scores[i] != -np.inf
+                )
+
+        best = heapq.nlargest(k, candidates, key=lambda c: (c[0], -c[1], -c[3]))
+        return [
+            (segment.ids[row], score, segment.document(row))
+            for score, _, segment, row in best
+        ]
+
+    def merge(self):
+        """[🔀] Rewrite the live rows of every segment into one new segment"""
+        self._ensure_open()
+        segments = self._segments
+        if len(segments) < 2 and not any(self._dead.values()):
+            return
+
+        # Staged under a temporary name, so an interrupted merge leaves no visible
+        # segment; once published, its higher ID makes its rows win on reload
+        merged = VectorSegment(self.directory, segments[-1].segment_id + 1,
+                               self.dimension, staging=True)
+        for segment in segments:
+            dead = self._dead.get(segment.segment_id, set())
+            vectors = segment.vectors()
+            for row, doc_id in enumerate(segment.ids):
+                if row not in dead:
+                    merged.append(doc_id, vectors[row], segment.document(row))
+        merged.publish()
+
+        for segment in segments:
+            segment.delete_files()
+
+        self._segments = [merged]
+        self._dead = {merged.segment_id: set()}
+        self._dead_masks = {}
+        self._locations = {doc_id: (merged, row) for row, doc_id in enumerate(merged.ids)}
+
+        self._rewrite_tombstones()
+        logger.info("[✅] Merged %d segments into segment %d (%d rows)",
+                    len(segments), merged.segment_id, merged.rows)
+
+    def _rewrite_tombstones(self):
+        path = self.directory / self.TOMBSTONES_FILE
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            for segment_id, rows in self._dead.items():
+                for row in sorted(rows):
+                    f.write(json.dumps({"segment": segment_id, "row": row}) + "\n")
+        os.replace(tmp_path, path)
+
+    def close(self):
+        for segment in self._segments or []:
+            segment.close()
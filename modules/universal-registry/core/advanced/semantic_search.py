@@ -14,6 +14,7 @@ import re
 import json
 from datetime import datetime
 import hashlib
+import time
 
 
 class SearchMode(str, Enum):
@@ -68,51 +69,305 @@ class SearchQuery:
 
 
 class VectorIndex:
-    """Simple in-memory vector index (can be replaced with Qdrant/Weaviate)"""
+    """In-memory exact cosine index backed by a contiguous float32 matrix
     
-    def __init__(self, dimension: int = 384):
+    Vectors are normalized once on insert and stored as rows of a growable
+    matrix, so a query is a single matrix-vector product followed by
+    ``argpartition`` for the top-k. Removed rows are tombstoned and reclaimed
+    by compaction once they make up half of the matrix.
+    (Can be replaced with Qdrant/Weaviate.)
+    """
+    
+    def __init__(self, dimension: int = 384, initial_capacity: int = 1024):
         self.dimension = dimension
-        self.vectors: Dict[str, np.ndarray] = {}
         self.metadata: Dict[str, Dict[str, Any]] = {}
         
-    def add(self, doc_id: str, vector: List[float], metadata: Dict[str, Any]):
-        """Add vector to index"""
-        self.vectors[doc_id] = np.array(vector)
+        self._matrix = np.zeros((initial_capacity, dimension), dtype=np.float32)
+        self._alive = np.zeros(initial_capacity, dtype=bool)
+        self._ids: List[Optional[str]] = []
+        self._row_of: Dict[str, int] = {}
+        self._tombstones = 0
+    
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / (norms + 1e-8)
+    
+    def _grow(self):
+        capacity = self._matrix.shape[0] * 2
+        matrix = np.zeros((capacity, self.dimension), dtype=np.float32)
+        matrix[:len(self._ids)] = self._matrix[:len(self._ids)]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:len(self._ids)] = self._alive[:len(self._ids)]
+        self._matrix, self._alive = matrix, alive
+    
+    def _capacity(self) -> int:
+        return self._matrix.shape[0]
+    
+    def add(self, doc_id: str, vector: List[float], metadata: Dict[str, Any]) -> int:
+        """Add vector to index (replaces an existing vector with the same ID)"""
+        row = self._row_of.get(doc_id)
+        if row is None:
+            if len(self._ids) >= self._capacity():
+                self._grow()
+            row = len(self._ids)
+            self._ids.append(doc_id)
+            self._row_of[doc_id] = row
+        
+        self._matrix[row] = self._normalize(vector)
+        self._alive[row] = True
         self.metadata[doc_id] = metadata
+        return row
+    
+    def _top_k(self, scores: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Top-k (id, score) pairs from one row of scores over live rows"""
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (self._ids[row], float(scores[row]))
+            for row in top
+            if scores[row] != -np.inf
+        ]
     
     def search(self, query_vector: List[float], k: int = 10) -> List[Tuple[str, float]]:
         """Cosine similarity search"""
-        if not self.vectors:
+        if not self._row_of:
             return []
         
-        query_vec = np.array(query_vector)
-        query_vec = query_vec / (np.linalg.norm(query_vec) + 1e-8)
-        
-        results = []
-        for doc_id, vec in self.vectors.items():
-            vec_norm = vec / (np.linalg.norm(vec) + 1e-8)
-            similarity = np.dot(query_vec, vec_norm)
-            results.append((doc_id, float(similarity)))
-        
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:k]
+        rows = len(self._ids)
+        scores = self._matrix[:rows] @ self._normalize(query_vector)
+        if self._tombstones:
+            scores[~self._alive[:rows]] = -np.inf
+        return self._top_k(scores, k)
+    
+    def search_batch(self, query_vectors: List[List[float]], k: int = 10) -> List[List[Tuple[str, float]]]:
+        """Cosine similarity search for many queries with one matrix product"""
+        if not self._row_of:
+            return [[] for _ in query_vectors]
+        
+        rows = len(self._ids)
+        scores = self._normalize(query_vectors) @ self._matrix[:rows].T
+        if self._tombstones:
+            scores[:, ~self._alive[:rows]] = -np.inf
+        return [self._top_k(row_scores, k) for row_scores in scores]
     
-    def remove(self, doc_id: str):
+    def get_vector(self, doc_id: str) -> Optional[np.ndarray]:
+        """Stored (normalized) vector of a document"""
+        row = self._row_of.get(doc_id)
+        return None if row is None else self._matrix[row].copy()
+    
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._row_of
+    
+    def remove(self, doc_id: str) -> Optional[int]:
         """Remove from index"""
-        self.vectors.pop(doc_id, None)
+        row = self._row_of.pop(doc_id, None)
         self.metadata.pop(doc_id, None)
+        if row is None:
+            return None
+        
+        self._alive[row] = False
+        self._ids[row] = None
+        self._tombstones += 1
+        if self._tombstones * 2 > len(self._ids):
+            self._compact()
+        return row
+    
+    def _compact(self) -> np.ndarray:
+        """Drop tombstoned rows and renumber the survivors; returns the kept old rows"""
+        rows = len(self._ids)
+        keep = np.flatnonzero(self._alive[:rows])
+        survivors = self._matrix[keep]
+        
+        self._matrix[:len(keep)] = survivors
+        self._matrix[len(keep):rows] = 0.0
+        self._alive[:rows] = False
+        self._alive[:len(keep)] = True
+        self._ids = [self._ids[row] for row in keep]
+        self._row_of = {doc_id: row for row, doc_id in enumerate(self._ids)}
+        self._tombstones = 0
+        return keep
     
     def size(self) -> int:
         """Index size"""
-        return len(self.vectors)
+        return len(self._row_of)
+
+
+class IVFVectorIndex(VectorIndex):
+    """Approximate cosine index: inverted file over k-means centroids
+    
+    Rows are bucketed by their nearest centroid, and a query only scores
+    the rows in its ``n_probe`` closest buckets. ``n_lists`` and ``n_probe``
+    trade recall for latency (``n_probe == n_lists`` is exact). Search is
+    exact until ``min_train_size`` vectors are indexed; centroids are
+    retrained whenever the index has grown ``retrain_growth`` times since
+    the last training.
+    """
+    
+    def __init__(self, dimension: int = 384, n_lists: int = 64, n_probe: int = 8,
+                 min_train_size: Optional[int] = None, retrain_growth: float = 4.0,
+                 kmeans_iterations: int = 10, seed: int = 0):
+        super().__init__(dimension)
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.min_train_size = min_train_size or n_lists * 39
+        self.retrain_growth = retrain_growth
+        self.kmeans_iterations = kmeans_iterations
+        
+        self._rng = np.random.default_rng(seed)
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+        self._assignment = np.full(self._capacity(), -1, dtype=np.int32)
+        self._trained_size = 0
+    
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+    
+    def _grow(self):
+        super()._grow()
+        assignment = np.full(self._capacity(), -1, dtype=np.int32)
+        assignment[:len(self._assignment)] = self._assignment
+        self._assignment = assignment
+    
+    def _nearest_centroids(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self._centroids.T, axis=1).astype(np.int32)
+    
+    def train(self):
+        """Fit centroids with spherical k-means and rebuild the inverted lists"""
+        rows = np.flatnonzero(self._alive[:len(self._ids)])
+        if len(rows) < self.n_lists:
+            return
+        
+        vectors = self._matrix[rows]
+        sample = vectors
+        if len(vectors) > self.n_lists * 256:
+            sample = vectors[self._rng.choice(len(vectors), self.n_lists * 256, replace=False)]
+        
+        centroids = sample[self._rng.choice(len(sample), self.n_lists, replace=False)].copy()
+        for _ in range(self.kmeans_iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=self.n_lists)
+            empty = counts == 0
+            # Re-seed empty clusters from random points
+            sums[empty] = sample[self._rng.choice(len(sample), int(empty.sum()))]
+            centroids = self._normalize(sums)
+        
+        self._centroids = centroids
+        self._assignment[:] = -1
+        self._assignment[rows] = self._nearest_centroids(vectors)
+        self._rebuild_lists()
+        self._trained_size = len(rows)
+    
+    def _rebuild_lists(self):
+        self._lists = [[] for _ in range(self.n_lists)]
+        for row in np.flatnonzero(self._assignment[:len(self._ids)] >= 0):
+            self._lists[self._assignment[row]].append(int(row))
+    
+    def add(self, doc_id: str, vector: List[float], metadata: Dict[str, Any]) -> int:
+        """Add vector to index, bucketing it once centroids exist"""
+        previous = self._row_of.get(doc_id)
+        row = super().add(doc_id, vector, metadata)
+        
+        if self.trained:
+            if previous is not None and self._assignment[row] >= 0:
+                self._lists[self._assignment[row]].remove(row)
+            bucket = int(self._nearest_centroids(self._matrix[row:row + 1])[0])
+            self._assignment[row] = bucket
+            self._lists[bucket].append(row)
+        
+        size = self.size()
+        if (not self.trained and size >= self.min_train_size) or \
+                (self.trained and size >= self._trained_size * self.retrain_growth):
+            self.train()
+        return row
+    
+    def remove(self, doc_id: str) -> Optional[int]:
+        """Remove from index and from its inverted list"""
+        row = self._row_of.get(doc_id)
+        if row is not None and self.trained and self._assignment[row] >= 0:
+            self._lists[self._assignment[row]].remove(row)
+            self._assignment[row] = -1
+        return super().remove(doc_id)
+    
+    def _compact(self) -> np.ndarray:
+        keep = super()._compact()
+        assignment = self._assignment[keep]
+        self._assignment[:] = -1
+        self._assignment[:len(keep)] = assignment
+        if self.trained:
+            self._rebuild_lists()
+        return keep
+    
+    def _probe(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """Score the rows of the closest inverted lists for one normalized query"""
+        n_probe = min(self.n_probe, self.n_lists)
+        centroid_scores = self._centroids @ query
+        probe = np.argpartition(-centroid_scores, n_probe - 1)[:n_probe]
+        
+        candidate_lists = [self._lists[bucket] for bucket in probe if self._lists[bucket]]
+        if not candidate_lists:
+            return []
+        rows = np.concatenate([np.asarray(rows, dtype=np.int64) for rows in candidate_lists])
+        scores = self._matrix[rows] @ query
+        
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self._ids[rows[i]], float(scores[i])) for i in top]
+    
+    def search(self, query_vector: List[float], k: int = 10) -> List[Tuple[str, float]]:
+        """Approximate cosine similarity search"""
+        if not self.trained:
+            return super().search(query_vector, k)
+        return self._probe(self._normalize(query_vector), k)
+    
+    def search_batch(self, query_vectors: List[List[float]], k: int = 10) -> List[List[Tuple[str, float]]]:
+        """Approximate search for many queries"""
+        if not self.trained:
+            return super().search_batch(query_vectors, k)
+        return [self._probe(query, k) for query in self._normalize(query_vectors)]
+
+
+def benchmark_recall(approximate: VectorIndex, exact: VectorIndex,
+                     queries: List[List[float]], k: int = 10) -> Dict[str, float]:
+    """Measure recall@k and mean latency of an approximate index against exact search"""
+    hits = 0
+    approximate_time = 0.0
+    exact_time = 0.0
+    
+    for query in queries:
+        start = time.perf_counter()
+        expected = {doc_id for doc_id, _ in exact.search(query, k)}
+        exact_time += time.perf_counter() - start
+        
+        start = time.perf_counter()
+        found = {doc_id for doc_id, _ in approximate.search(query, k)}
+        approximate_time += time.perf_counter() - start
+        
+        hits += len(expected & found)
+    
+    count = max(len(queries), 1)
+    return {
+        "k": k,
+        "queries": len(queries),
+        "recall_at_k": hits / (count * k),
+        "approximate_ms": approximate_time / count * 1000,
+        "exact_ms": exact_time / count * 1000
+    }
 
 
 class SemanticSearchEngine:
     """Advanced semantic search with multi-modal support"""
     
-    def __init__(self):
-        # Vector index for semantic search
-        self.vector_index = VectorIndex()
+    def __init__(self, approximate: bool = False, **index_params):
+        # Vector index for semantic search (IVF when approximate, else exact)
+        self.vector_index = IVFVectorIndex(**index_params) if approximate else VectorIndex(**index_params)
         
         # Keyword index (inverted index)
         self.keyword_index: Dict[str, set] = {}
@@ -482,8 +737,8 @@ class SemanticSearchEngine:
         doc = self.documents[doc_id]
         
         # Use document's embedding for similarity search
-        if doc_id in self.vector_index.vectors:
-            embedding = self.vector_index.vectors[doc_id].tolist()
+        if doc_id in self.vector_index:
+            embedding = self.vector_index.get_vector(doc_id)
             similar = self.vector_index.search(embedding, k=limit + 1)
             
             results = []
@@ -517,3 +772,25 @@ class SemanticSearchEngine:
 
 # Global search engine instance
 search_engine = SemanticSearchEngine()
+
+
+if __name__ == "__main__":
+    # Recall/latency benchmark of the IVF index against exact search
+    rng = np.random.default_rng(42)
+    dimension, documents, clusters = 384, 50000, 200
+    centers = rng.normal(size=(clusters, dimension))
+    data = centers[rng.integers(0, clusters, documents)] + rng.normal(scale=2.0, size=(documents, dimension))
+    queries = centers[rng.integers(0, clusters, 200)] + rng.normal(scale=2.0, size=(200, dimension))
+    
+    exact_index = VectorIndex(dimension)
+    for i, vector in enumerate(data):
+        exact_index.add(f"doc{i}", vector, {})
+    
+    for n_lists, n_probe in [(128, 4), (128, 8), (128, 16), (256, 16)]:
+        ivf_index = IVFVectorIndex(dimension, n_lists=n_lists, n_probe=n_probe)
+        for i, vector in enumerate(data):
+            ivf_index.add(f"doc{i}", vector, {})
+        report = benchmark_recall(ivf_index, exact_index, queries, k=10)
+        print(f"n_lists={n_lists:4d} n_probe={n_probe:3d} "
+              f"recall@10={report['recall_at_k']:.3f} "
+              f"ivf={report['approximate_ms']:.2f}ms exact={report['exact_ms']:.2f}ms")
@@ -6,13 +6,17 @@ Version: ∞.8
 """
 
 import asyncio
+import bisect
+import heapq
 import json
-from typing import Dict, List, Any, Optional, Callable, Set
+import time
+from typing import Dict, List, Any, Optional, Callable, Set, Tuple, Union
 from dataclasses import dataclass, field, asdict
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timezone
+from pathlib import Path
 import logging
-from collections import defaultdict
+from collections import defaultdict, deque
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +60,7 @@ class StreamEvent:
     correlation_id: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
     retry_count: int = 0
+    sequence: int = 0
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -64,6 +69,33 @@ class StreamEvent:
             "type": self.type.value if isinstance(self.type, Enum) else self.type,
             "priority": self.priority.value if isinstance(self.priority, Enum) else self.priority
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StreamEvent":
+        """Build from ``to_dict`` output"""
+        data = dict(data)
+        data["type"] = _stream_type(data["type"])
+        try:
+            data["priority"] = StreamPriority(data.get("priority", StreamPriority.NORMAL))
+        except ValueError:
+            pass
+        return cls(**data)
+
+
+def _stream_type(value: Any) -> Any:
+    """StreamType for known type strings, the value itself otherwise"""
+    try:
+        return StreamType(value)
+    except ValueError:
+        return value
+
+
+def _to_epoch(timestamp: str) -> float:
+    """Epoch seconds of an ISO timestamp (naive values are UTC, like event timestamps)"""
+    parsed = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
 
 
 @dataclass
@@ -78,16 +110,382 @@ class StreamSubscription:
     events_received: int = 0
 
 
+class EventRing:
+    """Fixed-capacity ring of events in sequence order
+    
+    Sequence numbers and publish times are both monotonic, so ``since``
+    binary-searches the start offset for either key. ``covers`` tells
+    whether everything after a cutoff is still in the ring: the ring
+    tracks the seq/time of the newest event it does not hold, starting
+    from ``floor_seq``/``floor_time`` (history from before a restart)
+    and advancing on every eviction.
+    """
+    
+    def __init__(self, capacity: int, floor_seq: int = 0, floor_time: float = 0.0):
+        self.capacity = capacity
+        self._events: List[Optional[StreamEvent]] = [None] * capacity
+        self._seqs: List[int] = [0] * capacity
+        self._times: List[float] = [0.0] * capacity
+        self._start = 0
+        self._count = 0
+        self.evicted = 0
+        self._floor_seq = floor_seq
+        self._floor_time = floor_time
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    @property
+    def oldest_seq(self) -> Optional[int]:
+        return self._seqs[self._start] if self._count else None
+    
+    def append(self, seq: int, published_at: float,
+               event: StreamEvent) -> Optional[Tuple[int, float, StreamEvent]]:
+        """Add an event; returns the (seq, published_at, event) it displaced, if any"""
+        evicted = None
+        if self._count < self.capacity:
+            position = (self._start + self._count) % self.capacity
+            self._count += 1
+        else:
+            position = self._start
+            evicted = (self._seqs[position], self._times[position], self._events[position])
+            self._start = (self._start + 1) % self.capacity
+            self.evicted += 1
+            self._floor_seq, self._floor_time = evicted[0], evicted[1]
+        
+        self._events[position] = event
+        self._seqs[position] = seq
+        self._times[position] = published_at
+        return evicted
+    
+    def _first_after(self, seq: Optional[int], published_at: Optional[float]) -> int:
+        """Logical offset of the first event with seq > ``seq`` / time >= ``published_at``"""
+        if seq is None and published_at is None:
+            return 0
+        keys, target = (self._seqs, seq) if seq is not None else (self._times, published_at)
+        strict = seq is not None
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key = keys[(self._start + mid) % self.capacity]
+            if key < target or (strict and key == target):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    def since(self, seq: Optional[int] = None, published_at: Optional[float] = None) -> List[StreamEvent]:
+        """Events after a sequence number or since a publish time, oldest first"""
+        offset = self._first_after(seq, published_at)
+        return [
+            self._events[(self._start + i) % self.capacity]
+            for i in range(offset, self._count)
+        ]
+    
+    def entries(self) -> List[Tuple[int, float, StreamEvent]]:
+        """All (seq, published_at, event) entries, oldest first"""
+        positions = [(self._start + i) % self.capacity for i in range(self._count)]
+        return [(self._seqs[p], self._times[p], self._events[p]) for p in positions]
+    
+    def covers(self, seq: Optional[int] = None, published_at: Optional[float] = None) -> bool:
+        """Whether every event after the cutoff is still in the ring"""
+        if seq is not None:
+            return self._floor_seq <= seq
+        if published_at is not None:
+            return self._floor_time < published_at
+        return self._floor_seq == 0
+
+
+class EventSpillLog:
+    """Append-only JSON-lines segments of events evicted from memory
+    
+    Segments are named after their first sequence number; an in-memory
+    list of (first seq, first publish time) per segment lets replay
+    binary-search the segment to start reading from. The oldest segments
+    are deleted beyond ``max_segments``.
+    """
+    
+    SEGMENT_PREFIX = "events-"
+    SEGMENT_SUFFIX = ".jsonl"
+    
+    def __init__(self, directory: str, segment_events: int = 10000, max_segments: int = 100):
+        self.directory = Path(directory)
+        self.segment_events = segment_events
+        self.max_segments = max_segments
+        self.directory.mkdir(parents=True, exist_ok=True)
+        
+        self._segments: List[Tuple[int, float, Path]] = []
+        self._file = None
+        self._segment_count = 0
+        self.last_seq = 0
+        self.last_published_at = 0.0
+        self.spilled = 0
+        self._load()
+    
+    def _load(self):
+        paths = sorted(self.directory.glob(f"{self.SEGMENT_PREFIX}*{self.SEGMENT_SUFFIX}"))
+        for path in paths:
+            records = self._read_records(path) if path == paths[-1] else None
+            with open(path, "r") as f:
+                first = f.readline()
+            try:
+                record = json.loads(first)
+            except json.JSONDecodeError:
+                continue
+            self._segments.append((record["seq"], record["published_at"], path))
+            if records:
+                self.last_seq = records[-1]["seq"]
+                self.last_published_at = records[-1]["published_at"]
+    
+    @staticmethod
+    def _read_records(path: Path) -> List[Dict[str, Any]]:
+        records = []
+        with open(path, "r") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # Torn tail from an interrupted write
+                    break
+        return records
+    
+    def append(self, seq: int, published_at: float, event: StreamEvent):
+        if self._file is None or self._segment_count >= self.segment_events:
+            self._rotate(seq, published_at)
+        self._file.write(json.dumps(
+            {"seq": seq, "published_at": published_at, "event": event.to_dict()}, default=str
+        ) + "\n")
+        self._segment_count += 1
+        self.last_seq = seq
+        self.last_published_at = published_at
+        self.spilled += 1
+    
+    def _rotate(self, seq: int, published_at: float):
+        if self._file:
+            self._file.close()
+        path = self.directory / f"{self.SEGMENT_PREFIX}{seq:020d}{self.SEGMENT_SUFFIX}"
+        self._file = open(path, "a")
+        self._segment_count = 0
+        self._segments.append((seq, published_at, path))
+        
+        while len(self._segments) > self.max_segments:
+            _, _, oldest = self._segments.pop(0)
+            oldest.unlink(missing_ok=True)
+    
+    def read(self, seq: Optional[int] = None, published_at: Optional[float] = None,
+             before_seq: Optional[int] = None) -> List[StreamEvent]:
+        """Spilled events after ``seq`` / since ``published_at`` and before ``before_seq``"""
+        if self._file:
+            self._file.flush()
+        if seq is not None:
+            start = bisect.bisect_right([first for first, _, _ in self._segments], seq) - 1
+        else:
+            start = bisect.bisect_left([first for _, first, _ in self._segments], published_at) - 1
+        
+        events = []
+        for _, _, path in self._segments[max(start, 0):]:
+            for record in self._read_records(path):
+                if seq is not None and record["seq"] <= seq:
+                    continue
+                if published_at is not None and record["published_at"] < published_at:
+                    continue
+                if before_seq is not None and record["seq"] >= before_seq:
+                    return events
+                events.append(StreamEvent.from_dict(record["event"]))
+        return events
+    
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+_MISSING = object()
+
+
+def _filter_value(event: StreamEvent, key: str):
+    """Value a filter key is matched against (event data first, then metadata)"""
+    if key in event.data:
+        return event.data[key]
+    if key in event.metadata:
+        return event.metadata[key]
+    return _MISSING
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class SubscriptionIndex:
+    """Routes events to subscriptions without testing every filter
+    
+    Subscriptions are grouped per event type (or ``"*"``). Unfiltered ones
+    always match; filtered ones are hashed on one exact-match filter key
+    (the anchor), so publishing looks up ``event[anchor] -> subscriptions``
+    and only checks the remaining filters of those candidates. Filters
+    whose values are unhashable fall back to a per-type scan list.
+    """
+    
+    def __init__(self):
+        self._unfiltered: Dict[Any, List[StreamSubscription]] = defaultdict(list)
+        self._anchored: Dict[Any, Dict[str, Dict[Any, List[StreamSubscription]]]] = defaultdict(
+            lambda: defaultdict(lambda: defaultdict(list))
+        )
+        self._scan: Dict[Any, List[StreamSubscription]] = defaultdict(list)
+    
+    @staticmethod
+    def _anchor(filters: Dict[str, Any]):
+        """First filter key (sorted) whose accepted values are all hashable"""
+        for key in sorted(filters):
+            value = filters[key]
+            values = value if isinstance(value, list) else [value]
+            if all(_hashable(v) for v in values):
+                return key, values
+        return None
+    
+    def _buckets(self, event_type: Any, subscription: StreamSubscription) -> List[List[StreamSubscription]]:
+        if not subscription.filters:
+            return [self._unfiltered[event_type]]
+        anchor = self._anchor(subscription.filters)
+        if anchor is None:
+            return [self._scan[event_type]]
+        key, values = anchor
+        return [self._anchored[event_type][key][value] for value in set(values)]
+    
+    def add(self, subscription: StreamSubscription, event_types: List[Any]):
+        for event_type in event_types:
+            for bucket in self._buckets(event_type, subscription):
+                bucket.append(subscription)
+    
+    def remove(self, subscription: StreamSubscription, event_types: List[Any]):
+        for event_type in event_types:
+            for bucket in self._buckets(event_type, subscription):
+                bucket[:] = [sub for sub in bucket if sub is not subscription]
+    
+    def match(self, event: StreamEvent) -> List[StreamSubscription]:
+        """Active subscriptions whose type and filters match the event"""
+        matched: List[StreamSubscription] = []
+        seen: Set[int] = set()
+        
+        def accept(sub: StreamSubscription, check_filters: bool):
+            if not sub.active or id(sub) in seen:
+                return
+            if check_filters and not StreamHub._matches_filters(event, sub.filters):
+                return
+            seen.add(id(sub))
+            matched.append(sub)
+        
+        for event_type in (event.type, "*"):
+            for sub in self._unfiltered.get(event_type, ()):
+                accept(sub, False)
+            for key, by_value in self._anchored.get(event_type, {}).items():
+                value = _filter_value(event, key)
+                if value is _MISSING or not _hashable(value):
+                    continue
+                for sub in by_value.get(value, ()):
+                    accept(sub, True)
+            for sub in self._scan.get(event_type, ()):
+                accept(sub, True)
+        
+        return matched
+
+
+class SubscriberChannel:
+    """Bounded delivery queue drained by one worker task per subscription
+    
+    When the queue is full the oldest pending event is dropped, so a slow
+    subscriber loses its own backlog instead of stalling the publisher.
+    """
+    
+    def __init__(self, hub: "StreamHub", subscription: StreamSubscription, max_queue: int):
+        self.hub = hub
+        self.subscription = subscription
+        self.max_queue = max_queue
+        self.queue: deque = deque()
+        self.dropped = 0
+        self.failed = 0
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._task = asyncio.create_task(self._run())
+    
+    @property
+    def depth(self) -> int:
+        return len(self.queue)
+    
+    def offer(self, event: StreamEvent):
+        """Queue an event without waiting on the subscriber"""
+        if len(self.queue) >= self.max_queue:
+            self.hub._on_dropped(self.queue.popleft())
+            self.dropped += 1
+        self.queue.append(event)
+        self._idle.clear()
+        self._ready.set()
+    
+    async def _run(self):
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            while self.queue:
+                event = self.queue.popleft()
+                try:
+                    await self.hub._deliver_event(event, self.subscription)
+                    self.subscription.events_received += 1
+                    self.hub.stats["delivered_events"] += 1
+                except Exception as e:
+                    logger.error(f"Failed to deliver event to {self.subscription.subscriber_id}: {e}")
+                    self.failed += 1
+                    self.hub._on_failed(event)
+            self._idle.set()
+    
+    async def join(self):
+        """Wait until every queued event has been delivered"""
+        await self._idle.wait()
+    
+    async def close(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._idle.set()
+
+
 class StreamHub:
     """Central stream hub for event propagation"""
     
-    def __init__(self):
+    def __init__(self, subscriber_queue_size: int = 1000, max_buffer_size: int = 1000,
+                 type_buffer_size: int = 1000, spill_dir: Optional[str] = None,
+                 spill_segment_events: int = 10000, spill_max_segments: int = 100):
         # Subscriptions by event type
         self.subscriptions: Dict[StreamType, List[StreamSubscription]] = defaultdict(list)
+        self.index = SubscriptionIndex()
         
-        # Event buffer for replay/audit
-        self.event_buffer: List[StreamEvent] = []
-        self.max_buffer_size = 1000
+        # Per-subscription delivery queues
+        self.subscriber_queue_size = subscriber_queue_size
+        self.channels: Dict[int, SubscriberChannel] = {}
+        
+        # Event rings for replay/audit: all events, plus one ring per type so
+        # rare types stay replayable after busy ones wrap the main ring
+        self.max_buffer_size = max_buffer_size
+        self.type_buffer_size = type_buffer_size
+        
+        # Optional on-disk log of events evicted from the main ring; whatever
+        # it already holds predates every ring, so replay must read it back
+        self.spill = (
+            EventSpillLog(spill_dir, spill_segment_events, spill_max_segments)
+            if spill_dir else None
+        )
+        self.sequence = self.spill.last_seq if self.spill else 0
+        self._history_floor = (
+            (self.spill.last_seq, self.spill.last_published_at) if self.spill else (0, 0.0)
+        )
+        self.event_log = EventRing(max_buffer_size, *self._history_floor)
+        self.type_logs: Dict[Any, EventRing] = {}
         
         # Stream statistics
         self.stats = {
@@ -95,56 +493,73 @@ class StreamHub:
             "events_by_type": defaultdict(int),
             "events_by_priority": defaultdict(int),
             "active_subscriptions": 0,
+            "delivered_events": 0,
+            "dropped_events": 0,
             "failed_deliveries": 0
         }
         
+        # Publish throughput over the last completed one-second window
+        self._rate_window_start = time.monotonic()
+        self._rate_window_count = 0
+        self._publish_rate = 0.0
+        
         # Dead letter queue for failed events
         self.dead_letter_queue: List[StreamEvent] = []
         
     async def publish(self, event: StreamEvent) -> int:
-        """Publish event to all matching subscribers"""
+        """Queue event for all matching subscribers; returns how many matched"""
         self.stats["total_events"] += 1
         self.stats["events_by_type"][event.type.value] += 1
         self.stats["events_by_priority"][event.priority.value] += 1
+        self._track_rate()
         
-        # Add to buffer
-        self.event_buffer.append(event)
-        if len(self.event_buffer) > self.max_buffer_size:
-            self.event_buffer.pop(0)
-        
-        # Find matching subscriptions
-        matching_subs = []
-        for sub in self.subscriptions.get(event.type, []):
-            if sub.active and self._matches_filters(event, sub.filters):
-                matching_subs.append(sub)
+        # Sequence and add to the replay rings
+        self.sequence += 1
+        event.sequence = self.sequence
+        published_at = time.time()
+        evicted = self.event_log.append(self.sequence, published_at, event)
+        if evicted and self.spill:
+            self.spill.append(*evicted)
+        type_log = self.type_logs.get(event.type)
+        if type_log is None:
+            type_log = self.type_logs[event.type] = EventRing(self.type_buffer_size, *self._history_floor)
+        type_log.append(self.sequence, published_at, event)
         
-        # Also check wildcard subscriptions
-        for sub in self.subscriptions.get("*", []):
-            if sub.active and self._matches_filters(event, sub.filters):
-                matching_subs.append(sub)
-        
-        # Deliver to subscribers
-        delivered = 0
+        # Hand off to subscriber workers
+        matching_subs = self.index.match(event)
         for sub in matching_subs:
-            try:
-                await self._deliver_event(event, sub)
-                delivered += 1
-                sub.events_received += 1
-            except Exception as e:
-                logger.error(f"Failed to deliver event to {sub.subscriber_id}: {e}")
-                self.stats["failed_deliveries"] += 1
-                
-                # Add to dead letter queue if critical
-                if event.priority == StreamPriority.CRITICAL:
-                    self.dead_letter_queue.append(event)
+            channel = self.channels.get(id(sub))
+            if channel:
+                channel.offer(event)
         
-        return delivered
+        return len(matching_subs)
+    
+    def _track_rate(self):
+        now = time.monotonic()
+        self._rate_window_count += 1
+        elapsed = now - self._rate_window_start
+        if elapsed >= 1.0:
+            self._publish_rate = self._rate_window_count / elapsed
+            self._rate_window_start = now
+            self._rate_window_count = 0
+    
+    def _on_failed(self, event: StreamEvent):
+        self.stats["failed_deliveries"] += 1
+        # Add to dead letter queue if critical
+        if event.priority == StreamPriority.CRITICAL:
+            self.dead_letter_queue.append(event)
+    
+    def _on_dropped(self, event: StreamEvent):
+        self.stats["dropped_events"] += 1
+        if event.priority == StreamPriority.CRITICAL:
+            self.dead_letter_queue.append(event)
     
     async def subscribe(self, 
                        subscriber_id: str, 
                        event_types: List[StreamType],
                        callback: Callable,
-                       filters: Optional[Dict[str, Any]] = None) -> StreamSubscription:
+                       filters: Optional[Dict[str, Any]] = None,
+                       queue_size: Optional[int] = None) -> StreamSubscription:
         """Subscribe to event stream"""
         subscription = StreamSubscription(
             subscriber_id=subscriber_id,
@@ -155,6 +570,10 @@ class StreamHub:
         
         for event_type in event_types:
             self.subscriptions[event_type].append(subscription)
+        self.index.add(subscription, list(subscription.event_types))
+        self.channels[id(subscription)] = SubscriberChannel(
+            self, subscription, queue_size or self.subscriber_queue_size
+        )
         
         self.stats["active_subscriptions"] += 1
         
@@ -164,35 +583,74 @@ class StreamHub:
     
     async def unsubscribe(self, subscription: StreamSubscription):
         """Unsubscribe from stream"""
+        if id(subscription) not in self.channels:
+            return
         subscription.active = False
         
         for event_type in subscription.event_types:
-            if subscription in self.subscriptions[event_type]:
-                self.subscriptions[event_type].remove(subscription)
+            self.subscriptions[event_type] = [
+                sub for sub in self.subscriptions[event_type] if sub is not subscription
+            ]
+        self.index.remove(subscription, list(subscription.event_types))
+        await self.channels.pop(id(subscription)).close()
         
         self.stats["active_subscriptions"] -= 1
         
         logger.info(f"Subscriber {subscription.subscriber_id} unsubscribed")
     
+    async def flush(self):
+        """Wait until all queued events have been delivered"""
+        await asyncio.gather(*(channel.join() for channel in list(self.channels.values())))
+    
+    async def close(self):
+        """Stop all delivery workers and close the spill log"""
+        for channel in list(self.channels.values()):
+            await channel.close()
+        self.channels.clear()
+        if self.spill:
+            # Keep the in-memory window replayable across restarts
+            for entry in self.event_log.entries():
+                self.spill.append(*entry)
+            self.spill.close()
+            self.spill = None
+    
     async def replay(self, 
                     subscriber_id: str,
                     event_types: Optional[List[StreamType]] = None,
-                    since: Optional[str] = None) -> List[StreamEvent]:
-        """Replay events from buffer"""
-        events = []
+                    since: Optional[Union[int, str]] = None,
+                    limit: Optional[int] = None) -> List[StreamEvent]:
+        """Replay events after a sequence number (int) or since an ISO timestamp (str)
         
-        for event in self.event_buffer:
-            # Filter by type
-            if event_types and event.type not in event_types:
-                continue
-            
-            # Filter by timestamp
-            if since and event.timestamp < since:
-                continue
-            
-            events.append(event)
+        Without ``since`` only the in-memory window is returned; with it,
+        events already evicted from memory are read back from the spill log.
+        """
+        seq, published_at = None, None
+        if isinstance(since, int):
+            seq = since
+        elif since:
+            published_at = _to_epoch(since)
         
-        return events
+        if event_types:
+            types = {_stream_type(t) for t in event_types}
+            # A type without a ring has no events since startup, only history
+            rings = [
+                self.type_logs[t] if t in self.type_logs else EventRing(0, *self._history_floor)
+                for t in types
+            ]
+            if all(ring.covers(seq, published_at) for ring in rings):
+                events = list(heapq.merge(
+                    *(ring.since(seq, published_at) for ring in rings),
+                    key=lambda event: event.sequence
+                ))
+                return events[:limit] if limit else events
+        
+        events = self.event_log.since(seq, published_at)
+        if since is not None and self.spill and not self.event_log.covers(seq, published_at):
+            events = self.spill.read(seq, published_at, before_seq=self.event_log.oldest_seq) + events
+        if event_types:
+            events = [event for event in events if event.type in types]
+        
+        return events[:limit] if limit else events
     
     async def _deliver_event(self, event: StreamEvent, subscription: StreamSubscription):
         """Deliver event to subscriber"""
@@ -202,7 +660,8 @@ class StreamHub:
         else:
             subscription.callback(event)
     
-    def _matches_filters(self, event: StreamEvent, filters: Dict[str, Any]) -> bool:
+    @staticmethod
+    def _matches_filters(event: StreamEvent, filters: Dict[str, Any]) -> bool:
         """Check if event matches filters"""
         if not filters:
             return True
@@ -229,12 +688,28 @@ class StreamHub:
     
     def get_stats(self) -> Dict[str, Any]:
         """Get stream statistics"""
+        channels = list(self.channels.values())
         return {
             **self.stats,
-            "buffer_size": len(self.event_buffer),
+            "publish_rate_per_sec": round(self._publish_rate, 2),
+            "buffer_size": len(self.event_log),
+            "last_sequence": self.sequence,
+            "spilled_events": self.spill.spilled if self.spill else 0,
             "dead_letter_queue_size": len(self.dead_letter_queue),
+            "queued_events": sum(channel.depth for channel in channels),
+            "subscribers": [
+                {
+                    "subscriber_id": channel.subscription.subscriber_id,
+                    "queue_depth": channel.depth,
+                    "queue_size": channel.max_queue,
+                    "events_received": channel.subscription.events_received,
+                    "dropped": channel.dropped,
+                    "failed": channel.failed
+                }
+                for channel in channels
+            ],
             "subscriptions_by_type": {
-                k.value: len(v) for k, v in self.subscriptions.items()
+                getattr(k, "value", k): len(v) for k, v in self.subscriptions.items()
             }
         }
 
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Hyper Registry Storage Engine
+Append-only write-ahead log with group commit and compacted snapshots
+Version: ∞.7
+"""
+
+import asyncio
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class RegistryStore(ABC):
+    """Pluggable persistence backend for the hyper registry
+
+    Every registry mutation is appended as a record to the log. ``load``
+    returns the latest snapshot state plus the log records written after
+    it, which is enough to rebuild the in-memory registry and its indexes.
+    """
+
+    @abstractmethod
+    async def load(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Return (snapshot state or None, WAL records newer than the snapshot)"""
+
+    @abstractmethod
+    def append(self, record: Dict[str, Any]) -> int:
+        """Queue a record for the log and return its log sequence number"""
+
+    @abstractmethod
+    async def commit(self):
+        """Wait until every record appended so far is durable"""
+
+    @abstractmethod
+    async def snapshot(self, capture: Callable[[], Dict[str, Any]]):
+        """Write a compacted snapshot of ``capture()`` and drop the covered log"""
+
+    @abstractmethod
+    async def start(self):
+        """Start background writers"""
+
+    @abstractmethod
+    async def close(self):
+        """Flush pending records and stop background writers"""
+
+    @property
+    @abstractmethod
+    def records_since_snapshot(self) -> int:
+        """Number of log records not yet covered by a snapshot"""
+
+
+class FileRegistryStore(RegistryStore):
+    """Local-file storage: JSON-lines WAL segments and a JSON snapshot
+
+    Appends are buffered in memory and written by a single flusher task,
+    which batches everything that arrived within ``commit_interval`` into
+    one write and one fsync (group commit). Request handlers never wait on
+    the disk unless they explicitly ``await commit()``.
+
+    A failed write or fsync is fatal to the store: retrying could duplicate
+    a partly written batch or trust pages the kernel already dropped, so
+    pending commits fail and later appends, commits and snapshots raise
+    instead of leaving a gap in the log.
+
+    Layout::
+
+        <directory>/snapshot.json                 {"lsn": N, "state": {...}}
+        <directory>/wal-<first lsn>.jsonl         {"lsn": n, "op": ..., ...}
+    """
+
+    SNAPSHOT_FILE = "snapshot.json"
+    SEGMENT_PREFIX = "wal-"
+    SEGMENT_SUFFIX = ".jsonl"
+
+    def __init__(self, directory: str, commit_interval: float = 0.005,
+                 max_batch: int = 10000):
+        self.directory = Path(directory)
+        self.commit_interval = commit_interval
+        self.max_batch = max_batch
+
+        self._lsn = 0
+        self._durable_lsn = 0
+        self._snapshot_lsn = 0
+        self._pending: List[str] = []
+        self._waiters: List[Tuple[int, asyncio.Future]] = []
+        self._wakeup = asyncio.Event()
+        self._io_lock = asyncio.Lock()
+        self._segment = None
+        self._flusher: Optional[asyncio.Task] = None
+        self._failure: Optional[Exception] = None
+
+        self.stats = {
+            "records_written": 0,
+            "batches_written": 0,
+            "snapshots_written": 0
+        }
+
+    # ---------- Recovery ----------
+
+    def _segments(self) -> List[Path]:
+        return sorted(self.directory.glob(f"{self.SEGMENT_PREFIX}*{self.SEGMENT_SUFFIX}"))
+
+    def _read_state(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        state = None
+        snapshot_path = self.directory / self.SNAPSHOT_FILE
+        if snapshot_path.exists():
+            with open(snapshot_path, "r") as f:
+                snapshot = json.load(f)
+            self._snapshot_lsn = snapshot.get("lsn", 0)
+            state = snapshot.get("state")
+
+        records = []
+        for segment in self._segments():
+            offset = 0
+            with open(segment, "rb") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn tail of a segment that was being written at crash time
+                        logger.warning(f"Truncating torn WAL record in {segment.name}")
+                        break
+                    offset += len(line)
+                    if record.get("lsn", 0) > self._snapshot_lsn:
+                        records.append(record)
+            if offset < segment.stat().st_size:
+                os.truncate(segment, offset)
+
+        self._lsn = max([self._snapshot_lsn] + [r["lsn"] for r in records])
+        self._durable_lsn = self._lsn
+        return state, records
+
+    async def load(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        loop = asyncio.get_running_loop()
+        state, records = await loop.run_in_executor(None, self._read_state)
+        logger.info(
+            f"Registry store loaded: snapshot lsn {self._snapshot_lsn}, "
+            f"{len(records)} WAL records"
+        )
+        return state, records
+
+    # ---------- Write path ----------
+
+    def append(self, record: Dict[str, Any]) -> int:
+        if self._failure:
+            raise self._failure
+        self._lsn += 1
+        self._pending.append(json.dumps({"lsn": self._lsn, **record}, default=str))
+        self._wakeup.set()
+        return self._lsn
+
+    async def commit(self):
+        if self._failure:
+            raise self._failure
+        if self._durable_lsn >= self._lsn:
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((self._lsn, future))
+        self._wakeup.set()
+        await future
+
+    @property
+    def records_since_snapshot(self) -> int:
+        return self._lsn - self._snapshot_lsn
+
+    def _segment_path(self, first_lsn: int) -> Path:
+        return self.directory / f"{self.SEGMENT_PREFIX}{first_lsn:020d}{self.SEGMENT_SUFFIX}"
+
+    def _open_segment(self, path: Path):
+        if self._segment:
+            self._segment.close()
+        self._segment = open(path, "a")
+
+    def _write_batch(self, lines: List[str]):
+        self._segment.write("\n".join(lines) + "\n")
+        self._segment.flush()
+        os.fsync(self._segment.fileno())
+
+    async def _flush_pending(self, count: Optional[int] = None) -> int:
+        """Write and fsync queued records (caller holds the I/O lock)"""
+        if self._failure:
+            raise self._failure
+        if not self._pending:
+            return 0
+        count = self.max_batch if count is None else min(count, self.max_batch)
+        batch = self._pending[:count]
+        batch_lsn = self._lsn - len(self._pending) + len(batch)
+
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._write_batch, batch)
+        except Exception as e:
+            self._fail(e)
+            raise self._failure from e
+
+        # Only now are the records durable; later LSNs stay queued behind them
+        del self._pending[:len(batch)]
+        self._durable_lsn = batch_lsn
+        self.stats["records_written"] += len(batch)
+        self.stats["batches_written"] += 1
+
+        still_waiting = []
+        for lsn, future in self._waiters:
+            if lsn <= self._durable_lsn:
+                if not future.done():
+                    future.set_result(None)
+            else:
+                still_waiting.append((lsn, future))
+        self._waiters = still_waiting
+
+        return len(batch)
+
+    def _fail(self, error: Exception):
+        """Stop the write path and fail every commit still waiting"""
+        self._failure = RuntimeError(
+            f"WAL write failed at lsn {self._durable_lsn + 1}, store is read-only: {error}"
+        )
+        logger.error(f"{self._failure} ({len(self._pending)} records not written)")
+        for _, future in self._waiters:
+            if not future.done():
+                future.set_exception(self._failure)
+        self._waiters = []
+
+    async def _flush_loop(self):
+        while not self._failure:
+            await self._wakeup.wait()
+            # Let concurrent writers join this group commit
+            await asyncio.sleep(self.commit_interval)
+            self._wakeup.clear()
+            try:
+                async with self._io_lock:
+                    while self._pending:
+                        await self._flush_pending()
+            except Exception as e:
+                if e is not self._failure:  # _fail already logged it
+                    logger.error(f"WAL flush failed: {e}")
+
+    # ---------- Compaction ----------
+
+    def _write_snapshot(self, snapshot: Dict[str, Any], obsolete: List[Path]):
+        tmp_path = self.directory / f"{self.SNAPSHOT_FILE}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.directory / self.SNAPSHOT_FILE)
+
+        dir_fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+        for segment in obsolete:
+            segment.unlink(missing_ok=True)
+
+    async def snapshot(self, capture: Callable[[], Dict[str, Any]]):
+        async with self._io_lock:
+            # Capture state and rotate the WAL at the same sequence number
+            state = capture()
+            snapshot_lsn = self._lsn
+            covered = len(self._pending)
+            # Records appended while flushing belong to the next segment
+            while covered > 0:
+                covered -= await self._flush_pending(covered)
+            new_segment = self._segment_path(snapshot_lsn + 1)
+            obsolete = [segment for segment in self._segments() if segment != new_segment]
+            self._open_segment(new_segment)
+
+        snapshot = {"lsn": snapshot_lsn, "state": state}
+        await asyncio.get_running_loop().run_in_executor(
+            None, self._write_snapshot, snapshot, obsolete
+        )
+
+        self._snapshot_lsn = snapshot_lsn
+        self.stats["snapshots_written"] += 1
+        logger.info(f"Registry snapshot written at lsn {snapshot_lsn}")
+
+    # ---------- Lifecycle ----------
+
+    async def start(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._open_segment(self._segment_path(self._lsn + 1))
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flusher:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        try:
+            async with self._io_lock:
+                while self._pending and not self._failure:
+                    await self._flush_pending()
+        finally:
+            if self._segment:
+                self._segment.close()
+                self._segment = None
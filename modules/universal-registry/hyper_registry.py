@@ -6,17 +6,24 @@ Version: ∞.7
 """
 
 import asyncio
+import bisect
+import heapq
 import json
 import logging
+import os
+import re
+import tempfile
+from collections import Counter, OrderedDict, deque
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Set
+from itertools import product
+from typing import Dict, List, Optional, Any, Set, Tuple
 from dataclasses import dataclass, asdict
 from enum import Enum
 from uuid import uuid4
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Query
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 import uvicorn
 
@@ -44,6 +51,13 @@ class HealthStatus(str, Enum):
     UNKNOWN = "unknown"
 
 
+class SlowConsumerPolicy(str, Enum):
+    """What to do when a WebSocket client's send queue is full"""
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+
 class EntityStatus(str, Enum):
     """Entity lifecycle status"""
     ACTIVE = "active"
@@ -100,6 +114,16 @@ class Relationship:
             self.metadata = {}
 
 
+def entity_from_dict(data: Dict[str, Any]) -> Entity:
+    """Rebuild an Entity from its asdict()/JSON form"""
+    return Entity(**{
+        **data,
+        "type": EntityType(data["type"]),
+        "status": EntityStatus(data["status"]),
+        "health": HealthStatus(data["health"])
+    })
+
+
 # ==================== Pydantic Models ====================
 
 class EntityCreate(BaseModel):
@@ -113,6 +137,16 @@ class EntityCreate(BaseModel):
     regions: List[str] = ["local"]
 
 
+class EntityUpdate(BaseModel):
+    """Entity update request (only provided fields change)"""
+    name: Optional[str] = None
+    version: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+    status: Optional[EntityStatus] = None
+    health: Optional[HealthStatus] = None
+    regions: Optional[List[str]] = None
+
+
 class EntityResponse(BaseModel):
     """Entity response"""
     id: str
@@ -155,6 +189,7 @@ class SearchQuery(BaseModel):
     query: str
     entity_types: Optional[List[EntityType]] = None
     filters: Optional[Dict[str, Any]] = None
+    field: Optional[str] = None
     limit: int = 100
     offset: int = 0
 
@@ -172,6 +207,335 @@ class GraphResponse(BaseModel):
     edges: List[RelationshipResponse]
     root_id: str
     depth: int
+    truncated: bool = False
+
+
+# ==================== Indexes ====================
+
+class EntityFilterIndex:
+    """Secondary indexes over entity type, status and health
+    
+    Every entity gets a monotonically increasing sequence number on insert.
+    Each combination of filters (with None as wildcard) maps to a sorted list
+    of sequence numbers, so any filtered listing is a single bucket lookup and
+    offset/limit pagination is a list slice that keeps insertion order.
+    """
+    
+    def __init__(self):
+        self._next_seq = 0
+        self._seq_by_id: Dict[str, int] = {}
+        self._id_by_seq: Dict[int, str] = {}
+        self._keys_by_id: Dict[str, Tuple[str, str, str]] = {}
+        self._buckets: Dict[Tuple[Optional[str], ...], List[int]] = {}
+    
+    _MASKS = list(product((True, False), repeat=3))
+    
+    @classmethod
+    def _bucket_keys(cls, key: Tuple[str, str, str]) -> List[Tuple[Optional[str], ...]]:
+        """All wildcard combinations of a (type, status, health) key"""
+        entity_type, status, health = key
+        return [
+            (entity_type if keep_type else None,
+             status if keep_status else None,
+             health if keep_health else None)
+            for keep_type, keep_status, keep_health in cls._MASKS
+        ]
+    
+    @staticmethod
+    def _entity_key(entity: "Entity") -> Tuple[str, str, str]:
+        return (entity.type.value, entity.status.value, entity.health.value)
+    
+    def add(self, entity: "Entity"):
+        """Index a new entity at the end of the insertion order"""
+        seq = self._next_seq
+        self._next_seq += 1
+        self._seq_by_id[entity.id] = seq
+        self._id_by_seq[seq] = entity.id
+        key = self._entity_key(entity)
+        self._keys_by_id[entity.id] = key
+        for bucket_key in self._bucket_keys(key):
+            # New sequence numbers are always the largest, so append keeps order
+            self._buckets.setdefault(bucket_key, []).append(seq)
+    
+    def update(self, entity: "Entity"):
+        """Re-index an entity after a status or health change"""
+        old_key = self._keys_by_id.get(entity.id)
+        if old_key is None:
+            self.add(entity)
+            return
+        
+        new_key = self._entity_key(entity)
+        if new_key == old_key:
+            return
+        
+        seq = self._seq_by_id[entity.id]
+        old_buckets = set(self._bucket_keys(old_key))
+        new_buckets = set(self._bucket_keys(new_key))
+        for bucket_key in old_buckets - new_buckets:
+            self._discard(bucket_key, seq)
+        for bucket_key in new_buckets - old_buckets:
+            bisect.insort(self._buckets.setdefault(bucket_key, []), seq)
+        self._keys_by_id[entity.id] = new_key
+    
+    def remove(self, entity_id: str):
+        """Drop an entity from all indexes"""
+        key = self._keys_by_id.pop(entity_id, None)
+        if key is None:
+            return
+        seq = self._seq_by_id.pop(entity_id)
+        del self._id_by_seq[seq]
+        for bucket_key in self._bucket_keys(key):
+            self._discard(bucket_key, seq)
+    
+    def _discard(self, bucket_key: Tuple[Optional[str], ...], seq: int):
+        bucket = self._buckets.get(bucket_key)
+        if not bucket:
+            return
+        pos = bisect.bisect_left(bucket, seq)
+        if pos < len(bucket) and bucket[pos] == seq:
+            del bucket[pos]
+        if not bucket:
+            del self._buckets[bucket_key]
+    
+    def query(self,
+              entity_type: Optional[str] = None,
+              status: Optional[str] = None,
+              health: Optional[str] = None,
+              limit: int = 100,
+              offset: int = 0) -> List[str]:
+        """Return one page of entity IDs matching the filters, in insertion order"""
+        bucket = self._buckets.get((entity_type, status, health), [])
+        return [self._id_by_seq[seq] for seq in bucket[offset:offset + limit]]
+    
+    def count(self,
+              entity_type: Optional[str] = None,
+              status: Optional[str] = None,
+              health: Optional[str] = None) -> int:
+        """Number of entities matching the filters"""
+        return len(self._buckets.get((entity_type, status, health), []))
+
+
+class EntityTextIndex:
+    """Incremental inverted index over entity names and flattened metadata
+    
+    Each entity is stored as a set of fields ("name", "metadata.<path>") with
+    lowercased text. Texts are split into word tokens, whose vocabulary is
+    scanned for queries shorter than a trigram, and into character
+    trigrams for longer substring queries. Candidates from the posting
+    lists are verified against the stored field text, so results match
+    plain substring semantics for every query length.
+    """
+    
+    GRAM_SIZE = 3
+    TOKEN_PATTERN = re.compile(r"\w+")
+    
+    def __init__(self):
+        self._fields: Dict[str, Dict[str, str]] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._tokens: Dict[str, Set[str]] = {}
+    
+    @classmethod
+    def _flatten(cls, value: Any, path: str, out: Dict[str, List[str]]):
+        """Flatten nested metadata into dotted paths of lowercased strings"""
+        if isinstance(value, dict):
+            for key, child in value.items():
+                cls._flatten(child, f"{path}.{key}", out)
+        elif isinstance(value, (list, tuple, set)):
+            for child in value:
+                cls._flatten(child, path, out)
+        elif value is not None:
+            out.setdefault(path, []).append(str(value).lower())
+    
+    @classmethod
+    def _grams_of(cls, text: str) -> Set[str]:
+        size = cls.GRAM_SIZE
+        return {text[i:i + size] for i in range(len(text) - size + 1)}
+    
+    def add(self, entity: "Entity"):
+        """Index an entity's name and metadata values"""
+        self.remove(entity.id)
+        
+        values: Dict[str, List[str]] = {"name": [entity.name.lower()]}
+        self._flatten(entity.metadata, "metadata", values)
+        # Separate multi-valued fields so substrings never span two values
+        fields = {field: "\n".join(texts) for field, texts in values.items()}
+        self._fields[entity.id] = fields
+        
+        for text in fields.values():
+            for gram in self._grams_of(text):
+                self._grams.setdefault(gram, set()).add(entity.id)
+            for token in self.TOKEN_PATTERN.findall(text):
+                self._tokens.setdefault(token, set()).add(entity.id)
+    
+    def remove(self, entity_id: str):
+        """Drop an entity from all posting lists"""
+        fields = self._fields.pop(entity_id, None)
+        if not fields:
+            return
+        
+        for text in fields.values():
+            for gram in self._grams_of(text):
+                postings = self._grams.get(gram)
+                if postings is not None:
+                    postings.discard(entity_id)
+                    if not postings:
+                        del self._grams[gram]
+            for token in self.TOKEN_PATTERN.findall(text):
+                postings = self._tokens.get(token)
+                if postings is not None:
+                    postings.discard(entity_id)
+                    if not postings:
+                        del self._tokens[token]
+    
+    def _candidates(self, query: str) -> Set[str]:
+        """Entity IDs that may contain the query, from the posting lists"""
+        if len(query) >= self.GRAM_SIZE:
+            postings = sorted(
+                (self._grams.get(gram, set()) for gram in self._grams_of(query)),
+                key=len
+            )
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates:
+                    break
+                candidates &= posting
+            return candidates
+        
+        # Shorter queries: a run of word characters lies inside one token, so
+        # scan the vocabulary; anything else (e.g. "a-") may span tokens
+        if not self.TOKEN_PATTERN.fullmatch(query):
+            return set(self._fields)
+        candidates: Set[str] = set()
+        for token, postings in self._tokens.items():
+            if query in token:
+                candidates |= postings
+        return candidates
+    
+    def search(self, query: str, field: Optional[str] = None) -> Dict[str, float]:
+        """Return relevance scores of entities matching the query
+        
+        Name hits outrank metadata hits, and exact or word-prefix hits
+        outrank plain substring hits. ``field`` restricts matching to one
+        field path and its children, e.g. ``metadata.feature``.
+        """
+        query = query.lower().strip()
+        if not query:
+            return {}
+        
+        word_prefix = re.compile(r"\b" + re.escape(query))
+        scores: Dict[str, float] = {}
+        
+        for entity_id in self._candidates(query):
+            score = 0.0
+            for field_name, text in self._fields[entity_id].items():
+                if field and field_name != field and not field_name.startswith(field + "."):
+                    continue
+                if query not in text:
+                    continue
+                
+                weight = 3.0 if field_name == "name" else 1.0
+                if text == query:
+                    weight *= 3.0
+                elif word_prefix.search(text):
+                    weight *= 2.0
+                score += weight
+            
+            if score:
+                scores[entity_id] = score
+        
+        return scores
+
+
+# ==================== WebSocket Fan-out ====================
+
+class ConnectionSender:
+    """Bounded send queue for one WebSocket, drained by its own task
+    
+    Broadcasting only enqueues already-serialized payloads, so a slow
+    client never adds latency to the request that produced the event.
+    When the queue is full the slow-consumer policy decides whether the
+    oldest message is dropped, an older message about the same object is
+    replaced in place, or the client is disconnected.
+    """
+    
+    def __init__(self, websocket: WebSocket, max_queue: int,
+                 policy: SlowConsumerPolicy, on_close):
+        self.websocket = websocket
+        self.max_queue = max_queue
+        self.policy = policy
+        self.on_close = on_close
+        
+        self._queue: "OrderedDict[Any, str]" = OrderedDict()
+        self._seq = 0
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        self.closed = asyncio.Event()
+        self.task = asyncio.create_task(self._drain())
+        
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+    
+    def offer(self, payload: str, key: Optional[str] = None):
+        """Enqueue a serialized message without waiting on the socket"""
+        if self._closing or self.closed.is_set():
+            return
+        
+        if self.policy == SlowConsumerPolicy.COALESCE and key is not None and key in self._queue:
+            # Newer state for the same object supersedes the queued one
+            self._queue[key] = payload
+            self.coalesced += 1
+            return
+        
+        if len(self._queue) >= self.max_queue:
+            if self.policy == SlowConsumerPolicy.DISCONNECT:
+                logger.warning("Disconnecting slow WebSocket consumer")
+                self.close()
+                return
+            self._queue.popitem(last=False)
+            self.dropped += 1
+        
+        if key is None or self.policy != SlowConsumerPolicy.COALESCE:
+            self._seq += 1
+            key = self._seq
+        self._queue[key] = payload
+        self._wakeup.set()
+    
+    async def _drain(self):
+        try:
+            while True:
+                if not self._queue:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                _, payload = self._queue.popitem(last=False)
+                await self.websocket.send_text(payload)
+                self.sent += 1
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug(f"WebSocket send failed: {e}")
+        finally:
+            self.closed.set()
+            self.on_close(self.websocket)
+    
+    def close(self):
+        """Stop draining and close the socket in the background"""
+        if self._closing or self.closed.is_set():
+            return
+        self._closing = True
+        self.task.cancel()
+        asyncio.create_task(self._close_socket())
+    
+    async def _close_socket(self):
+        try:
+            await self.websocket.close()
+        except Exception:
+            pass
+    
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
 
 
 # ==================== Hyper Registry Core ====================
@@ -179,14 +543,25 @@ class GraphResponse(BaseModel):
 class HyperRegistry:
     """Universal Hyper Registry with multi-database support"""
     
-    def __init__(self):
-        # In-memory storage (for demo - replace with real databases)
+    def __init__(self, store=None, ws_queue_size: int = 1000,
+                 slow_consumer_policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST):
+        # In-memory storage, made durable by an optional RegistryStore
+        self.store = store
         self.entities: Dict[str, Entity] = {}
         self.relationships: Dict[str, Relationship] = {}
         self.entity_by_name: Dict[str, Set[str]] = {}
+        self.entity_index = EntityFilterIndex()
+        self.text_index = EntityTextIndex()
+        
+        # Adjacency maps: entity_id -> relationship type -> relationship IDs
+        self.outgoing: Dict[str, Dict[str, List[str]]] = {}
+        self.incoming: Dict[str, Dict[str, List[str]]] = {}
         
-        # WebSocket connections
-        self.connections: List[WebSocket] = []
+        # WebSocket connections and their send queues
+        self.connections: Dict[WebSocket, ConnectionSender] = {}
+        self.ws_queue_size = ws_queue_size
+        self.slow_consumer_policy = slow_consumer_policy
+        self.events_dropped = 0
         
         # Statistics
         self.stats = {
@@ -213,16 +588,9 @@ class HyperRegistry:
             regions=entity_data.regions
         )
         
-        # Store entity
-        self.entities[entity_id] = entity
-        
-        # Index by name
-        if entity.name not in self.entity_by_name:
-            self.entity_by_name[entity.name] = set()
-        self.entity_by_name[entity.name].add(entity_id)
-        
-        # Update stats
-        self._update_stats("create", entity)
+        # Store, index and persist entity
+        self._insert_entity(entity)
+        self._persist("entity_put", entity=entity)
         
         # Broadcast event
         await self._broadcast_event({
@@ -246,43 +614,146 @@ class HyperRegistry:
                      limit: int = 100,
                      offset: int = 0) -> List[Entity]:
         """List entities with filtering"""
-        results = []
+        entity_ids = self.entity_index.query(
+            entity_type=entity_type.value if entity_type else None,
+            status=status.value if status else None,
+            health=health.value if health else None,
+            limit=limit,
+            offset=offset
+        )
         
-        for entity in self.entities.values():
-            # Apply filters
-            if entity_type and entity.type != entity_type:
-                continue
-            if status and entity.status != status:
-                continue
-            if health and entity.health != health:
-                continue
-            
-            results.append(entity)
+        return [self.entities[entity_id] for entity_id in entity_ids]
+    
+    async def set_entity_state(self,
+                               entity_id: str,
+                               status: Optional[EntityStatus] = None,
+                               health: Optional[HealthStatus] = None) -> Entity:
+        """Change entity status and/or health, keeping indexes and stats in sync"""
+        entity = self.entities.get(entity_id)
+        if not entity:
+            raise ValueError(f"Entity not found: {entity_id}")
+        
+        self._unindex_entity(entity)
+        if status is not None:
+            entity.status = status
+        if health is not None:
+            entity.health = health
+        entity.updated_at = datetime.utcnow().isoformat()
+        self._reindex_entity(entity)
+        
+        self._persist("entity_put", entity=entity)
         
-        # Apply pagination
-        return results[offset:offset + limit]
+        return entity
     
-    def search_entities(self, query: str, entity_types: Optional[List[EntityType]] = None) -> List[Entity]:
-        """Search entities by text"""
-        query_lower = query.lower()
-        results = []
+    def search_entities(self, query: str,
+                        entity_types: Optional[List[EntityType]] = None,
+                        field: Optional[str] = None,
+                        limit: int = 100,
+                        offset: int = 0) -> List[Entity]:
+        """Search entities by text, ranked by relevance"""
+        scores = self.text_index.search(query, field=field)
         
-        for entity in self.entities.values():
-            # Type filter
-            if entity_types and entity.type not in entity_types:
-                continue
-            
-            # Text search in name and metadata
-            if query_lower in entity.name.lower():
-                results.append(entity)
-                continue
-            
-            # Search in metadata
-            metadata_str = json.dumps(entity.metadata).lower()
-            if query_lower in metadata_str:
-                results.append(entity)
+        matches = (
+            (-score, self.entities[entity_id].name, entity_id)
+            for entity_id, score in scores.items()
+            if not entity_types or self.entities[entity_id].type in entity_types
+        )
+        page = heapq.nsmallest(offset + limit, matches)[offset:]
         
-        return results
+        return [self.entities[entity_id] for _, _, entity_id in page]
+    
+    async def update_entity(self, entity_id: str, update: EntityUpdate) -> Entity:
+        """Apply a partial update to an entity"""
+        entity = self.entities.get(entity_id)
+        if not entity:
+            raise ValueError(f"Entity not found: {entity_id}")
+        
+        self._unindex_entity(entity)
+        for field_name in ("name", "version", "metadata", "status", "health", "regions"):
+            value = getattr(update, field_name)
+            if value is not None:
+                setattr(entity, field_name, value)
+        entity.updated_at = datetime.utcnow().isoformat()
+        self._reindex_entity(entity)
+        
+        self._persist("entity_put", entity=entity)
+        
+        await self._broadcast_event({
+            "type": "entity_updated",
+            "entity": asdict(entity),
+            "timestamp": datetime.utcnow().isoformat()
+        })
+        
+        return entity
+    
+    async def delete_entity(self, entity_id: str) -> Entity:
+        """Delete an entity together with its relationships"""
+        entity = self._remove_entity(entity_id)
+        if not entity:
+            raise ValueError(f"Entity not found: {entity_id}")
+        
+        self._persist("entity_delete", entity_id=entity_id)
+        
+        await self._broadcast_event({
+            "type": "entity_deleted",
+            "entity_id": entity_id,
+            "timestamp": datetime.utcnow().isoformat()
+        })
+        
+        logger.info(f"Entity deleted: {entity_id} ({entity.type.value}: {entity.name})")
+        
+        return entity
+    
+    def _insert_entity(self, entity: Entity, update_stats: bool = True):
+        """Store a new entity and add it to every index"""
+        self.entities[entity.id] = entity
+        self.entity_by_name.setdefault(entity.name, set()).add(entity.id)
+        self.entity_index.add(entity)
+        self.text_index.add(entity)
+        if update_stats:
+            self._update_stats("create", entity)
+    
+    def _unindex_entity(self, entity: Entity):
+        """Withdraw name and stats contributions of an entity about to change"""
+        self._unindex_name(entity)
+        self._update_stats("delete", entity)
+    
+    def _reindex_entity(self, entity: Entity):
+        """Re-add a changed entity to every index"""
+        self.entity_by_name.setdefault(entity.name, set()).add(entity.id)
+        self.entity_index.update(entity)
+        self.text_index.add(entity)
+        self._update_stats("create", entity)
+    
+    def _remove_entity(self, entity_id: str) -> Optional[Entity]:
+        """Drop an entity, its index entries and its relationships"""
+        entity = self.entities.pop(entity_id, None)
+        if not entity:
+            return None
+        
+        self._unindex_name(entity)
+        self.entity_index.remove(entity_id)
+        self.text_index.remove(entity_id)
+        
+        for adjacency in (self.outgoing, self.incoming):
+            for rel_ids in list(adjacency.get(entity_id, {}).values()):
+                for rel_id in list(rel_ids):
+                    relationship = self.relationships.pop(rel_id, None)
+                    if relationship:
+                        self._unindex_relationship(relationship)
+        
+        self._update_stats("delete", entity)
+        self.stats["total_relationships"] = len(self.relationships)
+        
+        return entity
+    
+    def _unindex_name(self, entity: Entity):
+        """Remove an entity from the name index"""
+        ids = self.entity_by_name.get(entity.name)
+        if ids is not None:
+            ids.discard(entity.id)
+            if not ids:
+                del self.entity_by_name[entity.name]
     
     async def create_relationship(self, rel_data: RelationshipCreate) -> Relationship:
         """Create entity relationship"""
@@ -304,10 +775,8 @@ class HyperRegistry:
             bidirectional=rel_data.bidirectional
         )
         
-        self.relationships[relationship_id] = relationship
-        
-        # Update stats
-        self.stats["total_relationships"] = len(self.relationships)
+        self._insert_relationship(relationship)
+        self._persist("relationship_put", relationship=relationship)
         
         # Broadcast event
         await self._broadcast_event({
@@ -320,45 +789,201 @@ class HyperRegistry:
         
         return relationship
     
-    def get_graph(self, root_id: str, depth: int = 3, relationship_types: Optional[List[str]] = None) -> Dict:
-        """Get entity graph"""
+    async def bulk_ingest(self, items: List[Dict[str, Any]],
+                          refs: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+        """Create a batch of entities and relationships
+        
+        Items look like ``{"kind": "entity", ...EntityCreate}`` or
+        ``{"kind": "relationship", ...RelationshipCreate}``. An entity may
+        carry a client-side ``ref``, and a relationship may use
+        ``source_ref``/``target_ref`` instead of IDs; ``refs`` maps those to
+        entity IDs across the batches of one stream. The whole batch is
+        validated first, then applied, with stats, logging and the broadcast
+        done once per batch. Returns one result per item, in item order.
+        """
+        refs = {} if refs is None else refs
+        results: List[Optional[Dict[str, Any]]] = [None] * len(items)
+        entity_items = []
+        relationship_items = []
+        
+        # Validate
+        for pos, item in enumerate(items):
+            kind = item.get("kind", "entity")
+            try:
+                if kind == "entity":
+                    entity_items.append((pos, item.get("ref"), EntityCreate(**item)))
+                elif kind == "relationship":
+                    relationship_items.append((pos, item))
+                else:
+                    raise ValueError(f"Unknown item kind: {kind}")
+            except Exception as e:
+                results[pos] = {"ok": False, "kind": kind, "error": str(e)}
+        
+        # Apply entities first so relationships can point at them
+        created_entities = []
+        for pos, ref, data in entity_items:
+            entity = Entity(
+                id=str(uuid4()),
+                type=data.type,
+                name=data.name,
+                version=data.version,
+                metadata=data.metadata,
+                status=data.status,
+                health=data.health,
+                regions=data.regions
+            )
+            self._insert_entity(entity, update_stats=False)
+            self._persist("entity_put", entity=entity)
+            created_entities.append(entity)
+            if ref is not None:
+                refs[ref] = entity.id
+            results[pos] = {"ok": True, "kind": "entity", "id": entity.id, "ref": ref}
+        self._update_stats_batch(created_entities)
+        
+        created_relationships = []
+        for pos, item in relationship_items:
+            try:
+                fields = dict(item)
+                for side in ("source", "target"):
+                    ref = fields.get(f"{side}_ref")
+                    if ref is not None:
+                        if ref not in refs:
+                            raise ValueError(f"Unknown {side}_ref: {ref}")
+                        fields[f"{side}_id"] = refs[ref]
+                data = RelationshipCreate(**fields)
+                if data.source_id not in self.entities:
+                    raise ValueError(f"Source entity not found: {data.source_id}")
+                if data.target_id not in self.entities:
+                    raise ValueError(f"Target entity not found: {data.target_id}")
+            except Exception as e:
+                results[pos] = {"ok": False, "kind": "relationship", "error": str(e)}
+                continue
+            
+            relationship = Relationship(
+                id=str(uuid4()),
+                source_id=data.source_id,
+                target_id=data.target_id,
+                type=data.type,
+                weight=data.weight,
+                metadata=data.metadata,
+                bidirectional=data.bidirectional
+            )
+            self._insert_relationship(relationship)
+            self._persist("relationship_put", relationship=relationship)
+            created_relationships.append(relationship)
+            results[pos] = {"ok": True, "kind": "relationship", "id": relationship.id}
+        
+        if created_entities or created_relationships:
+            await self._broadcast_event({
+                "type": "bulk_ingested",
+                "entity_ids": [e.id for e in created_entities],
+                "relationship_ids": [r.id for r in created_relationships],
+                "timestamp": datetime.utcnow().isoformat()
+            })
+        
+        failed = sum(1 for result in results if not result["ok"])
+        logger.info(
+            f"Bulk batch ingested: {len(created_entities)} entities, "
+            f"{len(created_relationships)} relationships, {failed} failed"
+        )
+        
+        return results
+    
+    def _insert_relationship(self, relationship: Relationship):
+        """Store a relationship and add it to the adjacency maps"""
+        self.relationships[relationship.id] = relationship
+        self._index_relationship(relationship)
+        self.stats["total_relationships"] = len(self.relationships)
+    
+    def _index_relationship(self, relationship: Relationship):
+        """Add a relationship to the outgoing and incoming adjacency maps"""
+        self.outgoing.setdefault(relationship.source_id, {}).setdefault(
+            relationship.type, []
+        ).append(relationship.id)
+        self.incoming.setdefault(relationship.target_id, {}).setdefault(
+            relationship.type, []
+        ).append(relationship.id)
+    
+    def _unindex_relationship(self, relationship: Relationship):
+        """Remove a relationship from the adjacency maps"""
+        for adjacency, entity_id in ((self.outgoing, relationship.source_id),
+                                     (self.incoming, relationship.target_id)):
+            buckets = adjacency.get(entity_id, {})
+            rel_ids = buckets.get(relationship.type)
+            if rel_ids and relationship.id in rel_ids:
+                rel_ids.remove(relationship.id)
+                if not rel_ids:
+                    del buckets[relationship.type]
+            if not buckets:
+                adjacency.pop(entity_id, None)
+    
+    def _adjacent_relationships(self, adjacency: Dict[str, Dict[str, List[str]]],
+                                entity_id: str,
+                                relationship_types: Optional[List[str]]):
+        """Yield relationships of an entity, restricted to the given type buckets"""
+        buckets = adjacency.get(entity_id)
+        if not buckets:
+            return
+        
+        rel_types = relationship_types if relationship_types else buckets.keys()
+        for rel_type in rel_types:
+            for rel_id in buckets.get(rel_type, ()):
+                yield self.relationships[rel_id]
+    
+    def get_graph(self, root_id: str, depth: int = 3,
+                  relationship_types: Optional[List[str]] = None,
+                  max_nodes: int = 10000,
+                  max_edges: int = 50000) -> Dict:
+        """Get entity graph via breadth-first traversal of the adjacency maps"""
         if root_id not in self.entities:
             raise ValueError(f"Root entity not found: {root_id}")
         
-        visited = set()
-        nodes = []
+        visited = {root_id}
+        seen_edges = set()
+        nodes = [self.entities[root_id]]
         edges = []
+        truncated = False
+        queue = deque([(root_id, 0)])
         
-        def traverse(entity_id: str, current_depth: int):
-            if current_depth > depth or entity_id in visited:
-                return
+        while queue and not truncated:
+            entity_id, current_depth = queue.popleft()
+            if current_depth >= depth:
+                continue
             
-            visited.add(entity_id)
-            entity = self.entities.get(entity_id)
-            if entity:
-                nodes.append(entity)
+            neighbours = [
+                (rel, rel.target_id)
+                for rel in self._adjacent_relationships(self.outgoing, entity_id, relationship_types)
+            ]
+            neighbours.extend(
+                (rel, rel.source_id)
+                for rel in self._adjacent_relationships(self.incoming, entity_id, relationship_types)
+                if rel.bidirectional
+            )
             
-            # Find relationships
-            for rel in self.relationships.values():
-                if rel.source_id == entity_id:
-                    # Type filter
-                    if relationship_types and rel.type not in relationship_types:
-                        continue
-                    
-                    edges.append(rel)
-                    traverse(rel.target_id, current_depth + 1)
+            for rel, neighbour_id in neighbours:
+                if rel.id in seen_edges:
+                    continue
                 
-                elif rel.bidirectional and rel.target_id == entity_id:
-                    edges.append(rel)
-                    traverse(rel.source_id, current_depth + 1)
-        
-        traverse(root_id, 0)
+                if neighbour_id not in visited:
+                    if len(nodes) >= max_nodes:
+                        truncated = True
+                        break
+                    visited.add(neighbour_id)
+                    nodes.append(self.entities[neighbour_id])
+                    queue.append((neighbour_id, current_depth + 1))
+                
+                if len(edges) >= max_edges:
+                    truncated = True
+                    break
+                seen_edges.add(rel.id)
+                edges.append(rel)
         
         return {
             "nodes": nodes,
             "edges": edges,
             "root_id": root_id,
-            "depth": depth
+            "depth": depth,
+            "truncated": truncated
         }
     
     def get_statistics(self) -> Dict:
@@ -370,7 +995,11 @@ class HyperRegistry:
             "by_feature": self.stats.get("by_feature", {}),
             "by_status": self.stats.get("by_status", {}),
             "by_health": self.stats.get("by_health", {}),
-            "active_connections": len(self.connections)
+            "active_connections": len(self.connections),
+            "queued_events": sum(sender.depth for sender in self.connections.values()),
+            "dropped_events": self.events_dropped + sum(
+                sender.dropped for sender in self.connections.values()
+            )
         }
     
     def _update_stats(self, operation: str, entity: Entity):
@@ -382,6 +1011,8 @@ class HyperRegistry:
             self.stats["by_type"][entity.type.value] = 0
         if operation == "create":
             self.stats["by_type"][entity.type.value] += 1
+        elif operation == "delete" and self.stats["by_type"][entity.type.value] > 0:
+            self.stats["by_type"][entity.type.value] -= 1
         
         # By feature (if available in metadata)
         if "feature" in entity.metadata:
@@ -390,44 +1021,154 @@ class HyperRegistry:
                 self.stats["by_feature"][feature] = 0
             if operation == "create":
                 self.stats["by_feature"][feature] += 1
+            elif operation == "delete" and self.stats["by_feature"][feature] > 0:
+                self.stats["by_feature"][feature] -= 1
         
         # By status
         if entity.status.value not in self.stats["by_status"]:
             self.stats["by_status"][entity.status.value] = 0
         if operation == "create":
             self.stats["by_status"][entity.status.value] += 1
+        elif operation == "delete" and self.stats["by_status"][entity.status.value] > 0:
+            self.stats["by_status"][entity.status.value] -= 1
         
         # By health
         if entity.health.value not in self.stats["by_health"]:
             self.stats["by_health"][entity.health.value] = 0
         if operation == "create":
             self.stats["by_health"][entity.health.value] += 1
+        elif operation == "delete" and self.stats["by_health"][entity.health.value] > 0:
+            self.stats["by_health"][entity.health.value] -= 1
     
-    async def add_connection(self, websocket: WebSocket):
+    def _update_stats_batch(self, entities: List[Entity]):
+        """Apply the create stats of many entities at once"""
+        self.stats["total_entities"] = len(self.entities)
+        
+        tallies = {
+            "by_type": Counter(e.type.value for e in entities),
+            "by_feature": Counter(e.metadata["feature"] for e in entities if "feature" in e.metadata),
+            "by_status": Counter(e.status.value for e in entities),
+            "by_health": Counter(e.health.value for e in entities)
+        }
+        for bucket, counts in tallies.items():
+            for value, count in counts.items():
+                self.stats[bucket][value] = self.stats[bucket].get(value, 0) + count
+    
+    # ---------- Persistence ----------
+    
+    def _persist(self, op: str, **payload):
+        """Append a mutation to the write-ahead log, if a store is attached
+        
+        Entities and relationships are passed as objects and only converted
+        when a store is attached; the store serializes the record right away,
+        so a shallow field copy is enough.
+        """
+        if self.store:
+            self.store.append({
+                key: dict(vars(value)) if isinstance(value, (Entity, Relationship)) else value
+                for key, value in {"op": op, **payload}.items()
+            })
+    
+    def capture_state(self) -> Dict[str, Any]:
+        """Point-in-time copy of the registry for a snapshot"""
+        return {
+            "entities": [asdict(e) for e in self.entities.values()],
+            "relationships": [asdict(r) for r in self.relationships.values()]
+        }
+    
+    def _apply_record(self, record: Dict[str, Any]):
+        """Replay one write-ahead log record"""
+        op = record.get("op")
+        if op == "entity_put":
+            entity = entity_from_dict(record["entity"])
+            existing = self.entities.get(entity.id)
+            if existing:
+                self._unindex_entity(existing)
+                self.entities[entity.id] = entity
+                self._reindex_entity(entity)
+            else:
+                self._insert_entity(entity)
+        elif op == "entity_delete":
+            self._remove_entity(record["entity_id"])
+        elif op == "relationship_put":
+            relationship = Relationship(**record["relationship"])
+            if relationship.source_id in self.entities and relationship.target_id in self.entities:
+                self._insert_relationship(relationship)
+        else:
+            logger.warning(f"Unknown WAL record op: {op}")
+    
+    async def attach_store(self, store):
+        """Rehydrate from a store's snapshot plus WAL tail, then persist through it"""
+        state, records = await store.load()
+        
+        if state:
+            for data in state.get("entities", []):
+                self._insert_entity(entity_from_dict(data))
+            for data in state.get("relationships", []):
+                self._insert_relationship(Relationship(**data))
+        for record in records:
+            self._apply_record(record)
+        
+        await store.start()
+        self.store = store
+        logger.info(
+            f"Registry rehydrated: {len(self.entities)} entities, "
+            f"{len(self.relationships)} relationships"
+        )
+    
+    async def snapshot(self):
+        """Write a compacted snapshot and drop the WAL it covers"""
+        if self.store:
+            await self.store.snapshot(self.capture_state)
+    
+    async def snapshot_loop(self, interval: float = 60.0, min_records: int = 1000):
+        """Periodically compact the WAL once enough records have accumulated"""
+        while True:
+            await asyncio.sleep(interval)
+            if self.store and self.store.records_since_snapshot >= min_records:
+                try:
+                    await self.snapshot()
+                except Exception as e:
+                    logger.error(f"Registry snapshot failed: {e}")
+    
+    async def add_connection(self, websocket: WebSocket) -> ConnectionSender:
         """Add WebSocket connection"""
         await websocket.accept()
-        self.connections.append(websocket)
+        sender = ConnectionSender(
+            websocket,
+            max_queue=self.ws_queue_size,
+            policy=self.slow_consumer_policy,
+            on_close=self.remove_connection
+        )
+        self.connections[websocket] = sender
         logger.info(f"WebSocket connected. Total connections: {len(self.connections)}")
+        return sender
     
     def remove_connection(self, websocket: WebSocket):
         """Remove WebSocket connection"""
-        if websocket in self.connections:
-            self.connections.remove(websocket)
+        sender = self.connections.pop(websocket, None)
+        if sender:
+            self.events_dropped += sender.dropped
+            sender.close()
             logger.info(f"WebSocket disconnected. Total connections: {len(self.connections)}")
     
+    @staticmethod
+    def _coalesce_key(event: Dict) -> Optional[str]:
+        """Identify the object an event is about, for the coalesce policy"""
+        for field_name in ("entity", "relationship"):
+            if isinstance(event.get(field_name), dict) and "id" in event[field_name]:
+                return event[field_name]["id"]
+        return event.get("entity_id") or event.get("service_id")
+    
     async def _broadcast_event(self, event: Dict):
-        """Broadcast event to all WebSocket connections"""
-        disconnected = []
+        """Queue an event for every WebSocket connection, serialized once"""
+        if not self.connections:
+            return
         
-        for connection in self.connections:
-            try:
-                await connection.send_json(event)
-            except:
-                disconnected.append(connection)
-        
-        # Remove disconnected connections
-        for conn in disconnected:
-            self.remove_connection(conn)
+        payload = json.dumps(event, default=str)
+        key = self._coalesce_key(event)
+        for sender in list(self.connections.values()):
+            sender.offer(payload, key)
 
 
 # ==================== FastAPI Application ====================
@@ -451,7 +1192,12 @@ app.add_middleware(
 )
 
 # Global registry instance
-registry = HyperRegistry()
+registry = HyperRegistry(
+    ws_queue_size=int(os.getenv("HYPER_REGISTRY_WS_QUEUE", "1000")),
+    slow_consumer_policy=SlowConsumerPolicy(
+        os.getenv("HYPER_REGISTRY_WS_POLICY", SlowConsumerPolicy.DROP_OLDEST.value)
+    )
+)
 
 
 # ==================== API Endpoints ====================
@@ -466,6 +1212,7 @@ async def root():
         "endpoints": {
             "entities": "/api/v1/entities",
             "relationships": "/api/v1/relationships",
+            "bulk": "/api/v1/bulk",
             "graph": "/api/v1/graph",
             "search": "/api/v1/search",
             "health": "/health",
@@ -530,6 +1277,27 @@ async def get_entity(entity_id: str):
     return EntityResponse(**asdict(entity))
 
 
+@app.put("/api/v1/entities/{entity_id}", response_model=EntityResponse)
+async def update_entity(entity_id: str, update: EntityUpdate):
+    """Update an entity"""
+    try:
+        result = await registry.update_entity(entity_id, update)
+        return EntityResponse(**asdict(result))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@app.delete("/api/v1/entities/{entity_id}")
+async def delete_entity(entity_id: str):
+    """Delete an entity and its relationships"""
+    try:
+        await registry.delete_entity(entity_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    
+    return {"message": f"Entity {entity_id} deleted"}
+
+
 @app.get("/api/v1/entities", response_model=List[EntityResponse])
 async def list_entities(
     type: Optional[EntityType] = Query(None),
@@ -555,12 +1323,12 @@ async def search_entities(query: SearchQuery):
     """Search entities"""
     results = registry.search_entities(
         query=query.query,
-        entity_types=query.entity_types
+        entity_types=query.entity_types,
+        field=query.field,
+        limit=query.limit,
+        offset=query.offset
     )
     
-    # Apply limit and offset
-    results = results[query.offset:query.offset + query.limit]
-    
     return [EntityResponse(**asdict(e)) for e in results]
 
 
@@ -577,11 +1345,87 @@ async def create_relationship(relationship: RelationshipCreate):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/v1/bulk")
+async def bulk_ingest(request: Request, batch_size: int = Query(1000, ge=1, le=10000)):
+    """Bulk-ingest NDJSON entities/relationships, returning one NDJSON result per line
+    
+    The body is parsed and applied batch by batch while it is still being
+    received. Results are written to a spooled temporary file as each batch
+    completes and streamed back from it once the body is fully read (the
+    response cannot start earlier without racing the server for the body),
+    so memory is bounded by the batch size rather than the upload. Results
+    are in input line order: parse errors wait in the batch with the valid
+    lines.
+    """
+    refs: Dict[str, str] = {}
+    batch: List[Dict[str, Any]] = []
+    batch_lines: List[Tuple[int, Optional[str]]] = []  # (line, parse error) in input order
+    results = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)  # moves to disk past 1MB
+    
+    async def flush():
+        outcomes = iter(await registry.bulk_ingest(batch, refs) if batch else [])
+        results.write("".join(
+            json.dumps({
+                "line": line,
+                **(next(outcomes) if error is None else {"ok": False, "error": error})
+            }) + "\n"
+            for line, error in batch_lines
+        ).encode())
+        batch.clear()
+        batch_lines.clear()
+    
+    async def handle_line(line_no: int, raw: bytes):
+        if not raw.strip():
+            return
+        try:
+            item = json.loads(raw)
+            if not isinstance(item, dict):
+                raise ValueError("Each line must be a JSON object")
+        except ValueError as e:
+            batch_lines.append((line_no, str(e)))
+            return
+        
+        batch.append(item)
+        batch_lines.append((line_no, None))
+        if len(batch) >= batch_size:
+            await flush()
+    
+    try:
+        buffer = b""
+        line_no = 0
+        async for chunk in request.stream():
+            buffer += chunk
+            *complete, buffer = buffer.split(b"\n")
+            for raw in complete:
+                line_no += 1
+                await handle_line(line_no, raw)
+        await handle_line(line_no + 1, buffer)
+        
+        if batch_lines:
+            await flush()
+        results.seek(0)
+    except BaseException:
+        results.close()
+        raise
+    
+    def read_results():
+        # Sync generator: Starlette reads it on a worker thread
+        try:
+            while block := results.read(64 * 1024):
+                yield block
+        finally:
+            results.close()
+    
+    return StreamingResponse(read_results(), media_type="application/x-ndjson")
+
+
 @app.get("/api/v1/graph", response_model=GraphResponse)
 async def get_graph(
     root_id: str = Query(..., description="Root entity ID"),
     depth: int = Query(3, ge=1, le=10, description="Traversal depth"),
-    types: Optional[str] = Query(None, description="Comma-separated relationship types")
+    types: Optional[str] = Query(None, description="Comma-separated relationship types"),
+    max_nodes: int = Query(10000, ge=1, le=100000, description="Node budget"),
+    max_edges: int = Query(50000, ge=1, le=500000, description="Edge budget")
 ):
     """Get entity graph"""
     relationship_types = types.split(",") if types else None
@@ -590,14 +1434,17 @@ async def get_graph(
         graph = registry.get_graph(
             root_id=root_id,
             depth=depth,
-            relationship_types=relationship_types
+            relationship_types=relationship_types,
+            max_nodes=max_nodes,
+            max_edges=max_edges
         )
         
         return GraphResponse(
             nodes=[EntityResponse(**asdict(n)) for n in graph["nodes"]],
             edges=[RelationshipResponse(**asdict(e)) for e in graph["edges"]],
             root_id=graph["root_id"],
-            depth=graph["depth"]
+            depth=graph["depth"],
+            truncated=graph["truncated"]
         )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -670,9 +1517,11 @@ async def start_service(service_id: str):
         raise HTTPException(status_code=404, detail="Service not found")
     
     # Update status
-    entity.status = EntityStatus.ACTIVE
-    entity.health = HealthStatus.HEALTHY
-    entity.updated_at = datetime.utcnow().isoformat()
+    await registry.set_entity_state(
+        service_id,
+        status=EntityStatus.ACTIVE,
+        health=HealthStatus.HEALTHY
+    )
     
     await registry._broadcast_event({
         "type": "service_started",
@@ -693,9 +1542,11 @@ async def stop_service(service_id: str):
     if not entity:
         raise HTTPException(status_code=404, detail="Service not found")
     
-    entity.status = EntityStatus.INACTIVE
-    entity.health = HealthStatus.UNKNOWN
-    entity.updated_at = datetime.utcnow().isoformat()
+    await registry.set_entity_state(
+        service_id,
+        status=EntityStatus.INACTIVE,
+        health=HealthStatus.UNKNOWN
+    )
     
     await registry._broadcast_event({
         "type": "service_stopped",
@@ -717,13 +1568,15 @@ async def restart_service(service_id: str):
         raise HTTPException(status_code=404, detail="Service not found")
     
     # Stop then start
-    entity.status = EntityStatus.PENDING
-    entity.updated_at = datetime.utcnow().isoformat()
+    await registry.set_entity_state(service_id, status=EntityStatus.PENDING)
     
     await asyncio.sleep(0.5)  # Simulate restart delay
     
-    entity.status = EntityStatus.ACTIVE
-    entity.health = HealthStatus.HEALTHY
+    await registry.set_entity_state(
+        service_id,
+        status=EntityStatus.ACTIVE,
+        health=HealthStatus.HEALTHY
+    )
     
     await registry._broadcast_event({
         "type": "service_restarted",
@@ -852,16 +1705,19 @@ async def get_search_stats():
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket for real-time updates"""
-    await registry.add_connection(websocket)
+    sender = await registry.add_connection(websocket)
     
     try:
-        while True:
-            # Keep connection alive with pings
-            await asyncio.sleep(30)
-            await websocket.send_json({
-                "type": "ping",
-                "timestamp": datetime.utcnow().isoformat()
-            })
+        while not sender.closed.is_set():
+            # Keep connection alive with pings until the sender gives up
+            try:
+                await asyncio.wait_for(sender.closed.wait(), timeout=30)
+            except asyncio.TimeoutError:
+                sender.offer(json.dumps({
+                    "type": "ping",
+                    "timestamp": datetime.utcnow().isoformat()
+                }))
+        registry.remove_connection(websocket)
     except WebSocketDisconnect:
         registry.remove_connection(websocket)
     except Exception as e:
@@ -877,6 +1733,16 @@ async def startup_event():
     logger.info("Universal Hyper Registry starting up...")
     logger.info(f"Service version: ∞.7")
     
+    # Rehydrate the registry from its snapshot and write-ahead log
+    try:
+        from core.storage.registry_store import FileRegistryStore
+        store = FileRegistryStore(os.getenv("HYPER_REGISTRY_DATA_DIR", "/tmp/hyper_registry"))
+        await registry.attach_store(store)
+        asyncio.create_task(registry.snapshot_loop())
+        logger.info("✓ Registry persistence enabled")
+    except Exception as e:
+        logger.warning(f"⚠ Registry persistence not enabled: {e}")
+    
     # Include microservices management routes
     try:
         from core.api.microservices_routes import router as microservices_router
@@ -911,12 +1777,17 @@ async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("Universal Hyper Registry shutting down...")
     
-    # Close all WebSocket connections
-    for connection in registry.connections:
+    # Compact and flush persistent storage
+    if registry.store:
         try:
-            await connection.close()
-        except:
-            pass
+            await registry.snapshot()
+            await registry.store.close()
+        except Exception as e:
+            logger.error(f"Failed to close registry store: {e}")
+    
+    # Close all WebSocket connections
+    for connection in list(registry.connections):
+        registry.remove_connection(connection)
 
 
 # ==================== Main ====================
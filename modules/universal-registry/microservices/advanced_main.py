@@ -19,19 +19,22 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel, Field
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 import asyncio
 import aiohttp
 import json
 import math
+import time
 import statistics
 from collections import defaultdict, deque
 from enum import Enum
 import hashlib
 from pathlib import Path
 
+from heartbeat import ProbeScheduler
+
 # Setup templates
 templates = Jinja2Templates(directory=str(Path(__file__).parent / "templates"))
 
@@ -500,11 +503,34 @@ class AdvancedScoringEngine:
 
 
 class GraphEngine:
-    """Advanced graph analysis for service dependencies"""
+    """Advanced graph analysis for service dependencies
+    
+    SERVICES is a static table (only each entry's runtime ``status`` changes,
+    which the topology does not include), so the topology is built once and
+    broadcast ticks reuse the same graph object. Code that edits services,
+    their dependencies or layout must call ``GraphEngine.invalidate()``; a
+    change in the number of services also forces a rebuild.
+    """
+    
+    _cache_key: Optional[int] = None
+    _cached: Optional[TopologyGraph] = None
     
     @staticmethod
     def build_topology_graph() -> TopologyGraph:
-        """Build 3D service topology graph"""
+        """Build 3D service topology graph (cached until invalidated)"""
+        key = len(SERVICES)
+        if GraphEngine._cached is None or GraphEngine._cache_key != key:
+            GraphEngine._cached = GraphEngine._build_topology_graph()
+            GraphEngine._cache_key = key
+        return GraphEngine._cached
+    
+    @staticmethod
+    def invalidate():
+        """Drop the cached topology"""
+        GraphEngine._cached = None
+    
+    @staticmethod
+    def _build_topology_graph() -> TopologyGraph:
         nodes = []
         edges = []
         
@@ -571,31 +597,59 @@ class GraphEngine:
         for edge in edges:
             graph[edge["source"]].append(edge["target"])
         
-        # Find all paths from critical services
+        # Find the longest path from each critical service
         critical_services = [n["id"] for n in nodes if n.get("criticality") == "critical"]
+        if not critical_services:
+            return []
+        successor = GraphEngine._longest_paths(graph, critical_services)
         paths = []
         
         for service in critical_services:
-            path = GraphEngine._dfs_path(graph, service, set())
+            path = [service]
+            while successor.get(path[-1]) is not None:
+                path.append(successor[path[-1]])
             if len(path) > 1:
                 paths.append(path)
         
         return paths[:5]  # Return top 5 critical paths
     
     @staticmethod
-    def _dfs_path(graph: Dict, node: str, visited: set) -> List[str]:
-        """DFS to find longest path"""
-        visited.add(node)
-        path = [node]
+    def _longest_paths(graph: Dict[str, List[str]], roots: List[str]) -> Dict[str, Optional[str]]:
+        """Longest-path successor of every node reachable from ``roots``
+        
+        Iterative DFS yields a post-order, i.e. a reverse topological order
+        of the graph with back edges (cycles) dropped; one pass over it
+        computes each node's longest chain from its already-finished
+        successors, so the whole search is O(V + E).
+        """
+        length: Dict[str, int] = {}
+        successor: Dict[str, Optional[str]] = {}
+        on_stack = set()
         
-        longest_subpath = []
-        for neighbor in graph.get(node, []):
-            if neighbor not in visited:
-                subpath = GraphEngine._dfs_path(graph, neighbor, visited.copy())
-                if len(subpath) > len(longest_subpath):
-                    longest_subpath = subpath
+        for root in roots:
+            if root in length:
+                continue
+            stack = [(root, iter(graph.get(root, ())))]
+            on_stack.add(root)
+            while stack:
+                node, neighbors = stack[-1]
+                for neighbor in neighbors:
+                    if neighbor not in length and neighbor not in on_stack:
+                        on_stack.add(neighbor)
+                        stack.append((neighbor, iter(graph.get(neighbor, ()))))
+                        break
+                else:
+                    stack.pop()
+                    on_stack.discard(node)
+                    best, best_length = None, 0
+                    for neighbor in graph.get(node, ()):
+                        # Neighbors still on the stack close a cycle; skip them
+                        if neighbor in length and length[neighbor] > best_length:
+                            best, best_length = neighbor, length[neighbor]
+                    length[node] = best_length + 1
+                    successor[node] = best
         
-        return path + longest_subpath
+        return successor
 
 
 class NLPEngine:
@@ -760,69 +814,69 @@ class RAGEngine:
 
 # ==================== Service Health Management ====================
 
-async def check_service_health(service_id: str, service_info: Dict) -> Dict:
+async def check_service_health(service_id: str, service_info: Dict,
+                               session: Optional[aiohttp.ClientSession] = None) -> Dict:
     """Enhanced health check with metrics collection"""
     start_time = asyncio.get_event_loop().time()
     
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{service_info['url']}/health",
-                timeout=aiohttp.ClientTimeout(total=5)
-            ) as response:
-                response_time = (asyncio.get_event_loop().time() - start_time) * 1000
+        if session is None:
+            session = await health_prober.get_session()
+        # The prober's session carries its probe_timeout
+        async with session.get(f"{service_info['url']}/health") as response:
+            response_time = (asyncio.get_event_loop().time() - start_time) * 1000
+            
+            if response.status == 200:
+                data = await response.json()
                 
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    # Simulate metrics (in production, fetch from actual endpoints)
-                    metrics = ServiceMetrics(
-                        cpu_percent=20.0 + (hash(service_id) % 50),
-                        memory_mb=256.0 + (hash(service_id) % 512),
-                        memory_percent=25.0 + (hash(service_id) % 40),
-                        network_in_mbps=10.5,
-                        network_out_mbps=8.2,
-                        disk_io_read_mbps=15.3,
-                        disk_io_write_mbps=12.1,
-                        request_rate=150.0 + (hash(service_id) % 200),
-                        error_rate=0.5,
-                        p50_latency=25.0,
-                        p95_latency=85.0,
-                        p99_latency=150.0,
-                        active_connections=42 + (hash(service_id) % 100)
-                    )
-                    
-                    # Calculate health score
-                    health_score = AdvancedScoringEngine.calculate_health_score(
-                        service_id, metrics, ServiceStatus.HEALTHY,
-                        list(metrics_history.get(service_id, []))
-                    )
-                    
-                    # Store in history
-                    metrics_history[service_id].append({
-                        "timestamp": datetime.now().isoformat(),
-                        "score": health_score.overall,
-                        "metrics": metrics.dict()
-                    })
-                    
-                    return {
-                        "service": service_id,
-                        "status": ServiceStatus.HEALTHY.value,
-                        "response_time_ms": round(response_time, 2),
-                        "last_check": datetime.now().isoformat(),
-                        "version": data.get("version", "unknown"),
-                        "metrics": metrics.dict(),
-                        "health_score": health_score.dict(),
-                        "category": service_info["category"].value,
-                        "criticality": service_info["criticality"]
-                    }
-                else:
-                    return {
-                        "service": service_id,
-                        "status": ServiceStatus.UNHEALTHY.value,
-                        "response_time_ms": round(response_time, 2),
-                        "last_check": datetime.now().isoformat()
-                    }
+                # Simulate metrics (in production, fetch from actual endpoints)
+                metrics = ServiceMetrics(
+                    cpu_percent=20.0 + (hash(service_id) % 50),
+                    memory_mb=256.0 + (hash(service_id) % 512),
+                    memory_percent=25.0 + (hash(service_id) % 40),
+                    network_in_mbps=10.5,
+                    network_out_mbps=8.2,
+                    disk_io_read_mbps=15.3,
+                    disk_io_write_mbps=12.1,
+                    request_rate=150.0 + (hash(service_id) % 200),
+                    error_rate=0.5,
+                    p50_latency=25.0,
+                    p95_latency=85.0,
+                    p99_latency=150.0,
+                    active_connections=42 + (hash(service_id) % 100)
+                )
+                
+                # Calculate health score
+                health_score = AdvancedScoringEngine.calculate_health_score(
+                    service_id, metrics, ServiceStatus.HEALTHY,
+                    list(metrics_history.get(service_id, []))
+                )
+                
+                # Store in history
+                metrics_history[service_id].append({
+                    "timestamp": datetime.now().isoformat(),
+                    "score": health_score.overall,
+                    "metrics": metrics.dict()
+                })
+                
+                return {
+                    "service": service_id,
+                    "status": ServiceStatus.HEALTHY.value,
+                    "response_time_ms": round(response_time, 2),
+                    "last_check": datetime.now().isoformat(),
+                    "version": data.get("version", "unknown"),
+                    "metrics": metrics.dict(),
+                    "health_score": health_score.dict(),
+                    "category": service_info["category"].value,
+                    "criticality": service_info["criticality"]
+                }
+            else:
+                return {
+                    "service": service_id,
+                    "status": ServiceStatus.UNHEALTHY.value,
+                    "response_time_ms": round(response_time, 2),
+                    "last_check": datetime.now().isoformat()
+                }
     except Exception as e:
         response_time = (asyncio.get_event_loop().time() - start_time) * 1000
         return {
@@ -834,61 +888,373 @@ async def check_service_health(service_id: str, service_info: Dict) -> Dict:
         }
 
 
-async def check_all_services() -> Dict[str, Dict]:
-    """Check health of all services in parallel"""
-    tasks = [
-        check_service_health(service_id, service_info)
-        for service_id, service_info in SERVICES.items()
-    ]
+class HealthProber:
+    """Long-lived, incremental health prober for the registered services
     
-    results = await asyncio.gather(*tasks)
+    Every service is re-probed on its own ``health_interval`` (default
+    ``interval``) by the shared heartbeat ``ProbeScheduler``: jittered
+    due times on a min-heap, bounded concurrency and one pooled
+    keep-alive session with DNS caching. Results are cached; services
+    whose status, version, error or health score moved since the last
+    drain are reported by ``drain_changes`` so broadcasts only carry
+    what changed.
+    """
+    
+    def __init__(self, interval: float = 10.0, jitter: float = 0.1,
+                 max_concurrent_probes: int = 50, probe_timeout: float = 5.0):
+        self.interval = interval
+        self.scheduler = ProbeScheduler(
+            self._probe,
+            self._interval_of,
+            max_concurrent_probes=max_concurrent_probes,
+            jitter=jitter,
+            probe_timeout=probe_timeout
+        )
+        
+        self.results: Dict[str, Dict] = {}
+        self._fingerprints: Dict[str, Tuple] = {}
+        self._changed: Set[str] = set()
+        self.changes = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        
+        self.stats = {
+            "probes": 0,
+            "changes": 0
+        }
+    
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Shared session: pooled connector, cached DNS, keep-alive connections"""
+        return await self.scheduler.get_session()
+    
+    def sync_services(self):
+        """Schedule newly registered services and forget removed ones"""
+        for service_id, service_info in SERVICES.items():
+            if service_id not in self.scheduler:
+                self.scheduler.add(service_id, service_info.get("health_interval", self.interval))
+        for service_id in [s for s in self.scheduler.services if s not in SERVICES]:
+            self.scheduler.remove(service_id)
+            self.results.pop(service_id, None)
+            self._fingerprints.pop(service_id, None)
+            self._changed.discard(service_id)
+    
+    def _interval_of(self, service_id: str) -> Optional[float]:
+        service_info = SERVICES.get(service_id)
+        return service_info.get("health_interval", self.interval) if service_info else None
+    
+    @staticmethod
+    def _fingerprint(result: Dict) -> Tuple:
+        # Latency and timestamps move on every probe; they ride along but never trigger a push
+        return (
+            result.get("status"),
+            result.get("version"),
+            result.get("error"),
+            result.get("health_score", {}).get("overall")
+        )
+    
+    def _record(self, service_id: str, result: Dict):
+        if service_id not in SERVICES:
+            return
+        self.results[service_id] = result
+        SERVICES[service_id]["status"] = result["status"]
+        fingerprint = self._fingerprint(result)
+        if self._fingerprints.get(service_id) != fingerprint:
+            self._fingerprints[service_id] = fingerprint
+            self._changed.add(service_id)
+            self.stats["changes"] += 1
+            self.changes.set()
+    
+    async def probe(self, service_id: str) -> Dict:
+        """Probe one service now (sharing any probe already in flight)"""
+        return await self.scheduler.probe_now(service_id)
     
-    return {result["service"]: result for result in results}
+    async def _probe(self, service_id: str) -> Dict:
+        session = await self.get_session()
+        result = await check_service_health(service_id, SERVICES[service_id], session)
+        self.stats["probes"] += 1
+        self._record(service_id, result)
+        return result
+    
+    async def snapshot(self) -> Dict[str, Dict]:
+        """Latest result for every service, probing only those never checked"""
+        self.sync_services()
+        missing = [s for s in SERVICES if s not in self.results]
+        if missing:
+            await asyncio.gather(*(self.probe(s) for s in missing), return_exceptions=True)
+        return {s: self.results[s] for s in SERVICES if s in self.results}
+    
+    def drain_changes(self) -> Dict[str, Dict]:
+        """Results that changed since the previous drain"""
+        changed = {s: self.results[s] for s in self._changed if s in self.results}
+        self._changed.clear()
+        self.changes.clear()
+        return changed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, **self.scheduler.get_stats()}
+    
+    def start(self):
+        self.sync_services()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.scheduler.run())
+    
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.scheduler.stop()
+
+
+health_prober = HealthProber()
+
+
+async def check_all_services() -> Dict[str, Dict]:
+    """Latest health of all services from the incremental prober"""
+    return await health_prober.snapshot()
 
 
 # ==================== Background Tasks ====================
 
+def _pointer(*parts: str) -> str:
+    """RFC 6901 JSON pointer from raw path segments"""
+    return "".join("/" + p.replace("~", "~0").replace("/", "~1") for p in parts)
+
+
+@dataclass
+class MeshClient:
+    """Per-socket delivery state for the mesh stream"""
+    websocket: WebSocket
+    interval: float
+    version: int = 0
+    next_send: float = 0.0
+
+
+class MeshStateStream:
+    """Versioned mesh state fanned out as a snapshot plus JSON-patch deltas
+    
+    Each tick that changes anything bumps ``version`` and records the
+    ops (``add``/``replace``/``remove`` on ``/services/<id>``,
+    ``/nodes/<id>``, ``/edges/<source>-><target>`` and the whole
+    ``/clusters``, ``/critical_paths`` and ``/recommendations``).
+    Clients receive ``mesh_delta`` messages from their last acknowledged
+    version, coalesced when they asked for a slower update rate; every
+    payload is serialized once and shared by all clients that need it.
+    """
+    
+    def __init__(self, tick_seconds: float = 1.0, max_interval: float = 60.0,
+                 history_size: int = 256):
+        self.tick_seconds = tick_seconds
+        self.max_interval = max_interval
+        self.version = 0
+        self.services: Dict[str, Dict] = {}
+        self.nodes: Dict[str, Dict] = {}
+        self.edges: Dict[str, Dict] = {}
+        self.clusters: List[Dict] = []
+        self.critical_paths: List[List[str]] = []
+        self.recommendations: List[Dict] = []
+        self.clients: Dict[WebSocket, MeshClient] = {}
+        
+        self._topology: Optional[TopologyGraph] = None
+        self._history: deque = deque(maxlen=history_size)  # (version, ops)
+        self._pending: List[Dict] = []
+        self._payloads: Dict[Tuple[int, int], str] = {}
+        self._snapshot: Optional[Tuple[int, str]] = None
+        
+        self.stats = {
+            "ticks": 0,
+            "deltas_serialized": 0,
+            "snapshots_serialized": 0,
+            "messages_sent": 0,
+            "bytes_sent": 0
+        }
+    
+    def _diff_map(self, name: str, current: Dict[str, Dict], updated: Dict[str, Dict],
+                  complete: bool):
+        for key, value in updated.items():
+            previous = current.get(key)
+            if previous != value:
+                op = "add" if previous is None else "replace"
+                self._pending.append({"op": op, "path": _pointer(name, key), "value": value})
+                current[key] = value
+        if complete:
+            for key in [k for k in current if k not in updated]:
+                self._pending.append({"op": "remove", "path": _pointer(name, key)})
+                del current[key]
+    
+    def _diff_value(self, name: str, value: Any):
+        if getattr(self, name) != value:
+            self._pending.append({"op": "replace", "path": _pointer(name), "value": value})
+            setattr(self, name, value)
+    
+    def update_services(self, results: Dict[str, Dict], complete: bool = False):
+        """Stage changed health results (``complete`` also removes unlisted services)"""
+        self._diff_map("services", self.services, results, complete)
+    
+    def retain_services(self, service_ids):
+        """Stage removal of services no longer registered"""
+        for key in [k for k in self.services if k not in service_ids]:
+            self._pending.append({"op": "remove", "path": _pointer("services", key)})
+            del self.services[key]
+    
+    def update_topology(self, topology: TopologyGraph):
+        """Stage node/edge/cluster changes; a topology already applied is skipped"""
+        if topology is self._topology:
+            return
+        self._topology = topology
+        self._diff_map("nodes", self.nodes, {n["id"]: n for n in topology.nodes}, True)
+        self._diff_map("edges", self.edges, {
+            f"{e['source']}->{e['target']}": e for e in topology.edges
+        }, True)
+        self._diff_value("clusters", topology.clusters)
+        self._diff_value("critical_paths", topology.critical_paths)
+    
+    def update_recommendations(self, recommendations: List[AIRecommendation]):
+        self._diff_value("recommendations", [r.dict() for r in recommendations])
+    
+    def commit(self) -> bool:
+        """Close the staged ops into a new version"""
+        if not self._pending:
+            return False
+        self.version += 1
+        self._history.append((self.version, self._pending))
+        self._pending = []
+        self._payloads.clear()
+        return True
+    
+    def snapshot_payload(self) -> str:
+        """Full state at the current version, serialized once per version"""
+        if self._snapshot is None or self._snapshot[0] != self.version:
+            message = {
+                "type": "mesh_update",
+                "version": self.version,
+                "timestamp": datetime.now().isoformat(),
+                "services": self.services,
+                "topology": {
+                    "nodes": list(self.nodes.values()),
+                    "edges": list(self.edges.values()),
+                    "clusters": self.clusters,
+                    "critical_paths": self.critical_paths
+                },
+                "recommendations": self.recommendations
+            }
+            self._snapshot = (self.version, json.dumps(message))
+            self.stats["snapshots_serialized"] += 1
+        return self._snapshot[1]
+    
+    def delta_payload(self, base_version: int) -> str:
+        """Ops taking a client from ``base_version`` to now, last write per path wins"""
+        key = (base_version, self.version)
+        payload = self._payloads.get(key)
+        if payload is not None:
+            return payload
+        if not self._history or base_version < self._history[0][0] - 1:
+            # Too far behind the retained history; resend everything
+            return self.snapshot_payload()
+        
+        merged: Dict[str, Dict] = {}
+        for version, ops in self._history:
+            if version > base_version:
+                for op in ops:
+                    previous = merged.pop(op["path"], None)
+                    if previous is not None and previous["op"] == "add" and op["op"] == "replace":
+                        op = {**op, "op": "add"}
+                    merged[op["path"]] = op
+        payload = json.dumps({
+            "type": "mesh_delta",
+            "base_version": base_version,
+            "version": self.version,
+            "timestamp": datetime.now().isoformat(),
+            "ops": list(merged.values())
+        })
+        self._payloads[key] = payload
+        self.stats["deltas_serialized"] += 1
+        return payload
+    
+    def add_client(self, websocket: WebSocket, interval: Optional[float] = None) -> MeshClient:
+        client = MeshClient(websocket=websocket, interval=self.clamp_interval(interval))
+        self.clients[websocket] = client
+        return client
+    
+    def remove_client(self, websocket: WebSocket):
+        self.clients.pop(websocket, None)
+    
+    def clamp_interval(self, interval: Optional[float]) -> float:
+        if interval is None:
+            return self.tick_seconds
+        return min(self.max_interval, max(self.tick_seconds, float(interval)))
+    
+    async def send(self, client: MeshClient, payload: str):
+        await client.websocket.send_text(payload)
+        self.stats["messages_sent"] += 1
+        self.stats["bytes_sent"] += len(payload)
+    
+    async def send_snapshot(self, client: MeshClient):
+        version = self.version
+        await self.send(client, self.snapshot_payload())
+        client.version = version
+        client.next_send = time.monotonic() + client.interval
+    
+    async def fan_out(self):
+        """Send each due client the delta from its own version"""
+        now = time.monotonic()
+        due = [
+            c for c in self.clients.values()
+            if c.version < self.version and c.next_send <= now
+        ]
+        if not due:
+            return
+        
+        async def deliver(client: MeshClient):
+            version = self.version
+            try:
+                await asyncio.wait_for(self.send(client, self.delta_payload(client.version)),
+                                       timeout=5)
+                client.version = version
+                client.next_send = now + client.interval
+            except Exception:
+                self.remove_client(client.websocket)
+                if client.websocket in active_connections:
+                    active_connections.remove(client.websocket)
+        
+        await asyncio.gather(*(deliver(c) for c in due))
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "version": self.version,
+            "clients": len(self.clients),
+            "history_versions": len(self._history)
+        }
+
+
+mesh_stream = MeshStateStream()
+
+
 async def broadcast_health_updates():
-    """Broadcast health updates and generate AI recommendations"""
+    """Stream changed health, topology and recommendations as versioned deltas"""
+    global recommendation_cache
+    mesh_stream.update_services(await check_all_services(), complete=True)
+    mesh_stream.update_topology(GraphEngine.build_topology_graph())
+    mesh_stream.update_recommendations(recommendation_cache)
+    mesh_stream.commit()
+    
     while True:
         try:
-            # Check all services
-            health_status = await check_all_services()
-            
-            # Update service status
-            for service_id, health in health_status.items():
-                SERVICES[service_id]["status"] = health["status"]
+            await asyncio.sleep(mesh_stream.tick_seconds)
+            mesh_stream.stats["ticks"] += 1
             
-            # Generate topology graph
-            topology = GraphEngine.build_topology_graph()
+            health_prober.sync_services()
+            mesh_stream.update_services(health_prober.drain_changes())
+            mesh_stream.retain_services(SERVICES)
+            mesh_stream.update_topology(GraphEngine.build_topology_graph())
             
             # Generate AI recommendations periodically
             if len(recommendation_cache) < 3:
-                global recommendation_cache
                 recommendation_cache = await RAGEngine.generate_recommendations()
+            mesh_stream.update_recommendations(recommendation_cache)
             
-            # Broadcast to all connected clients
-            if active_connections:
-                message = {
-                    "type": "mesh_update",
-                    "timestamp": datetime.now().isoformat(),
-                    "services": health_status,
-                    "topology": topology.dict(),
-                    "recommendations": [r.dict() for r in recommendation_cache]
-                }
-                
-                disconnected = []
-                for connection in active_connections:
-                    try:
-                        await connection.send_json(message)
-                    except:
-                        disconnected.append(connection)
-                
-                # Remove disconnected clients
-                for conn in disconnected:
-                    active_connections.remove(conn)
-            
-            await asyncio.sleep(10)  # Update every 10 seconds
+            mesh_stream.commit()
+            await mesh_stream.fan_out()
             
         except Exception as e:
             print(f"[❌] Error in health check broadcast: {e}")
@@ -898,6 +1264,7 @@ async def broadcast_health_updates():
 @app.on_event("startup")
 async def startup_event():
     """Initialize background tasks"""
+    health_prober.start()
     asyncio.create_task(broadcast_health_updates())
     
     # Initialize recommendation cache
@@ -905,6 +1272,12 @@ async def startup_event():
     recommendation_cache = await RAGEngine.generate_recommendations()
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the prober and release its pooled connections"""
+    await health_prober.stop()
+
+
 # ==================== API Endpoints ====================
 
 @app.get("/", response_class=HTMLResponse)
@@ -968,7 +1341,9 @@ async def comprehensive_health_check():
         },
         "services": health_status,
         "topology": GraphEngine.build_topology_graph().dict(),
-        "critical_services": [s for s in SERVICES if SERVICES[s]["criticality"] == "critical"]
+        "critical_services": [s for s in SERVICES if SERVICES[s]["criticality"] == "critical"],
+        "prober": health_prober.get_stats(),
+        "stream": mesh_stream.get_stats()
     }
 
 
@@ -1050,34 +1425,50 @@ async def get_ai_recommendations(category: Optional[str] = None, priority: Optio
 
 
 @app.websocket("/ws/mesh")
-async def websocket_mesh(websocket: WebSocket):
-    """WebSocket endpoint for real-time mesh updates"""
+async def websocket_mesh(websocket: WebSocket, interval: Optional[float] = None):
+    """WebSocket endpoint for real-time mesh updates
+    
+    Sends a full ``mesh_update`` snapshot, then ``mesh_delta`` messages.
+    Clients may pick their update rate with ``?interval=<seconds>`` or by
+    sending ``{"type": "subscribe", "interval": <seconds>}``, and request
+    a fresh snapshot with ``{"type": "resync"}``.
+    """
     await websocket.accept()
     active_connections.append(websocket)
+    client = mesh_stream.add_client(websocket, interval)
     
     try:
         # Send initial state
-        health_status = await check_all_services()
-        topology = GraphEngine.build_topology_graph()
-        
-        await websocket.send_json({
-            "type": "mesh_update",
-            "timestamp": datetime.now().isoformat(),
-            "services": health_status,
-            "topology": topology.dict(),
-            "recommendations": [r.dict() for r in recommendation_cache]
-        })
+        if mesh_stream.version == 0:
+            mesh_stream.update_services(await check_all_services(), complete=True)
+            mesh_stream.update_topology(GraphEngine.build_topology_graph())
+            mesh_stream.update_recommendations(recommendation_cache)
+            mesh_stream.commit()
+        await mesh_stream.send_snapshot(client)
         
-        # Keep connection alive
         while True:
             try:
                 data = await websocket.receive_text()
-                # Handle client messages if needed
             except WebSocketDisconnect:
                 break
+            try:
+                request = json.loads(data)
+            except ValueError:
+                continue
+            if not isinstance(request, dict):
+                continue
+            if request.get("type") == "subscribe":
+                try:
+                    client.interval = mesh_stream.clamp_interval(request.get("interval"))
+                except (TypeError, ValueError):
+                    continue
+                client.next_send = min(client.next_send, time.monotonic() + client.interval)
+            elif request.get("type") == "resync":
+                await mesh_stream.send_snapshot(client)
     except Exception as e:
         print(f"[⚠️] WebSocket error: {e}")
     finally:
+        mesh_stream.remove_client(websocket)
         if websocket in active_connections:
             active_connections.remove(websocket)
 
@@ -1249,7 +1640,9 @@ async def get_message_bus_status():
         "port": message_bus.port,
         "exchanges": list(message_bus.exchanges.keys()),
         "queues": list(message_bus.queues.keys()),
-        "active_consumers": len(message_bus.consumers)
+        "active_consumers": len(message_bus.consumers),
+        "consumers": message_bus.get_consumer_stats(),
+        "publisher": message_bus.get_publisher_stats()
     }
 
 
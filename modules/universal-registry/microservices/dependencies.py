@@ -3,7 +3,7 @@ Service Dependency Mapping and Relationship Management
 Tracks dependencies between services and generates visual relationship graphs
 """
 
-from typing import Dict, List, Set, Optional, Any
+from typing import Any, Callable, Dict, List, Optional, Set
 from dataclasses import dataclass, field
 from enum import Enum
 import json
@@ -92,12 +92,30 @@ class ServiceNode:
 
 
 class DependencyGraph:
-    """Manages service dependency relationships"""
+    """Manages service dependency relationships
+    
+    Cycle detection, the critical path and hub lookups are computed
+    iteratively (no recursion limit on deep graphs) and cached until the
+    next ``add_service``/``add_dependency`` bumps ``version``.
+    """
     
     def __init__(self):
         self.nodes: Dict[str, ServiceNode] = {}
         self.edges: List[ServiceDependency] = []
         self.clusters: Dict[str, List[str]] = {}  # Logical groupings
+        self.in_degree: Dict[str, int] = {}
+        self.out_degree: Dict[str, int] = {}
+        self.version = 0
+        self._cache: Dict[Any, Any] = {}
+    
+    def _mutated(self):
+        self.version += 1
+        self._cache.clear()
+    
+    def _cached(self, key: Any, compute: Callable[[], Any]) -> Any:
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
     
     def add_service(
         self,
@@ -115,6 +133,9 @@ class DependencyGraph:
             port=port,
             metadata=metadata or {}
         )
+        self.in_degree[service_id] = 0
+        self.out_degree[service_id] = 0
+        self._mutated()
     
     def add_dependency(
         self,
@@ -145,8 +166,13 @@ class DependencyGraph:
         self.edges.append(dep)
         
         # Update node dependencies
-        self.nodes[source].dependencies_out.add(target)
-        self.nodes[target].dependencies_in.add(source)
+        if target not in self.nodes[source].dependencies_out:
+            self.nodes[source].dependencies_out.add(target)
+            self.out_degree[source] += 1
+        if source not in self.nodes[target].dependencies_in:
+            self.nodes[target].dependencies_in.add(source)
+            self.in_degree[target] += 1
+        self._mutated()
     
     def get_dependencies(self, service_id: str, direction: str = "both") -> List[str]:
         """Get dependencies for a service"""
@@ -163,61 +189,135 @@ class DependencyGraph:
             return list(node.dependencies_out | node.dependencies_in)
     
     def detect_circular_dependencies(self) -> List[List[str]]:
-        """Detect circular dependencies in the graph"""
-        circular_deps = []
-        visited = set()
-        rec_stack = set()
+        """Detect circular dependencies in the graph (one cycle per strongly connected component)"""
+        cycles = self._cached("cycles", self._find_cycles)
+        return [list(cycle) for cycle in cycles]
+    
+    def strongly_connected_components(self) -> List[List[str]]:
+        """Tarjan's SCCs, iterative; components come out in reverse topological order"""
+        components = self._cached("scc", self._tarjan)
+        return [list(component) for component in components]
+    
+    def _tarjan(self) -> List[List[str]]:
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        components: List[List[str]] = []
+        counter = 0
         
-        def dfs(node_id: str, path: List[str]) -> bool:
-            """DFS to detect cycles"""
-            visited.add(node_id)
-            rec_stack.add(node_id)
-            path.append(node_id)
-            
-            # Check all dependencies
-            for dep in self.nodes[node_id].dependencies_out:
-                if dep not in visited:
-                    if dfs(dep, path.copy()):
-                        return True
-                elif dep in rec_stack:
-                    # Circular dependency found
-                    cycle_start = path.index(dep)
-                    circular_deps.append(path[cycle_start:] + [dep])
-                    return True
+        for root in self.nodes:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.nodes[root].dependencies_out))]
             
-            rec_stack.remove(node_id)
-            return False
+            while work:
+                node_id, deps = work[-1]
+                for dep in deps:
+                    if dep not in index:
+                        index[dep] = lowlink[dep] = counter
+                        counter += 1
+                        stack.append(dep)
+                        on_stack.add(dep)
+                        work.append((dep, iter(self.nodes[dep].dependencies_out)))
+                        break
+                    if dep in on_stack:
+                        lowlink[node_id] = min(lowlink[node_id], index[dep])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node_id])
+                    if lowlink[node_id] == index[node_id]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node_id:
+                                break
+                        components.append(component)
         
-        # Check all nodes
-        for node_id in self.nodes:
-            if node_id not in visited:
-                dfs(node_id, [])
-        
-        return circular_deps
+        return components
+    
+    def _find_cycles(self) -> List[List[str]]:
+        cycles = []
+        for component in self._cached("scc", self._tarjan):
+            start = component[-1]
+            if len(component) == 1 and start not in self.nodes[start].dependencies_out:
+                continue
+            # Shortest way back to the start inside the component, by BFS
+            members = set(component)
+            parent: Dict[str, Optional[str]] = {start: None}
+            queue = [start]
+            closing = None
+            for node_id in queue:
+                for dep in sorted(self.nodes[node_id].dependencies_out):
+                    if dep == start:
+                        closing = node_id
+                        break
+                    if dep in members and dep not in parent:
+                        parent[dep] = node_id
+                        queue.append(dep)
+                if closing is not None:
+                    break
+            path = []
+            while closing is not None:
+                path.append(closing)
+                closing = parent[closing]
+            cycles.append(path[::-1] + [start])
+        return cycles
     
     def get_critical_path(self) -> List[str]:
         """Get the critical dependency path (longest path)"""
-        # Simple implementation: DFS to find longest path
-        max_path = []
+        return list(self._cached("critical_path", self._longest_path))
+    
+    def _longest_path(self) -> List[str]:
+        """Longest chain from a root, via a post-order DP over the graph
         
-        def dfs(node_id: str, path: List[str], visited: Set[str]):
-            nonlocal max_path
-            
-            if len(path) > len(max_path):
-                max_path = path.copy()
-            
-            for dep in self.nodes[node_id].dependencies_out:
-                if dep not in visited:
-                    visited.add(dep)
-                    dfs(dep, path + [dep], visited)
-                    visited.remove(dep)
+        Each node's longest chain is computed once from its finished
+        dependencies; edges back into the current DFS stack (cycles) are
+        skipped, so the pass is O(V + E).
+        """
+        length: Dict[str, int] = {}
+        successor: Dict[str, Optional[str]] = {}
+        on_stack: Set[str] = set()
         
-        # Start from nodes with no incoming dependencies
-        for node_id in self.nodes:
-            if not self.nodes[node_id].dependencies_in:
-                dfs(node_id, [node_id], {node_id})
+        # Start from nodes with no incoming dependencies (any node if every one is in a cycle)
+        roots = [n for n in self.nodes if not self.in_degree.get(n)] or list(self.nodes)
+        for root in roots:
+            if root in length:
+                continue
+            on_stack.add(root)
+            work = [(root, iter(self.nodes[root].dependencies_out))]
+            while work:
+                node_id, deps = work[-1]
+                for dep in deps:
+                    if dep not in length and dep not in on_stack:
+                        on_stack.add(dep)
+                        work.append((dep, iter(self.nodes[dep].dependencies_out)))
+                        break
+                else:
+                    work.pop()
+                    on_stack.discard(node_id)
+                    best, best_length = None, 0
+                    for dep in self.nodes[node_id].dependencies_out:
+                        if dep in length and length[dep] > best_length:
+                            best, best_length = dep, length[dep]
+                    length[node_id] = best_length + 1
+                    successor[node_id] = best
         
-        return max_path
+        if not roots:
+            return []
+        start = max(roots, key=lambda n: length.get(n, 0))
+        path = [start]
+        while successor.get(path[-1]) is not None:
+            path.append(successor[path[-1]])
+        return path
     
     def cluster_services(self) -> Dict[str, List[str]]:
         """Group services into logical clusters"""
@@ -235,17 +335,19 @@ class DependencyGraph:
     
     def get_hub_services(self, threshold: int = 3) -> List[str]:
         """Get services with many dependencies (hubs)"""
-        return [
-            node_id for node_id, node in self.nodes.items()
-            if node.dependency_count() >= threshold
-        ]
+        hubs = self._cached(("hubs", threshold), lambda: [
+            node_id for node_id in self.nodes
+            if self.in_degree[node_id] + self.out_degree[node_id] >= threshold
+        ])
+        return list(hubs)
     
     def get_isolated_services(self) -> List[str]:
         """Get services with no dependencies"""
-        return [
-            node_id for node_id, node in self.nodes.items()
-            if node.is_isolated()
-        ]
+        isolated = self._cached("isolated", lambda: [
+            node_id for node_id in self.nodes
+            if not self.in_degree[node_id] and not self.out_degree[node_id]
+        ])
+        return list(isolated)
     
     def to_cytoscape_json(self) -> Dict[str, Any]:
         """Export graph in Cytoscape.js format for visualization"""
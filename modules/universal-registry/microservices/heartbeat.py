@@ -4,9 +4,12 @@ Monitors service health with sophisticated heartbeat mechanisms
 """
 
 import asyncio
+import heapq
+import itertools
+import random
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any, Tuple
 from enum import Enum
 from dataclasses import dataclass, field
 import json
@@ -93,13 +96,183 @@ class ServiceHeartbeat:
         self.update_status()
 
 
+class ProbeScheduler:
+    """Per-service probe scheduling shared by the health monitors
+    
+    Probes are scheduled on a min-heap keyed by each service's next due
+    time, so every service is checked on its own interval (from
+    ``interval_of``, +/- ``jitter``). At most ``max_concurrent_probes``
+    run at once, all through one keep-alive ``aiohttp`` session, and a
+    service whose previous probe has not finished is skipped for that
+    round. ``interval_of`` returns None for services that are gone.
+    """
+    
+    def __init__(
+        self,
+        probe: Callable[[str], Awaitable[Any]],
+        interval_of: Callable[[str], Optional[float]],
+        max_concurrent_probes: int = 100,
+        jitter: float = 0.1,
+        probe_timeout: float = 5.0
+    ):
+        self.probe = probe
+        self.interval_of = interval_of
+        self.max_concurrent_probes = max_concurrent_probes
+        self.jitter = jitter
+        self.probe_timeout = probe_timeout
+        self.running = False
+        
+        # (due time, tiebreaker, service_id); stale entries are skipped on pop
+        self._schedule: List[Tuple[float, int, str]] = []
+        self._next_due: Dict[str, float] = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(max_concurrent_probes)
+        self._session = None
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        
+        self.stats = {
+            "probes_started": 0,
+            "probes_skipped_in_flight": 0
+        }
+    
+    def __contains__(self, service_id: str) -> bool:
+        return service_id in self._next_due
+    
+    @property
+    def services(self) -> List[str]:
+        return list(self._next_due)
+    
+    def add(self, service_id: str, interval: float):
+        """Schedule a service's first probe"""
+        # Spread first probes over one interval instead of firing them together
+        self._schedule_probe(service_id, time.monotonic() + random.uniform(0, interval))
+    
+    def remove(self, service_id: str):
+        """Stop probing a service (its heap entry is dropped when popped)"""
+        self._next_due.pop(service_id, None)
+    
+    def _schedule_probe(self, service_id: str, due: float):
+        self._next_due[service_id] = due
+        heapq.heappush(self._schedule, (due, next(self._counter), service_id))
+        if self._schedule[0][2] == service_id:
+            self._wakeup.set()
+    
+    def _next_interval(self, interval: float) -> float:
+        spread = interval * self.jitter
+        return max(0.1, interval + random.uniform(-spread, spread))
+    
+    async def get_session(self):
+        """Shared session: pooled connector, cached DNS, keep-alive connections"""
+        import aiohttp
+        
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrent_probes,
+                ttl_dns_cache=300,
+                keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.probe_timeout)
+            )
+        return self._session
+    
+    async def probe_now(self, service_id: str) -> Any:
+        """Probe one service now (sharing any probe already in flight)"""
+        task = self._in_flight.get(service_id) or self._start(service_id)
+        return await asyncio.shield(task)
+    
+    def _start(self, service_id: str) -> asyncio.Task:
+        self.stats["probes_started"] += 1
+        task = self._in_flight[service_id] = asyncio.create_task(self._probe(service_id))
+        return task
+    
+    async def _probe(self, service_id: str) -> Any:
+        try:
+            async with self._semaphore:
+                return await self.probe(service_id)
+        finally:
+            self._in_flight.pop(service_id, None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "scheduled_services": len(self._next_due),
+            "in_flight": len(self._in_flight),
+            "max_concurrent_probes": self.max_concurrent_probes
+        }
+    
+    async def run(self):
+        """Probe services as they come due until ``stop``"""
+        self.running = True
+        while self.running:
+            if not self._schedule:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            
+            due, _, service_id = self._schedule[0]
+            delay = due - time.monotonic()
+            if delay > 0:
+                # Sleep until the earliest probe, or until an earlier one is scheduled
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            heapq.heappop(self._schedule)
+            interval = self.interval_of(service_id)
+            if interval is None or self._next_due.get(service_id) != due:
+                continue
+            self._schedule_probe(service_id, due + self._next_interval(interval))
+            
+            if service_id in self._in_flight:
+                self.stats["probes_skipped_in_flight"] += 1
+                continue
+            self._start(service_id)
+    
+    async def stop(self):
+        """Stop the run loop, cancel in-flight probes and close the session"""
+        self.running = False
+        self._wakeup.set()
+        tasks = list(self._in_flight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
 class HeartbeatManager:
-    """Advanced heartbeat monitoring system"""
+    """Advanced heartbeat monitoring system
     
-    def __init__(self):
+    Every registered service is probed on its own ``interval_seconds``
+    by a ``ProbeScheduler`` (bounded concurrency, one keep-alive
+    session, jittered due times).
+    """
+    
+    def __init__(
+        self,
+        max_concurrent_probes: int = 100,
+        jitter: float = 0.1,
+        probe_timeout: float = 5.0
+    ):
         self.heartbeats: Dict[str, ServiceHeartbeat] = {}
         self.running = False
         self.monitor_task: Optional[asyncio.Task] = None
+        
+        self.scheduler = ProbeScheduler(
+            self._probe,
+            self._interval_of,
+            max_concurrent_probes=max_concurrent_probes,
+            jitter=jitter,
+            probe_timeout=probe_timeout
+        )
     
     def register_service(
         self,
@@ -121,16 +294,28 @@ class HeartbeatManager:
             max_failures=max_failures,
             metadata=metadata or {}
         )
+        self.scheduler.add(service_id, interval_seconds)
     
     def unregister_service(self, service_id: str):
         """Unregister a service from heartbeat monitoring"""
         if service_id in self.heartbeats:
             del self.heartbeats[service_id]
+        self.scheduler.remove(service_id)
+    
+    def _interval_of(self, service_id: str) -> Optional[float]:
+        heartbeat = self.heartbeats.get(service_id)
+        return heartbeat.interval_seconds if heartbeat else None
+    
+    @staticmethod
+    def _check_url(service_id: str, heartbeat: ServiceHeartbeat) -> str:
+        # Explicit URL from metadata, else the conventional service health endpoint
+        return heartbeat.metadata.get(
+            "check_url",
+            f"http://{service_id}:{heartbeat.metadata.get('port', 8000)}/health"
+        )
     
     async def check_heartbeat(self, service_id: str, check_url: str) -> bool:
         """Check service heartbeat"""
-        import aiohttp
-        
         if service_id not in self.heartbeats:
             return False
         
@@ -138,21 +323,26 @@ class HeartbeatManager:
         start_time = time.time()
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(check_url, timeout=aiohttp.ClientTimeout(total=5)) as response:
-                    latency = time.time() - start_time
-                    
-                    if response.status == 200:
-                        heartbeat.record_success(latency)
-                        return True
-                    else:
-                        heartbeat.record_failure()
-                        return False
+            session = await self.scheduler.get_session()
+            async with session.get(check_url) as response:
+                latency = time.time() - start_time
+                
+                if response.status == 200:
+                    heartbeat.record_success(latency)
+                    return True
+                else:
+                    heartbeat.record_failure()
+                    return False
         except Exception:
-            latency = time.time() - start_time
             heartbeat.record_failure()
             return False
     
+    async def _probe(self, service_id: str) -> bool:
+        heartbeat = self.heartbeats.get(service_id)
+        if heartbeat is None:
+            return False
+        return await self.check_heartbeat(service_id, self._check_url(service_id, heartbeat))
+    
     def get_service_status(self, service_id: str) -> Optional[Dict[str, Any]]:
         """Get current status of a service"""
         if service_id not in self.heartbeats:
@@ -209,26 +399,14 @@ class HeartbeatManager:
             "overall_health_percentage": round((healthy / total * 100) if total > 0 else 0, 2)
         }
     
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        """Get probe scheduler statistics"""
+        return self.scheduler.get_stats()
+    
     async def start_monitoring(self):
         """Start continuous heartbeat monitoring"""
         self.running = True
-        
-        while self.running:
-            # Check all heartbeats
-            for service_id, heartbeat in self.heartbeats.items():
-                # Construct health check URL
-                # This would be service-specific in production
-                check_url = f"http://{service_id}:{heartbeat.metadata.get('port', 8000)}/health"
-                
-                # Schedule heartbeat check
-                asyncio.create_task(self.check_heartbeat(service_id, check_url))
-            
-            # Wait for next check interval (use minimum interval)
-            min_interval = min(
-                (hb.interval_seconds for hb in self.heartbeats.values()),
-                default=10
-            )
-            await asyncio.sleep(min_interval)
+        await self.scheduler.run()
     
     async def stop_monitoring(self):
         """Stop heartbeat monitoring"""
@@ -239,6 +417,7 @@ class HeartbeatManager:
                 await self.monitor_task
             except asyncio.CancelledError:
                 pass
+        await self.scheduler.stop()
 
 
 # Global heartbeat manager instance
@@ -0,0 +1,303 @@
+"""
+In-Process Message Broker
+Minimal stand-in for RabbitMQ that speaks the aio_pika object model
+(connection -> channel -> exchange/queue -> incoming message) so the
+message bus can be exercised without a running broker:
+
+    broker = InMemoryBroker(confirm_delay=0.001)
+    bus = MessageBus(connect_factory=broker.connect)
+    await bus.connect()
+"""
+
+import asyncio
+import itertools
+import logging
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aio_pika import ExchangeType, Message
+
+logger = logging.getLogger(__name__)
+
+
+def _topic_matches(binding: List[str], key: List[str]) -> bool:
+    """AMQP topic match on dot-separated words ('*' = one word, '#' = zero or more)"""
+    if not binding:
+        return not key
+    head = binding[0]
+    if head == "#":
+        return any(_topic_matches(binding[1:], key[i:]) for i in range(len(key) + 1))
+    if key and (head == "*" or head == key[0]):
+        return _topic_matches(binding[1:], key[1:])
+    return False
+
+
+class InMemoryIncomingMessage:
+    """Delivered message with ack/nack/reject and ``process()``"""
+
+    def __init__(self, message: Message, channel: "InMemoryChannel", queue: "InMemoryQueue",
+                 delivery_tag: int, routing_key: str, redelivered: bool = False):
+        self._message = message
+        self.channel = channel
+        self.queue = queue
+        self.delivery_tag = delivery_tag
+        self.routing_key = routing_key
+        self.redelivered = redelivered
+        self.consumer_tag: Optional[str] = None
+        self.processed = False
+
+        self.body = message.body
+        self.headers = message.headers
+        self.content_type = message.content_type
+        self.correlation_id = message.correlation_id
+        self.reply_to = message.reply_to
+        self.priority = message.priority
+        self.delivery_mode = message.delivery_mode
+        self.timestamp = message.timestamp
+
+    async def ack(self, multiple: bool = False):
+        self.channel._settle(self, multiple, requeue=None)
+
+    async def nack(self, multiple: bool = False, requeue: bool = True):
+        self.channel._settle(self, multiple, requeue=requeue)
+
+    async def reject(self, requeue: bool = False):
+        self.channel._settle(self, False, requeue=requeue)
+
+    @asynccontextmanager
+    async def process(self, requeue: bool = False, reject_on_redelivered: bool = False,
+                      ignore_processed: bool = False):
+        try:
+            yield self
+            if not ignore_processed and not self.processed:
+                await self.ack()
+        except Exception:
+            if not ignore_processed and not self.processed:
+                await self.reject(requeue=requeue)
+            raise
+
+
+class InMemoryQueue:
+    """Queue with consumers, bindings and prefetch-limited dispatch"""
+
+    def __init__(self, broker: "InMemoryBroker", channel: "InMemoryChannel", name: str):
+        self.broker = broker
+        self.channel = channel
+        self.name = name
+        self.messages: deque = deque()
+        self.consumers: Dict[str, Tuple[Callable, bool, "InMemoryChannel"]] = {}
+        self._consumer_cycle = None
+
+    async def bind(self, exchange: "InMemoryExchange", routing_key: str = "#", **kwargs):
+        self.broker.bindings.setdefault(exchange.name, []).append(
+            (routing_key, routing_key.split("."), self)
+        )
+
+    async def consume(self, callback: Callable, no_ack: bool = False, **kwargs) -> str:
+        tag = f"ctag-{next(self.broker.tag_counter)}"
+        self.consumers[tag] = (callback, no_ack, self.channel)
+        self._consumer_cycle = itertools.cycle(list(self.consumers))
+        self.dispatch()
+        return tag
+
+    async def cancel(self, consumer_tag: str, **kwargs):
+        self.consumers.pop(consumer_tag, None)
+        self._consumer_cycle = itertools.cycle(list(self.consumers)) if self.consumers else None
+
+    async def delete(self, **kwargs):
+        self.broker.queues.pop(self.name, None)
+        for bindings in self.broker.bindings.values():
+            bindings[:] = [binding for binding in bindings if binding[2] is not self]
+
+    def put(self, message: Message, routing_key: str, front: bool = False, redelivered: bool = False):
+        entry = (message, routing_key, redelivered)
+        if front:
+            self.messages.appendleft(entry)
+        else:
+            self.messages.append(entry)
+        self.dispatch()
+
+    def dispatch(self):
+        """Hand queued messages to consumers while their channel has prefetch room"""
+        if not self.consumers:
+            return
+        blocked = 0
+        while self.messages and blocked < len(self.consumers):
+            tag = next(self._consumer_cycle)
+            callback, no_ack, channel = self.consumers[tag]
+            if not no_ack and not channel.has_capacity(tag):
+                blocked += 1
+                continue
+            blocked = 0
+            message, routing_key, redelivered = self.messages.popleft()
+            incoming = channel._deliver(self, tag, message, routing_key, redelivered, no_ack)
+            asyncio.get_running_loop().create_task(callback(incoming))
+
+
+class InMemoryExchange:
+    """Exchange routing to bound queues; confirms after ``confirm_delay``"""
+
+    def __init__(self, broker: "InMemoryBroker", channel: "InMemoryChannel",
+                 name: str, exchange_type: ExchangeType):
+        self.broker = broker
+        self.channel = channel
+        self.name = name
+        self.type = exchange_type
+
+    def _route(self, routing_key: str) -> List[InMemoryQueue]:
+        if self.name == "":
+            queue = self.broker.queues.get(routing_key)
+            return [queue] if queue else []
+        matched = []
+        key_words = routing_key.split(".")
+        for binding_key, binding_words, queue in self.broker.bindings.get(self.name, []):
+            if self.type == ExchangeType.FANOUT or self.type == ExchangeType.HEADERS:
+                hit = True
+            elif self.type == ExchangeType.DIRECT:
+                hit = binding_key == routing_key
+            else:
+                hit = _topic_matches(binding_words, key_words)
+            if hit and queue not in matched:
+                matched.append(queue)
+        return matched
+
+    async def publish(self, message: Message, routing_key: str, **kwargs):
+        if self.channel.is_closed:
+            raise RuntimeError("Channel is closed")
+        if message.timestamp is None:
+            message.timestamp = datetime.utcnow()
+        for queue in self._route(routing_key):
+            queue.put(message, routing_key)
+        self.broker.published += 1
+        if self.channel.publisher_confirms and self.broker.confirm_delay:
+            await asyncio.sleep(self.broker.confirm_delay)
+
+
+class InMemoryChannel:
+    """Channel with per-consumer QoS, unacked-message tracking and declarations"""
+
+    def __init__(self, broker: "InMemoryBroker", publisher_confirms: bool = True):
+        self.broker = broker
+        self.publisher_confirms = publisher_confirms
+        self.prefetch_count = 0
+        self.is_closed = False
+        self._delivery_tags = itertools.count(1)
+        self.unacked: Dict[int, InMemoryIncomingMessage] = {}
+        self.consumer_unacked: Dict[str, int] = defaultdict(int)
+        self.default_exchange = InMemoryExchange(broker, self, "", ExchangeType.DIRECT)
+
+    async def set_qos(self, prefetch_count: int = 0, **kwargs):
+        self.prefetch_count = prefetch_count
+        for queue in list(self.broker.queues.values()):
+            queue.dispatch()
+
+    def has_capacity(self, consumer_tag: str) -> bool:
+        return not self.prefetch_count or self.consumer_unacked[consumer_tag] < self.prefetch_count
+
+    async def declare_exchange(self, name: str, type: ExchangeType = ExchangeType.DIRECT,
+                               durable: bool = False, **kwargs) -> InMemoryExchange:
+        exchange_type = type if isinstance(type, ExchangeType) else ExchangeType(type)
+        self.broker.exchange_types.setdefault(name, exchange_type)
+        return InMemoryExchange(self.broker, self, name, self.broker.exchange_types[name])
+
+    async def declare_queue(self, name: Optional[str] = None, durable: bool = False,
+                            exclusive: bool = False, auto_delete: bool = False,
+                            arguments: Optional[Dict[str, Any]] = None, **kwargs) -> InMemoryQueue:
+        name = name or f"amq.gen-{next(self.broker.tag_counter)}"
+        queue = self.broker.queues.get(name)
+        if queue is None:
+            queue = self.broker.queues[name] = InMemoryQueue(self.broker, self, name)
+        else:
+            queue.channel = self
+        return queue
+
+    def _deliver(self, queue: InMemoryQueue, consumer_tag: str, message: Message,
+                 routing_key: str, redelivered: bool, no_ack: bool) -> InMemoryIncomingMessage:
+        incoming = InMemoryIncomingMessage(
+            message, self, queue, next(self._delivery_tags), routing_key, redelivered
+        )
+        incoming.consumer_tag = consumer_tag
+        if no_ack:
+            incoming.processed = True
+        else:
+            self.unacked[incoming.delivery_tag] = incoming
+            self.consumer_unacked[consumer_tag] += 1
+        return incoming
+
+    def _settle(self, incoming: InMemoryIncomingMessage, multiple: bool, requeue: Optional[bool]):
+        """Ack (requeue None), nack or reject one tag or every tag up to it"""
+        if self.is_closed:
+            # Already requeued when the channel closed
+            return
+        if multiple:
+            tags = [tag for tag in self.unacked if tag <= incoming.delivery_tag]
+        else:
+            tags = [incoming.delivery_tag] if incoming.delivery_tag in self.unacked else []
+        if not tags:
+            raise RuntimeError(f"Unknown delivery tag {incoming.delivery_tag}")
+
+        queues = set()
+        for tag in tags:
+            settled = self.unacked.pop(tag)
+            settled.processed = True
+            self.consumer_unacked[settled.consumer_tag] -= 1
+            queues.add(settled.queue)
+            if requeue is None:
+                self.broker.acked += 1
+            elif requeue:
+                settled.queue.put(settled._message, settled.routing_key, front=True, redelivered=True)
+        for queue in queues:
+            queue.dispatch()
+
+    async def close(self):
+        self.is_closed = True
+        for queue in self.broker.queues.values():
+            for tag, (_, _, channel) in list(queue.consumers.items()):
+                if channel is self:
+                    await queue.cancel(tag)
+        # Unacked deliveries return to their queues, as on a real broker
+        for tag in sorted(self.unacked, reverse=True):
+            settled = self.unacked.pop(tag)
+            settled.queue.put(settled._message, settled.routing_key, front=True, redelivered=True)
+
+
+class InMemoryConnection:
+    """Connection handing out in-memory channels"""
+
+    def __init__(self, broker: "InMemoryBroker"):
+        self.broker = broker
+        self.channels: List[InMemoryChannel] = []
+        self.is_closed = False
+
+    async def channel(self, channel_number: Optional[int] = None,
+                      publisher_confirms: bool = True, **kwargs) -> InMemoryChannel:
+        channel = InMemoryChannel(self.broker, publisher_confirms)
+        self.channels.append(channel)
+        return channel
+
+    async def close(self):
+        for channel in self.channels:
+            await channel.close()
+        self.is_closed = True
+
+
+class InMemoryBroker:
+    """Shared broker state; ``connect`` mirrors ``aio_pika.connect_robust``"""
+
+    def __init__(self, confirm_delay: float = 0.0):
+        self.confirm_delay = confirm_delay
+        self.exchange_types: Dict[str, ExchangeType] = {}
+        self.queues: Dict[str, InMemoryQueue] = {}
+        self.bindings: Dict[str, List[Tuple[str, List[str], InMemoryQueue]]] = {}
+        self.tag_counter = itertools.count(1)
+        self.published = 0
+        self.acked = 0
+
+    async def connect(self, *args, **kwargs) -> InMemoryConnection:
+        return InMemoryConnection(self)
+
+    def depth(self, queue_name: str) -> int:
+        queue = self.queues.get(queue_name)
+        return len(queue.messages) if queue else 0
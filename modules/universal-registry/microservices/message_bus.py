@@ -4,19 +4,52 @@ Provides unified interface for event-driven communication between services
 """
 
 import asyncio
+import bisect
 import json
 import logging
-from typing import Dict, List, Optional, Any, Callable
+import time
+from collections import deque
+from typing import Dict, List, Optional, Any, Awaitable, Callable, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timezone
 import aio_pika
 from aio_pika import Message, ExchangeType, DeliveryMode
-from aio_pika.abc import AbstractChannel, AbstractConnection, AbstractQueue, AbstractExchange
+from aio_pika.abc import (
+    AbstractChannel, AbstractConnection, AbstractQueue, AbstractExchange, AbstractIncomingMessage
+)
 
 
 logger = logging.getLogger(__name__)
 
+# Returned by _get_within when nothing arrived in time
+_TIMED_OUT = object()
+
+
+async def _get_within(queue: asyncio.Queue, timeout: float) -> Any:
+    """``queue.get()`` with a timeout that never swallows cancellation
+    
+    ``asyncio.wait_for`` on Python 3.11 returns the result instead of
+    raising if the get completes in the same tick the caller is cancelled,
+    which leaves a cancelled worker running.
+    """
+    getter = asyncio.ensure_future(queue.get())
+    try:
+        done, _ = await asyncio.wait({getter}, timeout=timeout)
+    except asyncio.CancelledError:
+        if getter.done() and not getter.cancelled():
+            # Taken in the same tick as the cancel: hand it back
+            try:
+                queue.put_nowait(getter.result())
+            except asyncio.QueueFull:
+                logger.warning("Dropped an item taken during cancellation")
+        raise
+    finally:
+        if not getter.done():
+            # An unconsumed wakeup leaves the item in the queue
+            getter.cancel()
+    return getter.result() if done else _TIMED_OUT
+
 
 class MessagePriority(Enum):
     """Message priority levels"""
@@ -72,6 +105,447 @@ class EventMessage:
         )
 
 
+class BatchPublisher:
+    """Micro-batching publisher with pipelined publisher confirms
+    
+    Messages wait in a bounded queue, so callers block (back-pressure)
+    once ``max_pending`` messages are queued. A single drain task cuts the
+    queue into batches of up to ``max_batch`` messages or ``max_delay``
+    seconds and publishes each batch concurrently, without waiting for the
+    previous batch's confirms; at most ``max_in_flight`` messages may be
+    awaiting a confirm at once.
+    """
+    
+    def __init__(
+        self,
+        resolve_exchange: Callable[[str], Awaitable[AbstractExchange]],
+        max_batch: int = 500,
+        max_delay: float = 0.005,
+        max_in_flight: int = 1000,
+        max_pending: int = 10000
+    ):
+        self.resolve_exchange = resolve_exchange
+        # A batch takes one in-flight permit per message before publishing
+        self.max_batch = max(1, min(max_batch, max_in_flight))
+        self.max_delay = max_delay
+        self.max_in_flight = max_in_flight
+        
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._batches: Set[asyncio.Task] = set()
+        self._runner: Optional[asyncio.Task] = None
+        
+        self.stats = {
+            "published": 0,
+            "failed": 0,
+            "batches": 0,
+            "in_flight": 0
+        }
+    
+    def start(self):
+        if self._runner is None:
+            self._runner = asyncio.create_task(self._run())
+    
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+    
+    async def publish(
+        self,
+        exchange_name: str,
+        message: Message,
+        routing_key: str,
+        confirm: bool = True
+    ) -> Optional[asyncio.Future]:
+        """Queue a message; returns a future resolved on broker confirm when ``confirm``"""
+        future = asyncio.get_running_loop().create_future() if confirm else None
+        await self._queue.put((exchange_name, message, routing_key, future))
+        return future
+    
+    async def _next_batch(self) -> List[Tuple[str, Message, str, Optional[asyncio.Future]]]:
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        if not self.stats["in_flight"]:
+            # Idle publisher: don't add batching latency to a lone message
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            return batch
+        deadline = loop.time() + self.max_delay
+        
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            item = await _get_within(self._queue, timeout)
+            if item is _TIMED_OUT:
+                break
+            batch.append(item)
+        
+        return batch
+    
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            for _ in batch:
+                await self._in_flight.acquire()
+            self.stats["in_flight"] += len(batch)
+            self.stats["batches"] += 1
+            
+            task = asyncio.create_task(self._publish_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+    
+    async def _publish_batch(self, batch: List[Tuple[str, Message, str, Optional[asyncio.Future]]]):
+        await asyncio.gather(*(self._publish_one(*item) for item in batch))
+    
+    async def _publish_one(
+        self,
+        exchange_name: str,
+        message: Message,
+        routing_key: str,
+        future: Optional[asyncio.Future]
+    ):
+        try:
+            exchange = await self.resolve_exchange(exchange_name)
+            await exchange.publish(message, routing_key=routing_key)
+            self.stats["published"] += 1
+            if future and not future.done():
+                future.set_result(None)
+        except Exception as e:
+            self.stats["failed"] += 1
+            if future and not future.done():
+                future.set_exception(e)
+            else:
+                logger.error(f"Failed to publish to {exchange_name}: {e}")
+        finally:
+            self.stats["in_flight"] -= 1
+            self._in_flight.release()
+            self._queue.task_done()
+    
+    async def flush(self):
+        """Wait until every queued message has been published"""
+        await self._queue.join()
+    
+    async def close(self):
+        """Flush, then stop the drain task"""
+        if self._runner is None:
+            return
+        await self.flush()
+        self._runner.cancel()
+        try:
+            await self._runner
+        except asyncio.CancelledError:
+            pass
+        self._runner = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "pending": self.pending}
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations, reported in milliseconds"""
+    
+    BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def observe(self, seconds: float):
+        value_ms = max(seconds, 0.0) * 1000
+        self.counts[bisect.bisect_left(self.BUCKETS_MS, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bucket bound containing the q-quantile"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.BUCKETS_MS, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return float(bound)
+        return self.max_ms
+    
+    def snapshot(self) -> Dict[str, Any]:
+        buckets = {f"le_{bound}ms": count for bound, count in zip(self.BUCKETS_MS, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "buckets": buckets
+        }
+
+
+class BatchAcker:
+    """Coalesces acknowledgements into ``ack(multiple=True)`` calls
+    
+    Deliveries on the consumer's channel are tracked in order. Only the
+    longest settled prefix is acknowledged, so a multiple-ack never covers
+    a message that is still being handled. Rejections are sent at once.
+    """
+    
+    def __init__(self, batch_size: int = 50, interval: float = 0.05):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._outstanding: deque = deque()
+        self._acked: Set[int] = set()
+        self._rejected: Set[int] = set()
+        self._unflushed = 0
+        self._lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        self.acks_sent = 0
+    
+    def start(self):
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+    
+    def delivered(self, message: AbstractIncomingMessage):
+        self._outstanding.append(message)
+    
+    async def ack(self, message: AbstractIncomingMessage):
+        self._acked.add(message.delivery_tag)
+        self._unflushed += 1
+        if self._unflushed >= self.batch_size:
+            await self.flush()
+    
+    async def reject(self, message: AbstractIncomingMessage, requeue: bool = False):
+        await message.reject(requeue=requeue)
+        self._rejected.add(message.delivery_tag)
+    
+    async def flush(self):
+        async with self._lock:
+            last_acked = None
+            while self._outstanding:
+                tag = self._outstanding[0].delivery_tag
+                if tag in self._acked:
+                    self._acked.discard(tag)
+                    last_acked = self._outstanding.popleft()
+                elif tag in self._rejected:
+                    self._rejected.discard(tag)
+                    self._outstanding.popleft()
+                else:
+                    break
+            if last_acked is not None:
+                await last_acked.ack(multiple=True)
+                self.acks_sent += 1
+            self._unflushed = len(self._acked)
+    
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Batched ack failed: {e}")
+    
+    async def close(self):
+        if self._flusher:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+        await self.release()
+    
+    async def release(self):
+        """Settle everything still outstanding: acked tags one by one, the rest requeued
+        
+        Called after the consumer stops. Without this, a later consumer on the
+        same channel would cover these deliveries with its multiple-acks.
+        """
+        async with self._lock:
+            while self._outstanding:
+                message = self._outstanding.popleft()
+                tag = message.delivery_tag
+                try:
+                    if tag in self._acked:
+                        await message.ack()
+                        self.acks_sent += 1
+                    elif tag not in self._rejected:
+                        await message.nack(requeue=True)
+                except Exception as e:
+                    logger.error(f"Failed to settle delivery {tag} on close: {e}")
+            self._acked.clear()
+            self._rejected.clear()
+            self._unflushed = 0
+
+
+class QueueConsumer:
+    """Consumer for one queue on its own channel
+    
+    The channel's QoS ``prefetch`` caps unacknowledged deliveries. Received
+    messages are buffered and handled by ``concurrency`` worker tasks; with
+    ``batch_size > 1`` the callback receives a list of up to ``batch_size``
+    events gathered within ``batch_timeout`` seconds. Acknowledgements go
+    through a ``BatchAcker`` unless ``auto_ack`` is set.
+    """
+    
+    def __init__(
+        self,
+        queue_name: str,
+        queue: AbstractQueue,
+        callback: Callable[[Any], Any],
+        prefetch: int = 10,
+        concurrency: int = 1,
+        batch_size: int = 1,
+        batch_timeout: float = 0.05,
+        auto_ack: bool = False,
+        ack_batch_size: int = 50,
+        ack_interval: float = 0.05
+    ):
+        self.queue_name = queue_name
+        self.queue = queue
+        self.callback = callback
+        self.prefetch = prefetch
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.auto_ack = auto_ack
+        # Unacked messages count against prefetch, so never hold a full window
+        self.acker = BatchAcker(max(1, min(ack_batch_size, prefetch // 2 or 1)), ack_interval)
+        
+        self._buffer: asyncio.Queue = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        self.consumer_tag: Optional[str] = None
+        
+        self.lag = LatencyHistogram()
+        self.handler_latency = LatencyHistogram()
+        self.stats = {
+            "received": 0,
+            "processed": 0,
+            "failed": 0,
+            "in_progress": 0
+        }
+    
+    async def start(self):
+        if not self.auto_ack:
+            self.acker.start()
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        self.consumer_tag = await self.queue.consume(self._on_message, no_ack=self.auto_ack)
+    
+    async def _on_message(self, message: AbstractIncomingMessage):
+        self.stats["received"] += 1
+        if not self.auto_ack:
+            self.acker.delivered(message)
+        self._buffer.put_nowait((message, time.monotonic()))
+    
+    def _observe_lag(self, message: AbstractIncomingMessage):
+        timestamp = message.timestamp
+        if isinstance(timestamp, datetime):
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=timezone.utc)
+            self.lag.observe((datetime.now(timezone.utc) - timestamp).total_seconds())
+    
+    async def _next_batch(self) -> List[Tuple[AbstractIncomingMessage, float]]:
+        batch = [await self._buffer.get()]
+        if self.batch_size == 1:
+            return batch
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_timeout
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._buffer.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            item = await _get_within(self._buffer, timeout)
+            if item is _TIMED_OUT:
+                break
+            batch.append(item)
+        return batch
+    
+    async def _worker(self):
+        while True:
+            batch = await self._next_batch()
+            messages, events = [], []
+            for message, _ in batch:
+                self._observe_lag(message)
+                try:
+                    events.append(EventMessage.from_json(message.body.decode()))
+                    messages.append(message)
+                except Exception as e:
+                    logger.error(f"Dropping malformed message from {self.queue_name}: {e}")
+                    self.stats["failed"] += 1
+                    if not self.auto_ack:
+                        await self.acker.reject(message)
+            if not events:
+                continue
+            
+            self.stats["in_progress"] += len(events)
+            started = time.monotonic()
+            try:
+                result = self.callback(events if self.batch_size > 1 else events[0])
+                if asyncio.iscoroutine(result):
+                    await result
+                succeeded = True
+            except Exception as e:
+                logger.error(f"Error processing message from {self.queue_name}: {e}")
+                succeeded = False
+            finally:
+                self.stats["in_progress"] -= len(events)
+            self.handler_latency.observe(time.monotonic() - started)
+            
+            if succeeded:
+                self.stats["processed"] += len(events)
+            else:
+                self.stats["failed"] += len(events)
+            if self.auto_ack:
+                continue
+            for message in messages:
+                try:
+                    if succeeded:
+                        await self.acker.ack(message)
+                    else:
+                        await self.acker.reject(message)
+                except Exception as e:
+                    logger.error(f"Failed to settle message from {self.queue_name}: {e}")
+    
+    async def close(self):
+        """Stop consuming; handled messages are acked, unhandled ones are requeued"""
+        if self.consumer_tag:
+            try:
+                await self.queue.cancel(self.consumer_tag)
+            except Exception as e:
+                logger.debug(f"Cancelling consumer on {self.queue_name} failed: {e}")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        if not self.auto_ack:
+            await self.acker.close()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "prefetch": self.prefetch,
+            "concurrency": self.concurrency,
+            "batch_size": self.batch_size,
+            "buffered": self._buffer.qsize(),
+            "acks_sent": self.acker.acks_sent,
+            "lag": self.lag.snapshot(),
+            "handler_latency": self.handler_latency.snapshot()
+        }
+
+
 class MessageBus:
     """RabbitMQ message bus interface"""
     
@@ -81,26 +555,47 @@ class MessageBus:
         port: int = 5672,
         username: str = "guest",
         password: str = "guest",
-        virtual_host: str = "/"
+        virtual_host: str = "/",
+        batch_size: int = 500,
+        batch_delay: float = 0.005,
+        max_in_flight: int = 1000,
+        max_pending: int = 10000,
+        connect_factory: Optional[Callable[..., Awaitable[AbstractConnection]]] = None
     ):
         self.host = host
         self.port = port
         self.username = username
         self.password = password
         self.virtual_host = virtual_host
+        self.connect_factory = connect_factory or aio_pika.connect_robust
+        self.publisher_options = {
+            "max_batch": batch_size,
+            "max_delay": batch_delay,
+            "max_in_flight": max_in_flight,
+            "max_pending": max_pending
+        }
         
         self.connection: Optional[AbstractConnection] = None
         self.channel: Optional[AbstractChannel] = None
         self.exchanges: Dict[str, AbstractExchange] = {}
         self.queues: Dict[str, AbstractQueue] = {}
-        self.consumers: Dict[str, asyncio.Task] = {}
+        self.queue_declarations: Dict[str, Dict[str, Any]] = {}
+        self.consumers: Dict[str, QueueConsumer] = {}
+        self.consumer_channels: Dict[str, AbstractChannel] = {}
+        
+        # Non-persistent telemetry goes through its own unconfirmed channel
+        self.telemetry_channel: Optional[AbstractChannel] = None
+        self.exchange_declarations: Dict[str, Tuple[ExchangeTypes, bool]] = {}
+        self.telemetry_exchanges: Dict[str, AbstractExchange] = {}
+        self.publisher: Optional[BatchPublisher] = None
+        self.telemetry_publisher: Optional[BatchPublisher] = None
         
         self.is_connected = False
     
     async def connect(self):
         """Connect to RabbitMQ"""
         try:
-            self.connection = await aio_pika.connect_robust(
+            self.connection = await self.connect_factory(
                 host=self.host,
                 port=self.port,
                 login=self.username,
@@ -108,8 +603,16 @@ class MessageBus:
                 virtualhost=self.virtual_host
             )
             
-            self.channel = await self.connection.channel()
+            self.channel = await self.connection.channel(publisher_confirms=True)
             await self.channel.set_qos(prefetch_count=10)
+            self.telemetry_channel = await self.connection.channel(publisher_confirms=False)
+            
+            self.publisher = BatchPublisher(self._get_exchange, **self.publisher_options)
+            self.telemetry_publisher = BatchPublisher(
+                self._get_telemetry_exchange, **self.publisher_options
+            )
+            self.publisher.start()
+            self.telemetry_publisher.start()
             
             self.is_connected = True
             logger.info(f"Connected to RabbitMQ at {self.host}:{self.port}")
@@ -121,9 +624,15 @@ class MessageBus:
     
     async def disconnect(self):
         """Disconnect from RabbitMQ"""
-        # Cancel all consumers
-        for task in self.consumers.values():
-            task.cancel()
+        # Stop all consumers, flushing their pending acks
+        for consumer in self.consumers.values():
+            await consumer.close()
+        self.consumers.clear()
+        
+        # Drain queued publishes before the channels go away
+        for publisher in (self.publisher, self.telemetry_publisher):
+            if publisher:
+                await publisher.close()
         
         if self.connection:
             await self.connection.close()
@@ -151,6 +660,7 @@ class MessageBus:
         )
         
         self.exchanges[name] = exchange
+        self.exchange_declarations[name] = (exchange_type, durable)
         logger.info(f"Declared exchange: {name} (type: {exchange_type.value})")
         
         return exchange
@@ -169,14 +679,15 @@ class MessageBus:
         if name in self.queues:
             return self.queues[name]
         
-        queue = await self.channel.declare_queue(
-            name=name,
-            durable=durable,
-            auto_delete=auto_delete,
-            arguments=arguments or {}
-        )
+        declaration = {
+            "durable": durable,
+            "auto_delete": auto_delete,
+            "arguments": arguments or {}
+        }
+        queue = await self.channel.declare_queue(name=name, **declaration)
         
         self.queues[name] = queue
+        self.queue_declarations[name] = declaration
         logger.info(f"Declared queue: {name}")
         
         return queue
@@ -200,65 +711,139 @@ class MessageBus:
         await queue.bind(exchange, routing_key=routing_key)
         logger.info(f"Bound queue {queue_name} to exchange {exchange_name} with routing key {routing_key}")
     
+    async def _get_exchange(self, name: str) -> AbstractExchange:
+        if name not in self.exchanges:
+            raise ValueError(f"Exchange not declared: {name}")
+        return self.exchanges[name]
+    
+    async def _get_telemetry_exchange(self, name: str) -> AbstractExchange:
+        """Same exchange, declared on the unconfirmed telemetry channel"""
+        if name not in self.telemetry_exchanges:
+            if name not in self.exchange_declarations:
+                raise ValueError(f"Exchange not declared: {name}")
+            exchange_type, durable = self.exchange_declarations[name]
+            self.telemetry_exchanges[name] = await self.telemetry_channel.declare_exchange(
+                name=name,
+                type=ExchangeType[exchange_type.name],
+                durable=durable
+            )
+        return self.telemetry_exchanges[name]
+    
     async def publish_event(
         self,
         exchange_name: str,
         event: EventMessage,
-        routing_key: str = ""
-    ):
-        """Publish an event to an exchange"""
+        routing_key: str = "",
+        persistent: bool = True,
+        wait_for_confirm: bool = True
+    ) -> Optional[asyncio.Future]:
+        """Publish an event to an exchange
+        
+        Events go through the batching publisher. Persistent events are
+        confirmed by the broker; with ``wait_for_confirm=False`` the confirm
+        future is returned instead of awaited. Non-persistent events use the
+        unconfirmed telemetry channel and are fire-and-forget.
+        """
         if exchange_name not in self.exchanges:
             raise ValueError(f"Exchange not declared: {exchange_name}")
-        
-        exchange = self.exchanges[exchange_name]
+        if not self.publisher:
+            raise RuntimeError("Not connected to RabbitMQ")
         
         message = Message(
             body=event.to_json().encode(),
-            delivery_mode=DeliveryMode.PERSISTENT,
+            delivery_mode=DeliveryMode.PERSISTENT if persistent else DeliveryMode.NOT_PERSISTENT,
             priority=event.priority.value,
             content_type="application/json",
             correlation_id=event.correlation_id,
             timestamp=datetime.utcnow()
         )
         
-        await exchange.publish(message, routing_key=routing_key)
-        logger.info(f"Published event {event.event_type} to {exchange_name}")
+        if not persistent:
+            await self.telemetry_publisher.publish(exchange_name, message, routing_key, confirm=False)
+            return None
+        
+        confirmed = await self.publisher.publish(exchange_name, message, routing_key)
+        logger.debug(f"Queued event {event.event_type} for {exchange_name}")
+        if not wait_for_confirm:
+            return confirmed
+        await confirmed
+        return None
+    
+    async def publish_telemetry(
+        self,
+        exchange_name: str,
+        event: EventMessage,
+        routing_key: str = ""
+    ):
+        """Publish a high-rate, non-persistent event without waiting for confirms"""
+        await self.publish_event(exchange_name, event, routing_key, persistent=False)
+    
+    async def flush(self):
+        """Wait until every queued event has been handed to the broker"""
+        for publisher in (self.publisher, self.telemetry_publisher):
+            if publisher:
+                await publisher.flush()
+    
+    def get_publisher_stats(self) -> Dict[str, Any]:
+        """Batching publisher counters"""
+        return {
+            "confirmed": self.publisher.get_stats() if self.publisher else None,
+            "telemetry": self.telemetry_publisher.get_stats() if self.telemetry_publisher else None
+        }
     
     async def consume(
         self,
         queue_name: str,
-        callback: Callable[[EventMessage], Any],
-        auto_ack: bool = False
+        callback: Callable[[Any], Any],
+        auto_ack: bool = False,
+        prefetch: int = 10,
+        concurrency: int = 1,
+        batch_size: int = 1,
+        batch_timeout: float = 0.05,
+        ack_batch_size: int = 50
     ):
-        """Consume messages from a queue"""
+        """Consume messages from a queue
+        
+        Each consumer gets its own channel so ``prefetch`` applies per queue
+        and batched multiple-acks only cover this consumer's deliveries.
+        ``callback`` receives an ``EventMessage``, or a list of them when
+        ``batch_size > 1``; up to ``concurrency`` calls run at once.
+        """
         if queue_name not in self.queues:
             raise ValueError(f"Queue not declared: {queue_name}")
+        if queue_name in self.consumers:
+            await self.consumers.pop(queue_name).close()
         
-        queue = self.queues[queue_name]
-        
-        async def process_message(message: aio_pika.IncomingMessage):
-            """Process incoming message"""
-            async with message.process(ignore_processed=auto_ack):
-                try:
-                    # Parse event
-                    event = EventMessage.from_json(message.body.decode())
-                    
-                    # Call callback
-                    result = callback(event)
-                    if asyncio.iscoroutine(result):
-                        await result
-                    
-                    logger.debug(f"Processed event {event.event_type} from queue {queue_name}")
-                    
-                except Exception as e:
-                    logger.error(f"Error processing message from {queue_name}: {e}")
-                    # Message will be requeued if not auto_ack
+        channel = self.consumer_channels.get(queue_name)
+        if channel is None:
+            channel = await self.connection.channel()
+            self.consumer_channels[queue_name] = channel
+        await channel.set_qos(prefetch_count=prefetch)
+        queue = await channel.declare_queue(name=queue_name, **self.queue_declarations[queue_name])
         
-        # Start consuming
-        consumer_tag = await queue.consume(process_message)
-        logger.info(f"Started consuming from queue: {queue_name}")
+        consumer = QueueConsumer(
+            queue_name,
+            queue,
+            callback,
+            prefetch=prefetch,
+            concurrency=concurrency,
+            batch_size=batch_size,
+            batch_timeout=batch_timeout,
+            auto_ack=auto_ack,
+            ack_batch_size=ack_batch_size
+        )
+        await consumer.start()
+        self.consumers[queue_name] = consumer
+        logger.info(
+            f"Started consuming from queue: {queue_name} "
+            f"(prefetch={prefetch}, concurrency={concurrency}, batch={batch_size})"
+        )
         
-        return consumer_tag
+        return consumer.consumer_tag
+    
+    def get_consumer_stats(self) -> Dict[str, Any]:
+        """Per-queue consumer counters, lag and handler latency histograms"""
+        return {name: consumer.get_stats() for name, consumer in self.consumers.items()}
     
     async def rpc_call(
         self,
@@ -372,7 +957,9 @@ class ServiceEventBus:
         event_type: str,
         payload: Dict[str, Any],
         routing_key: Optional[str] = None,
-        priority: MessagePriority = MessagePriority.NORMAL
+        priority: MessagePriority = MessagePriority.NORMAL,
+        persistent: bool = True,
+        wait_for_confirm: bool = True
     ):
         """Emit an event"""
         event = EventMessage(
@@ -386,7 +973,19 @@ class ServiceEventBus:
         if not routing_key:
             routing_key = f"{self.service_name}.{event_type}"
         
-        await self.bus.publish_event("ose.events", event, routing_key)
+        return await self.bus.publish_event(
+            "ose.events", event, routing_key,
+            persistent=persistent, wait_for_confirm=wait_for_confirm
+        )
+    
+    async def emit_telemetry(
+        self,
+        event_type: str,
+        payload: Dict[str, Any],
+        routing_key: Optional[str] = None
+    ):
+        """Emit a high-rate, non-persistent event (metrics, heartbeats)"""
+        await self.emit(event_type, payload, routing_key, persistent=False)
     
     async def broadcast(
         self,
@@ -0,0 +1,151 @@
+"""
+Message Bus Tests
+Batching, publisher confirms, back-pressure and consumer shutdown
+against the in-process broker
+"""
+
+import asyncio
+
+from aio_pika import Message
+
+from memory_broker import InMemoryBroker
+from message_bus import BatchPublisher, EventMessage, ExchangeTypes, MessageBus
+
+
+def _event(i: int) -> EventMessage:
+    return EventMessage(event_type="test.event", source_service="tests", payload={"i": i})
+
+
+def _message(i: int) -> Message:
+    return Message(body=_event(i).to_json().encode(), content_type="application/json")
+
+
+async def _connected_bus(broker: InMemoryBroker, **options) -> MessageBus:
+    bus = MessageBus(connect_factory=broker.connect, **options)
+    await bus.connect()
+    await bus.declare_exchange("events", ExchangeTypes.TOPIC)
+    await bus.declare_queue("sink")
+    await bus.bind_queue("sink", "events", "#")
+    return bus
+
+
+def test_batched_publish_confirms_every_event():
+    async def scenario():
+        broker = InMemoryBroker(confirm_delay=0.001)
+        bus = await _connected_bus(broker, batch_size=50, batch_delay=0.01)
+        
+        confirms = [
+            await bus.publish_event("events", _event(i), "test.event", wait_for_confirm=False)
+            for i in range(200)
+        ]
+        await asyncio.wait_for(asyncio.gather(*confirms), timeout=5)
+        
+        stats = bus.get_publisher_stats()["confirmed"]
+        await bus.disconnect()
+        return broker, stats
+        
+    broker, stats = asyncio.run(scenario())
+    
+    assert broker.published == 200
+    assert broker.depth("sink") == 200
+    assert stats["published"] == 200
+    assert stats["failed"] == 0
+    assert stats["in_flight"] == 0
+    assert stats["batches"] < 200
+
+
+def test_back_pressure_blocks_publishers_at_max_pending():
+    async def scenario():
+        broker = InMemoryBroker()
+        bus = await _connected_bus(broker)
+        publisher = BatchPublisher(bus._get_exchange, max_pending=5)
+        
+        # Not started: nothing drains the queue, so the sixth put must block
+        for i in range(5):
+            await publisher.publish("events", _message(i), "test.event")
+        blocked = asyncio.create_task(publisher.publish("events", _message(5), "test.event"))
+        await asyncio.sleep(0.05)
+        was_blocked = not blocked.done()
+        
+        publisher.start()
+        confirm = await asyncio.wait_for(blocked, timeout=5)
+        await asyncio.wait_for(confirm, timeout=5)
+        await publisher.close()
+        await bus.disconnect()
+        return was_blocked, publisher.get_stats()
+        
+    was_blocked, stats = asyncio.run(scenario())
+    
+    assert was_blocked
+    assert stats["published"] == 6
+    assert stats["pending"] == 0
+
+
+def test_batch_larger_than_in_flight_window_does_not_stall():
+    async def scenario():
+        broker = InMemoryBroker(confirm_delay=0.001)
+        bus = await _connected_bus(broker, batch_size=100, max_in_flight=10)
+        
+        confirms = [
+            await bus.publish_event("events", _event(i), "test.event", wait_for_confirm=False)
+            for i in range(100)
+        ]
+        await asyncio.wait_for(asyncio.gather(*confirms), timeout=5)
+        await bus.disconnect()
+        return broker
+        
+    assert asyncio.run(scenario()).published == 100
+
+
+def test_batching_consumer_closes_with_a_delivery_racing_the_cancel():
+    async def scenario():
+        broker = InMemoryBroker()
+        bus = await _connected_bus(broker)
+        handled = []
+        await bus.consume("sink", handled.extend, auto_ack=True, batch_size=5, batch_timeout=1.0)
+        consumer = bus.consumers["sink"]
+        
+        await bus.publish_event("events", _event(0), "test.event")
+        await asyncio.sleep(0.05)  # worker is now collecting the rest of its batch
+        
+        # A delivery lands in the same tick the workers are cancelled
+        late = _message(1)
+        consumer._buffer.put_nowait((late, 0.0))
+        await asyncio.wait_for(consumer.close(), timeout=2)
+        bus.consumers.clear()
+        await bus.disconnect()
+        return all(worker.done() for worker in consumer._workers)
+        
+    assert asyncio.run(scenario())
+
+
+def test_reconsuming_a_queue_requeues_the_old_consumers_deliveries():
+    async def scenario():
+        broker = InMemoryBroker()
+        bus = await _connected_bus(broker)
+        stalled = asyncio.Event()
+        first, second = [], []
+        
+        async def stuck(event: EventMessage):
+            first.append(event.payload["i"])
+            await stalled.wait()
+            
+        async def drain(events):
+            second.extend(event.payload["i"] for event in events)
+            
+        await bus.consume("sink", stuck, prefetch=10)
+        for i in range(20):
+            await bus.publish_event("events", _event(i), "test.event")
+        await asyncio.sleep(0.05)
+        
+        await asyncio.wait_for(bus.consume("sink", drain, prefetch=10, batch_size=4), timeout=2)
+        await asyncio.sleep(0.3)
+        await asyncio.wait_for(bus.disconnect(), timeout=2)
+        return first, second, broker
+        
+    first, second, broker = asyncio.run(scenario())
+    
+    assert first == [0]
+    assert sorted(second) == list(range(20))
+    assert broker.acked == 20
+    assert broker.depth("sink") == 0
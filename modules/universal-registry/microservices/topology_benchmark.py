@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Topology Benchmark
+Times GraphEngine.build_topology_graph on synthetic service meshes:
+the cold build (nodes, edges, clusters, critical paths) and the cached
+lookup a broadcast tick pays while the registry is unchanged.
+
+    python topology_benchmark.py --sizes 1000 5000 10000 50000
+"""
+
+import argparse
+import random
+import time
+from typing import Dict
+
+from advanced_main import SERVICES, GraphEngine, ServiceCategory
+
+
+def synthetic_mesh(size: int, max_dependencies: int = 4, seed: int = 7) -> Dict[str, Dict]:
+    """Layered DAG: every service depends on a few services created before it"""
+    rng = random.Random(seed)
+    categories = list(ServiceCategory)
+    services = {}
+    for i in range(size):
+        dependencies = [
+            f"svc-{rng.randrange(i)}"
+            for _ in range(rng.randint(0, max_dependencies))
+        ] if i else []
+        services[f"svc-{i}"] = {
+            "name": f"Service {i}",
+            "url": f"http://svc-{i}:8000",
+            "port": 8000,
+            "category": categories[i % len(categories)],
+            "icon": "🔧",
+            "color": "#3b82f6",
+            "description": "Synthetic benchmark service",
+            "endpoints": 10,
+            "dependencies": sorted(set(dependencies)),
+            "criticality": "critical" if rng.random() < 0.01 else "medium",
+            "sla": 99.9,
+            "position": (rng.uniform(-500, 500), rng.uniform(-500, 500), rng.uniform(-500, 500))
+        }
+    return services
+
+
+def run(size: int, lookups: int = 1000) -> Dict[str, float]:
+    SERVICES.clear()
+    SERVICES.update(synthetic_mesh(size))
+    GraphEngine.invalidate()
+    
+    start = time.perf_counter()
+    topology = GraphEngine.build_topology_graph()
+    cold = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(lookups):
+        GraphEngine.build_topology_graph()
+    cached = (time.perf_counter() - start) / lookups
+    
+    return {
+        "services": size,
+        "edges": len(topology.edges),
+        "critical_paths": len(topology.critical_paths),
+        "longest_path": max((len(p) for p in topology.critical_paths), default=0),
+        "cold_ms": cold * 1000,
+        "cached_us": cached * 1e6
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark GraphEngine topology builds")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000, 50000])
+    args = parser.parse_args()
+    
+    original = dict(SERVICES)
+    print(f"{'services':>9} {'edges':>8} {'paths':>6} {'longest':>8} {'cold ms':>10} {'cached us':>10}")
+    try:
+        for size in args.sizes:
+            r = run(size)
+            print(f"{r['services']:>9} {r['edges']:>8} {r['critical_paths']:>6} {r['longest_path']:>8} "
+                  f"{r['cold_ms']:>10.1f} {r['cached_us']:>10.2f}")
+    finally:
+        SERVICES.clear()
+        SERVICES.update(original)
+        GraphEngine.invalidate()
+
+
+if __name__ == "__main__":
+    main()
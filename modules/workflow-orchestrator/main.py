@@ -10,7 +10,7 @@ import asyncio
 import json
 import logging
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Set
 from dataclasses import dataclass, asdict, field
 from pathlib import Path
 from enum import Enum
@@ -63,7 +63,8 @@ class WorkflowOrchestrator:
     🎭 Advanced workflow orchestrator
     
     Features:
-    - Parallel execution
+    - DAG-parallel execution (each step starts once its depends_on finish)
+    - Global and per-step-type concurrency limits
     - Automatic rollback
     - Real-time telemetry
     - Integration with QPR Engine
@@ -71,9 +72,13 @@ class WorkflowOrchestrator:
     """
     
     def __init__(self, qpr_url: str = "http://localhost:8011",
-                 integrity_url: str = "http://localhost:8010"):
+                 integrity_url: str = "http://localhost:8010",
+                 max_parallel: int = 8,
+                 type_limits: Optional[Dict[str, int]] = None):
         self.qpr_url = qpr_url
         self.integrity_url = integrity_url
+        self.max_parallel = max_parallel
+        self.type_limits: Dict[str, int] = type_limits or {'shell_command': 2}
         self.active_executions: Dict[str, WorkflowExecution] = {}
         self.execution_history: List[WorkflowExecution] = []
         self.step_registry: Dict[str, Callable] = {}
@@ -255,21 +260,242 @@ class WorkflowOrchestrator:
         
         return await asyncio.gather(*tasks)
     
+    @staticmethod
+    def _depends_on(step_config: Dict) -> List[str]:
+        deps = step_config.get('depends_on', [])
+        return [deps] if isinstance(deps, str) else list(deps)
+    
+    async def execute_dag(self, workflow: Dict, context: Dict,
+                          priority: Optional[List[str]] = None,
+                          fail_fast: bool = False,
+                          stats: Optional[Dict[str, Any]] = None) -> List[StepResult]:
+        """
+        Execute steps as soon as their depends_on set has succeeded
+        
+        Ready steps start in ``priority`` order (then workflow order),
+        bounded by ``max_parallel`` overall and ``type_limits`` per step
+        type. A failed step is rolled back (concurrently with the rest of
+        the run) and every step downstream of it is skipped; independent branches keep running unless
+        ``fail_fast`` is set, which cancels all outstanding work.
+        Peak concurrency and wall time are written to ``stats`` if given.
+        """
+        started = datetime.now()
+        order = {name: i for i, name in enumerate(workflow)}
+        if priority:
+            ranked = {name: i for i, name in enumerate(priority) if name in workflow}
+            order = {name: (ranked.get(name, len(ranked)), i) for name, i in order.items()}
+        
+        waiting: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = {name: [] for name in workflow}
+        for step_name, step_config in workflow.items():
+            deps = self._depends_on(step_config)
+            unknown = [d for d in deps if d not in workflow]
+            if unknown:
+                raise ValueError(f"Step {step_name} depends on unknown steps: {unknown}")
+            waiting[step_name] = len(set(deps))
+            for dep in set(deps):
+                dependents[dep].append(step_name)
+        
+        global_limit = asyncio.Semaphore(max(1, self.max_parallel))
+        type_limits = {t: asyncio.Semaphore(max(1, n)) for t, n in self.type_limits.items()}
+        ready = sorted((name for name, n in waiting.items() if n == 0), key=order.get)
+        results: Dict[str, StepResult] = {}
+        running: Dict[asyncio.Task, str] = {}
+        rollbacks: Set[asyncio.Task] = set()
+        active = 0
+        peak = 0
+        failed = False
+        
+        async def run(step_name: str) -> StepResult:
+            nonlocal active, peak
+            step_config = workflow[step_name]
+            type_limit = type_limits.get(step_config.get('type', step_name))
+            if type_limit:
+                await type_limit.acquire()
+            try:
+                async with global_limit:
+                    active += 1
+                    peak = max(peak, active)
+                    try:
+                        return await self.execute_step(step_name, step_config, context)
+                    finally:
+                        active -= 1
+            finally:
+                if type_limit:
+                    type_limit.release()
+        
+        def skipped(step_name: str, reason: str) -> StepResult:
+            now = datetime.now().isoformat()
+            return StepResult(step_name=step_name, status=StepStatus.SKIPPED,
+                              start_time=now, end_time=now, error=reason)
+        
+        def skip_downstream(step_name: str):
+            stack = list(dependents[step_name])
+            while stack:
+                name = stack.pop()
+                if name not in results:
+                    results[name] = skipped(name, f"Upstream step failed: {step_name}")
+                    stack.extend(dependents[name])
+        
+        try:
+            while ready or running:
+                for step_name in ready:
+                    running[asyncio.create_task(run(step_name))] = step_name
+                ready = []
+                
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    step_name = running.pop(task)
+                    if task.cancelled():
+                        results[step_name] = skipped(step_name, "Cancelled")
+                        continue
+                    result = task.result()
+                    results[step_name] = result
+                    
+                    if result.status == StepStatus.SUCCESS:
+                        for dependent in dependents[step_name]:
+                            waiting[dependent] -= 1
+                            if waiting[dependent] == 0 and dependent not in results:
+                                ready.append(dependent)
+                        continue
+                    
+                    # Roll back off the scheduler loop so independent branches keep dispatching
+                    rollbacks.add(asyncio.create_task(
+                        self.rollback_step(step_name, workflow[step_name], result)
+                    ))
+                    skip_downstream(step_name)
+                    failed = True
+                    if fail_fast:
+                        for pending in running:
+                            pending.cancel()
+                ready = [] if failed and fail_fast else sorted(ready, key=order.get)
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+                for step_name in running.values():
+                    results.setdefault(step_name, skipped(step_name, "Cancelled"))
+            if rollbacks:
+                await asyncio.gather(*rollbacks, return_exceptions=True)
+        
+        # Steps never reached (dependency cycle, or fail_fast) are reported as skipped
+        for step_name in workflow:
+            if step_name not in results:
+                results[step_name] = skipped(
+                    step_name, "Not scheduled (dependency cycle or earlier failure)"
+                )
+        
+        if stats is not None:
+            stats['peak_concurrency'] = peak
+            stats['wall_time'] = (datetime.now() - started).total_seconds()
+        return sorted(results.values(), key=lambda r: (r.start_time, order[r.step_name]))
+    
+    def _dag_telemetry(self, workflow: Dict, steps: List[StepResult],
+                       wall_time: float, peak: int) -> Dict[str, Any]:
+        """Achieved parallelism and critical-path slack from actual step durations"""
+        durations = {s.step_name: s.duration for s in steps if s.status != StepStatus.SKIPPED}
+        busy = sum(durations.values())
+        
+        # Forward pass in topological order: earliest finish along depends_on
+        deps = {n: set(self._depends_on(workflow[n])) & durations.keys() for n in durations}
+        waiting = {n: len(d) for n, d in deps.items()}
+        dependents: Dict[str, List[str]] = {n: [] for n in durations}
+        for name, upstream in deps.items():
+            for d in upstream:
+                dependents[d].append(name)
+        topo = [n for n, count in waiting.items() if count == 0]
+        earliest_finish: Dict[str, float] = {}
+        predecessor: Dict[str, Optional[str]] = {}
+        for name in topo:
+            start, prev = 0.0, None
+            for d in deps[name]:
+                if earliest_finish[d] > start:
+                    start, prev = earliest_finish[d], d
+            earliest_finish[name] = start + durations[name]
+            predecessor[name] = prev
+            for dependent in dependents[name]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    topo.append(dependent)
+        
+        if not earliest_finish:
+            return {'achieved_parallelism': 0.0, 'peak_concurrency': peak,
+                    'critical_path': [], 'critical_path_duration': 0.0, 'slack': {}}
+        
+        critical_duration = max(earliest_finish.values())
+        tail = max(earliest_finish, key=earliest_finish.get)
+        critical_path = []
+        while tail is not None:
+            critical_path.append(tail)
+            tail = predecessor[tail]
+        critical_path.reverse()
+        
+        # Backward pass: latest finish that does not stretch the critical path
+        latest_finish = {name: critical_duration for name in earliest_finish}
+        for name in reversed(topo):
+            latest_start = latest_finish[name] - durations[name]
+            for d in deps[name]:
+                latest_finish[d] = min(latest_finish[d], latest_start)
+        
+        return {
+            'achieved_parallelism': round(busy / wall_time, 2) if wall_time > 0 else 0.0,
+            'peak_concurrency': peak,
+            'critical_path': critical_path,
+            'critical_path_duration': round(critical_duration, 3),
+            'scheduling_overhead': round(max(0.0, wall_time - critical_duration), 3),
+            'slack': {
+                name: round(latest_finish[name] - earliest_finish[name], 3)
+                for name in earliest_finish
+            }
+        }
+    
     async def get_optimized_path(self, workflow: Dict) -> Optional[Dict]:
         """Get optimized path from QPR Engine"""
         try:
             async with aiohttp.ClientSession() as session:
                 async with session.post(
                     f"{self.qpr_url}/optimize",
-                    json={'workflow': workflow}
+                    json={
+                        'workflow': workflow,
+                        'constraints': {'max_parallel': self.max_parallel}
+                    }
                 ) as resp:
                     return await resp.json()
         except Exception as e:
             logger.warning(f"Could not get optimized path: {e}")
             return None
     
+    async def record_execution(self, path_id: str, workflow: Dict,
+                               execution: WorkflowExecution):
+        """Report step durations back to the QPR Engine to train its scheduler"""
+        ran = [s for s in execution.steps if s.status != StepStatus.SKIPPED]
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.post(
+                    f"{self.qpr_url}/record",
+                    json={
+                        'path_id': path_id,
+                        'steps': [s.step_name for s in ran],
+                        'success': execution.status == StepStatus.SUCCESS,
+                        'duration': execution.telemetry.get(
+                            'dag_wall_time',
+                            (datetime.now() - datetime.fromisoformat(execution.start_time)).total_seconds()
+                        ),
+                        'step_durations': {s.step_name: s.duration for s in ran},
+                        'dependencies': {
+                            name: self._depends_on(config) for name, config in workflow.items()
+                        },
+                        'max_parallel': self.max_parallel
+                    }
+                ) as resp:
+                    await resp.read()
+        except Exception as e:
+            logger.warning(f"Could not record execution: {e}")
+    
     async def execute(self, workflow_name: str, workflow: Dict,
-                     use_optimization: bool = True) -> WorkflowExecution:
+                     use_optimization: bool = True,
+                     fail_fast: bool = False) -> WorkflowExecution:
         """
         Execute complete workflow
         
@@ -277,6 +503,7 @@ class WorkflowOrchestrator:
             workflow_name: Name of the workflow
             workflow: {step_name: {type, depends_on, timeout, rollback}}
             use_optimization: Use QPR Engine for path optimization
+            fail_fast: Cancel all outstanding steps on the first failure
         
         Returns:
             WorkflowExecution result
@@ -297,32 +524,33 @@ class WorkflowOrchestrator:
         try:
             # Get optimized path
             optimized = None
+            best_path: Dict[str, Any] = {}
             parallel_groups = []
             
             if use_optimization:
                 optimized = await self.get_optimized_path(workflow)
                 if optimized and optimized.get('optimized_paths'):
-                    best_path = optimized['optimized_paths'][0]
+                    paths = optimized['optimized_paths']
+                    best_path = next((p for p in paths if p.get('recommended')), paths[0])
                     parallel_groups = best_path.get('parallel_groups', [])
                     execution.optimized_path_used = True
+                    execution.telemetry['predicted_makespan'] = best_path.get('estimated_time')
             
             # Execute workflow
-            if parallel_groups:
-                # Execute optimized parallel path
-                for group in parallel_groups:
-                    results = await self.execute_parallel_group(group, workflow, context)
-                    execution.steps.extend(results)
-                    
-                    # Check for failures
-                    if any(r.status == StepStatus.FAILED for r in results):
-                        # Rollback failed steps
-                        for result in results:
-                            if result.status == StepStatus.FAILED:
-                                step_config = workflow.get(result.step_name, {})
-                                await self.rollback_step(result.step_name, step_config, result)
-                        break
+            dag_mode = bool(parallel_groups) or any(
+                'depends_on' in step_config for step_config in workflow.values()
+            )
+            if dag_mode:
+                # QPR's list schedule only ranks ready steps; dependencies drive execution
+                priority = (
+                    [entry['step'] for entry in best_path.get('schedule') or []]
+                    or [step for group in parallel_groups for step in group]
+                )
+                dag_stats: Dict[str, Any] = {}
+                results = await self.execute_dag(workflow, context, priority, fail_fast, dag_stats)
+                execution.steps.extend(results)
             else:
-                # Execute sequentially
+                # No declared dependencies: workflow order is the contract
                 for step_name, step_config in workflow.items():
                     result = await self.execute_step(step_name, step_config, context)
                     execution.steps.append(result)
@@ -345,13 +573,23 @@ class WorkflowOrchestrator:
             
             # Collect telemetry
             execution.telemetry = {
+                **execution.telemetry,
                 'total_steps': total_steps,
                 'successful_steps': successful_steps,
                 'failed_steps': total_steps - successful_steps,
                 'parallel_groups_used': len(parallel_groups),
                 'optimization_used': use_optimization,
+                'scheduler': 'dag' if dag_mode else 'sequential',
                 'average_step_duration': sum(s.duration for s in execution.steps) / total_steps if total_steps > 0 else 0
             }
+            if dag_mode:
+                execution.telemetry['dag_wall_time'] = round(dag_stats['wall_time'], 3)
+                execution.telemetry.update(self._dag_telemetry(
+                    workflow, execution.steps,
+                    dag_stats['wall_time'], dag_stats['peak_concurrency']
+                ))
+            if execution.optimized_path_used:
+                await self.record_execution(best_path.get('path_id', ''), workflow, execution)
             
         except Exception as e:
             execution.status = StepStatus.FAILED
@@ -395,6 +633,7 @@ class WorkflowRequest(BaseModel):
     workflow_name: str
     workflow: Dict
     use_optimization: bool = True
+    fail_fast: bool = False
 
 
 @app.get("/")
@@ -422,7 +661,8 @@ async def execute_workflow(request: WorkflowRequest):
         result = await orchestrator.execute(
             request.workflow_name,
             request.workflow,
-            request.use_optimization
+            request.use_optimization,
+            request.fail_fast
         )
         return asdict(result)
     except Exception as e: